@@ -13,5 +13,6 @@
 # limitations under the License.
 from qcp.algorithms.abstract_algorithm import GeneralAlgorithm  # noqa: F401
 from qcp.algorithms.grovers_algorithm import Grovers  # noqa: F401
+from qcp.algorithms.grovers_subspace import GroversSubspace  # noqa: F401
 from qcp.algorithms.phase_estimation import PhaseEstimation  # noqa: F401
 from qcp.algorithms.sudoku import Sudoku  # noqa: F401
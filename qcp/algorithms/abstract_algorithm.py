@@ -17,20 +17,55 @@ simulation of Grover's Algorithm
 """
 import abc
 import random
-from typing import List, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union, overload
 
 import qcp.register as reg
+from qcp.circuit import Circuit
 from qcp.matrices import SPARSE, DefaultMatrix, Matrix
+from qcp.state_vector import StateVector
 
 
 class GeneralAlgorithm(abc.ABC):
 
-    def __init__(self, size: int):
+    def __init__(self, size: int, state_vector: bool = False):
+        """
+        Initialise the algorithm on a register of the given size
+
+        :param int size: number of qubits in the register
+        :param bool state_vector: Whether to simulate the algorithm by
+            applying each gate directly to the state vector, instead of
+            constructing the circuit matrix.
+        """
         assert size > 1, "need minimum of two qbits"
         self.size = size
+        self.state_vector = state_vector
 
+        self._sampler: Optional[reg.Sampler] = None
         self.state = self.initial_state()
-        self.circuit = self.construct_circuit()
+        # The circuit isn't stored when applying the gates directly
+        self.circuit: Optional[Circuit] = \
+            None if state_vector else self.construct_circuit()
+
+    @property
+    def state(self) -> Matrix:
+        """
+        The column vector of the current state of the register
+
+        returns:
+            Matrix: The state vector
+        """
+        return self._state
+
+    @state.setter
+    def state(self, state: Matrix):
+        """
+        Set the state of the register, which clears the cached table used
+        to sample measurements of the previous state.
+
+        :param Matrix state: The column vector of the new state
+        """
+        self._state = state
+        self._sampler = None
 
     def initial_state(self) -> Matrix:
         """
@@ -43,15 +78,24 @@ class GeneralAlgorithm(abc.ABC):
         entries[0][0] = 1
         return DefaultMatrix(entries)
 
-    def construct_circuit(self) -> Matrix:
+    def construct_circuit(self) -> Circuit:
         """
         Construct the circuit for the algorithm
 
         returns:
-            Matrix: Matrix representing our the circuit for the algorithm
+            Circuit: The gates of the circuit for the algorithm
         """
         pass
 
+    def apply_circuit(self, state: StateVector):
+        """
+        Apply the gates of the algorithm to the given state vector in place,
+        in the same order as they are added in construct_circuit()
+
+        :param StateVector state: The register to apply the gates to
+        """
+        self.construct_circuit().apply(state)
+
     def run(self) -> Matrix:
         """
         Run the algorithm by applying the quantum circuit to the initial
@@ -60,37 +104,71 @@ class GeneralAlgorithm(abc.ABC):
         returns:
             Matrix: Column matrix representation of the final state
         """
-        if self.circuit is not None:
-            self.state = self.circuit * self.state
+        if self.state_vector:
+            sv = StateVector.from_matrix(self.state)
+            self.apply_circuit(sv)
+            self.state = sv.to_matrix()
+        elif self.circuit is not None:
+            self.state = self.circuit.run(self.state)
 
         return self.state
 
-    def measure(self) -> Tuple[int, float]:
+    def sampler(self) -> reg.Sampler:
         """
-        'measures' self.state by selecting a state weighted by its
-        (amplitude ** 2)
+        The table to sample measurements of the current state from, which
+        is built once per state.
 
         returns:
-            Tuple[int, float]: The state observed and the probability of
-            measuring said state
+            Sampler: The alias table of the state probabilities
         """
-        p = self.probabilities()
-        # list of weighted probabilities with the index representing the state
+        if self._sampler is None:
+            self._sampler = reg.AliasTable(self.probabilities())
+        return self._sampler
+
+    @overload
+    def measure(self, shots: None = None,
+                rng: Optional[random.Random] = None) -> Tuple[int, float]:
+        ...
+
+    @overload
+    def measure(self, shots: int,
+                rng: Optional[random.Random] = None) -> Dict[int, int]:
+        ...
+
+    def measure(self, shots: Optional[int] = None,
+                rng: Optional[random.Random] = None
+                ) -> Union[Tuple[int, float], Dict[int, int]]:
+        """
+        'measures' self.state by selecting a state weighted by its
+        (amplitude ** 2), or measures the given number of shots of the state
 
-        observed = random.choices(
-            [i for i in range(len(p))], p, k=1)  # type: ignore
-        probability = p[observed[0]]
+        :param Optional[int] shots: The number of measurements to take, or
+            None to take a single measurement
+        :param Optional[random.Random] rng: The random number generator to
+            use, defaults to the random module, pass a seeded generator for
+            reproducible measurements
+        returns:
+            Union[Tuple[int, float], Dict[int, int]]: For a single
+            measurement, the state observed and the probability of
+            measuring said state. Otherwise the number of times each state
+            was observed, for the states observed at least once.
+        """
+        sampler = self.sampler()
+        if shots is not None:
+            return sampler.sample_counts(shots, rng)
 
-        return int(observed[0]), probability
+        observed = sampler.sample(rng)
+        return observed, sampler[observed]
 
-    def probabilities(self) -> List[float]:
+    def probabilities(self) -> Sequence[float]:
         """
         Returns the amplitudes of the measured state, representing the
         probabilities to be in each state.
 
         returns:
-            List[float]: A list of states, where each element is the
-                probability to be in that state.
+            Sequence[float]: A sequence of states, where each element is the
+                probability to be in that state, which subclasses may compute
+                lazily rather than returning a list.
         """
         if self.state is not None:
             return reg.measure(self.state)
@@ -98,6 +176,11 @@ class GeneralAlgorithm(abc.ABC):
     def measure_probabilities(self):
         """
         Print a table of the probabilities associated with each
-        measured state.
+        measured state, one '|state> : probability' line per state.
+
+        Subclasses may summarise large registers instead of listing every
+        state, as GroversSubspace does above MAX_LISTED_QUBITS qubits by
+        printing the target state's line followed by a single
+        'each other state : probability' line.
         """
         pass
@@ -16,11 +16,20 @@ Constructs the quantum register, circuits of composite gates, and runs the
 simulation of Grover's Algorithm
 """
 import math
-from typing import List
+import numbers
+import operator
+import random
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, \
+    Union
+
+import numpy as np
 
 import qcp.gates as g
+import qcp.register as reg
 from qcp.algorithms import GeneralAlgorithm
-from qcp.matrices import Matrix
+from qcp.circuit import Circuit
+from qcp.matrices import DiagonalMatrix, Matrix
+from qcp.state_vector import StateVector
 
 
 def pull_set_bits(n: int) -> List[int]:
@@ -43,9 +52,70 @@ def pull_set_bits(n: int) -> List[int]:
     return bits
 
 
+#: The target states can be given as a single index, a collection of
+#: indices, or a predicate that is true for the target indices
+TARGETS = Union[int, Iterable[int], Callable[[int], bool]]
+
+
+def find_targets(size: int, target_state: TARGETS) -> List[int]:
+    """
+    Find the indices of the target states in a register of the given size.
+
+    A predicate is first evaluated on the numpy array of all the indices, in
+    case it is vectorised, and otherwise on each index in turn.
+
+    :param int size: number of qubits in the register
+    :param TARGETS target_state: The target index, indices or predicate
+    returns:
+        List[int]: The sorted indices of the target states
+    """
+    n = 2 ** size
+
+    if callable(target_state):
+        predicate = target_state
+        try:
+            mask = np.asarray(predicate(np.arange(n)))  # type: ignore
+        except (TypeError, ValueError):
+            mask = None
+
+        if mask is not None and mask.shape == (n,):
+            targets = [int(i) for i in np.flatnonzero(mask)]
+        else:
+            targets = [i for i in range(n) if predicate(i)]
+
+    else:
+        # Accept numpy integers as well as ints, and store them as ints
+        indices: Iterable[int]
+        if isinstance(target_state, numbers.Integral):
+            indices = [operator.index(target_state)]
+        else:
+            indices = target_state  # type: ignore[assignment]
+        targets = sorted(set(operator.index(t) for t in indices))
+        for t in targets:
+            assert t in range(n), \
+                "target index must be within number of qbit indices"
+
+    assert len(targets) > 0, "need at least one target state"
+    return targets
+
+
+def optimal_reflections(size: int, num_targets: int) -> int:
+    """
+    The number of reflections that maximises the probability of measuring
+    one of the target states.
+
+    :param int size: number of qubits in the register
+    :param int num_targets: The number of target states
+    returns:
+        int: The number of times to apply the oracle and diffusion
+    """
+    return math.floor((math.pi/4) * math.sqrt(2**size / num_targets))
+
+
 class Grovers(GeneralAlgorithm):
 
-    def __init__(self, size: int, target_state: int):
+    def __init__(self, size: int, target_state: TARGETS,
+                 state_vector: bool = False):
         """
         This is an implementation of Grover's algorithm which efficiently
         finds a specific item in a list of items. In this implementation
@@ -53,16 +123,73 @@ class Grovers(GeneralAlgorithm):
         "target_state" and reduce all others in a "size"-qubit system
 
         :param int size: number of qubits in our circuit
-        :param int target_state: specific state we want to target/select
+        :param TARGETS target_state: specific state we want to
+            target/select, or a collection of states, or a predicate
+            that is true for the states to select
+        :param bool state_vector: Whether to apply the gates directly to
+            the state vector instead of constructing the circuit matrix
+        """
+        self.targets = find_targets(size, target_state)
+        self.target = self.targets[0]
+
+        self.max_reflections = self.num_reflections(size)
+
+        # The oracle and diffusion matrices are only built when used
+        self._oracle: Optional[Matrix] = None
+        self._diffuser: Optional[Matrix] = None
+
+        super().__init__(size, state_vector)
+
+    @property
+    def oracle(self) -> Matrix:
+        """
+        The matrix of the oracle for all the target states, which is built
+        the first time it is used.
+
+        returns:
+            Matrix: The oracle gate
         """
-        assert target_state < (2 ** size), \
-            "target index must be within number of qbit indices"
-        self.target = target_state
+        if self._oracle is None:
+            self._oracle = self.oracle_mask()
+        return self._oracle
 
-        # can only reflect size-1 times to get maximum probability
-        self.max_reflections = math.floor((math.pi/4)*(math.sqrt(2**size)))
+    @property
+    def diffuser(self) -> Matrix:
+        """
+        The matrix of the diffusion gate, which is built the first time it
+        is used.
 
-        super().__init__(size)
+        returns:
+            Matrix: The diffusion gate
+        """
+        if self._diffuser is None:
+            self._diffuser = self.diffusion()
+        return self._diffuser
+
+    def num_reflections(self, size: int) -> int:
+        """
+        The number of reflections that maximises the probability of
+        measuring a target state, from the number of target states.
+
+        :param int size: number of qubits in the register
+        returns:
+            int: The number of times to apply the oracle and diffusion
+        """
+        return optimal_reflections(size, len(self.targets))
+
+    def oracle_mask(self) -> DiagonalMatrix:
+        """
+        Creates the oracle gate for all of the target states, as the
+        diagonal matrix of the signs of each state, which is -1 for the
+        target states.
+
+        returns:
+            DiagonalMatrix: Matrix representation of our Oracle
+        """
+        targets = set(self.targets)
+        return DiagonalMatrix([
+            -1 if i in targets else 1 for i in range(2 ** self.size)
+        ])
 
     def single_target_oracle(self) -> Matrix:
         """
@@ -70,16 +197,24 @@ class Grovers(GeneralAlgorithm):
         by phase shifting it by pi (turning 1 into -1 in the matrix
         representation)
 
+        The controlled-z is conditioned on the bits of the target state
+        directly with its control values, and targets a bit that is set in
+        the target state, so only needs to be sandwiched by X gates when the
+        target is the zero state.
+
         returns:
             Matrix: Matrix representation of our Oracle
         """
-        not_placement = (2 ** self.size) - 1 - self.target
-        t = pull_set_bits(not_placement)
-        cz = g.control_z(self.size, [i for i in range(0, self.size - 1)],
-                         self.size - 1)
-        selector = g.multi_gate(self.size, t, g.Gate.X)
-        oracle = selector * cz
-        oracle *= selector
+        set_bits = pull_set_bits(self.target)
+        target_bit = set_bits[-1] if set_bits else self.size - 1
+        controls = [i for i in range(self.size) if i != target_bit]
+        control_values = [(self.target >> i) & 1 for i in controls]
+
+        oracle: Matrix = g.control_z(self.size, controls, target_bit,
+                                     control_values)
+        if not set_bits:
+            x = g.multi_gate(self.size, [target_bit], g.Gate.X)
+            oracle = x * (oracle * x)
         return oracle
 
     def diffusion(self) -> Matrix:
@@ -87,37 +222,146 @@ class Grovers(GeneralAlgorithm):
         Creates a diffusion gate - a gate which amplifies the probability of
         selecting our target state
 
+        The phase flip of the zero state is a controlled-z conditioned on
+        the other bits being 0, so only the target bit of the controlled-z
+        is flipped by X gates.
+
         returns:
             Matrix: Matrix representing diffusion gate
         """
         h = g.multi_gate(self.size, [i for i in range(0, self.size)], g.Gate.H)
-        cz = g.control_z(self.size, [i for i in range(0, self.size - 1)],
-                         self.size - 1)
-        x = g.multi_gate(self.size, [i for i in range(0, self.size)], g.Gate.X)
+        controls = [i for i in range(0, self.size - 1)]
+        cz = g.control_z(self.size, controls, self.size - 1,
+                         [0] * len(controls))
+        x = g.multi_gate(self.size, [self.size - 1], g.Gate.X)
         diff = h * (x * (cz * (x * h)))
         return diff
 
-    def construct_circuit(self) -> Matrix:
+    def reflection_circuit(self) -> Circuit:
+        """
+        Constructs the circuit of a single reflection, the oracle followed
+        by the diffusion.
+
+        The oracle flips the sign of the target states, and the diffusion
+        inverts the amplitudes about their mean, so each reflection is
+        applied to a state vector in O(2**size) operations.
+
+        returns:
+            Circuit: The gates of the oracle and diffusion
+        """
+        circuit = Circuit(self.size)
+        circuit.phase_flip(self.targets)
+        circuit.invert_about_mean()
+        return circuit
+
+    def reflections_circuit(self, reflections: int) -> Circuit:
+        """
+        Constructs the circuit of the initial set of Hadamards, followed by
+        the given number of repetitions of the oracle and diffusion gates.
+
+        Every repetition shares the same gates, so their matrices are only
+        constructed once when the circuit is run.
+
+        :param int reflections: The number of times to apply the oracle and
+            diffusion
+        returns:
+            Circuit: The gates of Grover's algorithm
+        """
+        circuit = Circuit(self.size)
+        circuit.multi_gate([i for i in range(0, self.size)], g.Gate.H)
+
+        reflection = self.reflection_circuit()
+        for _ in range(reflections):
+            circuit.extend(reflection)
+
+        return circuit
+
+    def construct_circuit(self) -> Circuit:
         """
         Constructs the circuit for Grover's algorithm by applying an initial
         set of Hadamards and repeating the oracle and diffusion gates
         until our target state is close to 1 in terms of probability
 
         returns:
-            Matrix: Matrix representing our completed Grover's algorithm
+            Circuit: The gates of our completed Grover's algorithm
         """
-        self.oracle = self.single_target_oracle()
-        self.diffuser = self.diffusion()
+        return self.reflections_circuit(self.max_reflections)
 
-        circuit = g.multi_gate(self.size, [i for i in range(0, self.size)],
-                               g.Gate.H)
+    def apply_circuit(self, state: StateVector):
+        """
+        Apply the gates of
+        :py:meth:`~qcp.algorithms.grovers_algorithm.Grovers.construct_circuit`
+        directly to the amplitudes of the state vector, with the number of
+        reflections that maximises the probability of the target states.
 
-        while self.max_reflections > 0:
-            circuit = self.oracle * circuit
-            circuit = self.diffuser * circuit
-            self.max_reflections -= 1
+        :param StateVector state: The register to apply the gates to
+        """
+        self.reflections_circuit(self.max_reflections).apply(state)
 
-        return circuit
+    def search(self, max_trials: Optional[int] = None,
+               growth: float = 6 / 5,
+               rng: Optional[random.Random] = None
+               ) -> Iterator[Tuple[int, int, bool]]:
+        """
+        Search for a target state without knowing the number of targets,
+        using the randomised exponential schedule of Boyer, Brassard, Hoyer
+        and Tapp.
+
+        Each trial applies a random number of reflections, below a limit
+        that grows by the given factor after every failed trial (up to
+        sqrt(2**size)), to the uniform superposition and measures the
+        result. Each trial runs the gates of
+        :py:meth:`~qcp.algorithms.grovers_algorithm.Grovers.reflections_circuit`
+        with that number of reflections, and the gates of the Hadamards and
+        of a reflection are only constructed once, and reused by every
+        trial.
+
+        :param Optional[int] max_trials: The maximum number of trials, or
+            None to search until a target is found
+        :param float growth: The factor to grow the limit on the number of
+            reflections by after each failed trial
+        :param Optional[random.Random] rng: The random number generator to
+            use, defaults to the random module
+        returns:
+            Iterator[Tuple[int, int, bool]]: For each trial, the number of
+            reflections applied, the state observed, and whether the
+            observed state is a target state. The iterator ends after the
+            first trial that finds a target.
+        """
+        assert growth > 1, "the reflection limit must grow between trials"
+        randrange = rng.randrange if rng is not None else random.randrange
+        choices = rng.choices if rng is not None else random.choices
+
+        n = 2 ** self.size
+        targets = set(self.targets)
+        hadamards = self.reflections_circuit(0)
+        reflection = self.reflection_circuit()
+
+        limit = 1.0
+        trial = 0
+        while max_trials is None or trial < max_trials:
+            trial += 1
+            reflections = randrange(math.ceil(limit))
+
+            if self.state_vector:
+                sv = StateVector.from_matrix(self.initial_state())
+                hadamards.apply(sv)
+                for _ in range(reflections):
+                    reflection.apply(sv)
+                p = [abs(a) ** 2 for a in sv.amplitudes]
+            else:
+                state = hadamards.run(self.initial_state())
+                for _ in range(reflections):
+                    state = reflection.run(state)
+                p = reg.measure(state)
+
+            observed = choices(range(n), p, k=1)[0]
+            found = observed in targets
+            yield reflections, observed, found
+
+            if found:
+                return
+            limit = min(growth * limit, math.sqrt(n))
 
     def measure_probabilities(self):
         p = self.probabilities()
@@ -0,0 +1,217 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Simulation of single target Grover's Algorithm in the two dimensional
+subspace spanned by the target state and the uniform superposition of the
+remaining states, which scales to registers too large to store the state
+vector of.
+"""
+import math
+import random
+from typing import Optional
+
+import qcp.register as reg
+from qcp.algorithms import GeneralAlgorithm
+from qcp.algorithms.grovers_algorithm import optimal_reflections
+from qcp.circuit import Circuit
+from qcp.matrices import DefaultMatrix, Matrix
+
+#: Registers with more qubits than this only print the target probability
+#: and the shared probability of the other states in
+#: :py:meth:`~GroversSubspace.measure_probabilities`
+MAX_LISTED_QUBITS = 10
+
+
+class SubspaceProbabilities(reg.Sampler):
+    """
+    The probabilities of measuring each of the 2**size states, computed on
+    demand from the probability of the target state, as every other state is
+    equally likely, which are sampled without building the full alias
+    table.
+    """
+
+    def __init__(self, size: int, target: int, target_probability: float):
+        """
+        Initialise the probabilities of the register
+
+        :param int size: number of qubits in the register
+        :param int target: the index of the target state
+        :param float target_probability: the probability of measuring the
+            target state
+        """
+        self.num_states = 2 ** size
+        self.target = target
+        self.target_probability = target_probability
+        self.other_probability = \
+            (1 - target_probability) / (self.num_states - 1)
+
+    def __len__(self) -> int:
+        """
+        Return the number of states in the register
+
+        returns:
+            int: The number of states, 2**size
+        """
+        return self.num_states
+
+    def probability(self, i: int) -> float:
+        """
+        Get the probability of measuring the state with the given index
+
+        :param int i: The index of the state
+        returns:
+            float: The probability of measuring that state
+        """
+        if i == self.target:
+            return self.target_probability
+        return self.other_probability
+
+    def sample(self, rng: Optional[random.Random] = None) -> int:
+        """
+        Sample a single state, by selecting the target state with it's
+        probability, or otherwise any one of the other states uniformly
+
+        :param Optional[random.Random] rng: The random number generator to
+            use, defaults to the random module
+        returns:
+            int: The index of the state observed
+        """
+        uniform = rng.random if rng is not None else random.random
+        randrange = rng.randrange if rng is not None else random.randrange
+
+        if uniform() < self.target_probability:
+            return self.target
+
+        observed = randrange(self.num_states - 1)
+        if observed >= self.target:
+            observed += 1
+        return observed
+
+
+class GroversSubspace(GeneralAlgorithm):
+
+    def __init__(self, size: int, target_state: int):
+        """
+        Simulation of Grover's algorithm with a single target state, giving
+        the same results as :py:class:`~qcp.algorithms.Grovers`.
+
+        The register only ever lives in the span of the target state and
+        the uniform superposition of the other states, so the state is
+        stored as the 2x1 column of the amplitudes along those two
+        directions.
+
+        :param int size: number of qubits in our circuit
+        :param int target_state: specific state we want to target/select
+        """
+        assert target_state < (2 ** size), \
+            "target index must be within number of qbit indices"
+        self.target = target_state
+
+        # The same number of reflections as Grovers with a single target
+        self.max_reflections = optimal_reflections(size, 1)
+        # The angle of the uniform superposition from the other states
+        self.theta = math.asin(1 / math.sqrt(2 ** size))
+
+        super().__init__(size)
+
+    def initial_state(self) -> Matrix:
+        """
+        Creates the state after the initial Hadamards, the uniform
+        superposition of all states
+
+        returns:
+            Matrix: the amplitudes along the target and the other states
+        """
+        return DefaultMatrix([[math.sin(self.theta)],
+                              [math.cos(self.theta)]])
+
+    def oracle(self) -> Matrix:
+        """
+        The oracle gate restricted to the subspace, which flips the sign of
+        the target state
+
+        returns:
+            Matrix: The 2x2 oracle
+        """
+        return DefaultMatrix([[-1, 0], [0, 1]])
+
+    def diffusion(self) -> Matrix:
+        """
+        The diffusion gate restricted to the subspace, I - 2|s><s| for the
+        uniform superposition |s>
+
+        returns:
+            Matrix: The 2x2 diffusion gate
+        """
+        s = math.sin(self.theta)
+        c = math.cos(self.theta)
+        return DefaultMatrix([[1 - 2 * s * s, -2 * s * c],
+                              [-2 * s * c, 1 - 2 * c * c]])
+
+    def construct_circuit(self) -> Circuit:
+        """
+        Constructs the oracle and diffusion gates repeated max_reflections
+        times. Each repetition is (minus) a rotation by 2 theta towards the
+        target state, so the repeated circuit is computed in closed form.
+
+        returns:
+            Circuit: The single gate of the 2x2 matrix of the repeated
+            reflections, on the two dimensional subspace
+        """
+        k = self.max_reflections
+        sign = (-1) ** k
+        cos = sign * math.cos(2 * k * self.theta)
+        sin = sign * math.sin(2 * k * self.theta)
+
+        circuit = Circuit(1)
+        circuit.unitary(DefaultMatrix([[cos, sin], [-sin, cos]]))
+        return circuit
+
+    def probabilities(self) -> SubspaceProbabilities:
+        """
+        Returns the probabilities to measure each state, which are computed
+        when they are accessed.
+
+        returns:
+            SubspaceProbabilities: The probabilities, indexed by the state
+        """
+        amplitude = self.state[0][0]
+        return SubspaceProbabilities(self.size, self.target,
+                                     abs(amplitude) ** 2)
+
+    def sampler(self) -> SubspaceProbabilities:
+        """
+        The probabilities of the current state, which are sampled directly
+        rather than building the alias table of every state.
+
+        returns:
+            SubspaceProbabilities: The probabilities of the current state
+        """
+        if not isinstance(self._sampler, SubspaceProbabilities):
+            self._sampler = self.probabilities()
+        return self._sampler
+
+    def measure_probabilities(self):
+        p = self.probabilities()
+        n_bits = self.size
+
+        if self.size > MAX_LISTED_QUBITS:
+            binary = bin(self.target)[2:].zfill(n_bits)
+            print(f"|{binary}> : {p.target_probability:.4g}")
+            print(f"each other state : {p.other_probability:.4g}")
+            return
+
+        for i in range(2**self.size):
+            binary = bin(i)[2:].zfill(n_bits)
+            print(f"|{binary}> : {p[i]:.4g}")
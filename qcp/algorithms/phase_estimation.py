@@ -1,11 +1,12 @@
 import math
-from typing import List
+from typing import List, Optional
 
 import qcp.gates as g
 import qcp.register as reg
 import qcp.tensor_product as tp
 from qcp.algorithms.abstract_algorithm import GeneralAlgorithm
-from qcp.matrices import DefaultMatrix, Matrix
+from qcp.circuit import Circuit
+from qcp.matrices import IdentityMatrix, Matrix
 
 
 def optimum_qubit_size(precision: int, error: float) -> int:
@@ -16,28 +17,90 @@ def optimum_qubit_size(precision: int, error: float) -> int:
     return math.ceil(precision + math.log2(2+1/(2*error)))
 
 
-def qft_gate(size: int) -> Matrix:
+def _keep_rotation(distance: int, approximation_degree: Optional[int]
+                   ) -> bool:
+    """
+    Whether to keep the controlled rotation between two qubits the given
+    distance apart, which is the rotation by 2*pi/2**(distance+1)
+
+    :param int distance: The distance between the control and target qubits
+    :param Optional[int] approximation_degree: The maximum distance of the
+        rotations to keep, or None to keep all the rotations
+    returns:
+        bool: Whether to keep the rotation
+    """
+    return approximation_degree is None or distance <= approximation_degree
+
+
+def qft_approximation_error(size: int,
+                            approximation_degree: Optional[int]) -> float:
+    """
+    Bound the error (in the operator norm) of the approximate QFT that only
+    keeps the rotations up to the given degree, as the sum of
+    2*sin(phi/2) over each dropped rotation by the angle phi.
+
+    :param int size: number of qubits
+    :param Optional[int] approximation_degree: The maximum distance of the
+        rotations to keep, or None for the exact QFT
+    returns:
+        float: The bound on the error
+    """
+    error = 0.0
+    for distance in range(1, size):
+        if _keep_rotation(distance, approximation_degree):
+            continue
+        phi = 2*math.pi/2**(distance+1)
+        # There is a rotation for each pair of qubits this distance apart
+        error += (size - distance) * 2 * math.sin(phi / 2)
+    return error
+
+
+def qft_fidelity_bound(size: int,
+                       approximation_degree: Optional[int]) -> float:
+    """
+    The lower bound on the fidelity between the states produced by the
+    exact and approximate QFT, (1 - e**2/2)**2 for the error bound e.
+
+    :param int size: number of qubits
+    :param Optional[int] approximation_degree: The maximum distance of the
+        rotations to keep, or None for the exact QFT
+    returns:
+        float: The lower bound on the fidelity
+    """
+    error = qft_approximation_error(size, approximation_degree)
+    return max(0.0, 1 - error ** 2 / 2) ** 2
+
+
+def qft_gate(size: int, approximation_degree: Optional[int] = None
+             ) -> Matrix:
     """
     Performs Quantum Fourier Transform, which change the basis
 
     :param int: size: number of qubits
+    :param Optional[int] approximation_degree: The maximum distance between
+        the control and target qubit of the controlled rotations to keep,
+        or None to keep all the rotations
     returns:
         Matrix: gate
     """
 
     gate = g.multi_gate(size, [], g.Gate.I)
     for i in range(size-1, -1, -1):
-        gate = qft_rotation_gate(
-            size, i)*g.multi_gate(size, [i], g.Gate.H)*gate
+        gate = qft_rotation_gate(size, i, approximation_degree) * \
+            g.multi_gate(size, [i], g.Gate.H)*gate
     for i in range(int(size/2)):
         gate = g.swap(size, i, size-1-i)*gate
     return gate
 
 
-def inverse_qft_gate(size: int) -> Matrix:
+def inverse_qft_gate(size: int, approximation_degree: Optional[int] = None
+                     ) -> Matrix:
     """
     Performs Inverse Quantum Fourier Transform
     :param int: size: number of qubits
+    :param Optional[int] approximation_degree: The maximum distance between
+        the control and target qubit of the controlled rotations to keep,
+        or None to keep all the rotations
     returns:
         Matrix: gate
     """
@@ -46,36 +109,49 @@ def inverse_qft_gate(size: int) -> Matrix:
         gate = g.swap(size, i, size-i-1)*gate
     for i in range(0, size):
         gate = g.multi_gate(size, [i], g.Gate.H) * \
-            inverse_qft_rotation_gate(size, i)*gate
+            inverse_qft_rotation_gate(size, i, approximation_degree)*gate
     return gate
 
 
-def qft_rotation_gate(size: int, current_qubit: int) -> Matrix:
+def qft_rotation_gate(size: int, current_qubit: int,
+                      approximation_degree: Optional[int] = None) -> Matrix:
     """"
     Construct the R2...R(n-i) gate for Quantum Fourier Transform
 
     :param int size: total number of qubits, n
     :param intcurrent_qubit: which qubit to apply the rotation gate to, i
+    :param Optional[int] approximation_degree: The maximum distance between
+        the control and target qubit of the rotations to keep, or None to
+        keep all the rotations
     returns:
         Matrix: gate
     """
-    gate: Matrix = DefaultMatrix.identity(2**size)
-    for i in range(1, current_qubit+1):
+    gate: Matrix = IdentityMatrix(2**size)
+    last = current_qubit if approximation_degree is None else \
+        min(current_qubit, approximation_degree)
+    for i in range(1, last+1):
         phi = 2*math.pi/2**(i+1)
         control = current_qubit-i
         gate = gate * g.control_phase(size, [control], current_qubit, phi)
     return gate
 
 
-def inverse_qft_rotation_gate(size: int, current_qubit: int) -> Matrix:
+def inverse_qft_rotation_gate(size: int, current_qubit: int,
+                              approximation_degree: Optional[int] = None
+                              ) -> Matrix:
     """"
     Construct the R2...R(n-i) gate for Inverse Quantum Fourier Transform
 
     :param int size: total number of qubits, n
     :param int current_qubit: which qubit to apply the rotation gate to, i
+    :param Optional[int] approximation_degree: The maximum distance between
+        the control and target qubit of the rotations to keep, or None to
+        keep all the rotations
     """
-    gate: Matrix = DefaultMatrix.identity(2**size)
-    for i in range(0, current_qubit):
+    gate: Matrix = IdentityMatrix(2**size)
+    first = 0 if approximation_degree is None else \
+        max(0, current_qubit-approximation_degree)
+    for i in range(first, current_qubit):
         phi = -2*math.pi/2**(current_qubit+1-i)
         control = i
         gate = gate * g.control_phase(size, [control], current_qubit, phi)
@@ -85,7 +161,9 @@ def inverse_qft_rotation_gate(size: int, current_qubit: int) -> Matrix:
 
 class PhaseEstimation(GeneralAlgorithm):
 
-    def __init__(self, size: int, unitary: Matrix, eigenvector: Matrix):
+    def __init__(self, size: int, unitary: Matrix, eigenvector: Matrix,
+                 state_vector: bool = False,
+                 approximation_degree: Optional[int] = None):
         """
         Implement Phase Estimation, which requires a unitary matrix and one of
         its eigenvector as the input.
@@ -94,6 +172,13 @@ class PhaseEstimation(GeneralAlgorithm):
         :param Matrix unitary: a unitary matrix whose eigenvalue's phase is
             the target
         :param Matrix eigenvector: an eigenvector of the unitary matrix
+        :param bool state_vector: Whether to apply the gates directly to
+            the state vector instead of constructing the circuit matrix
+        :param Optional[int] approximation_degree: The maximum distance
+            between the control and target qubit of the controlled rotations
+            kept in the inverse QFT, or None for the exact inverse QFT. The
+            lower bound on the fidelity of the approximation is stored in
+            fidelity_bound.
 
         Example:
         phase = 0.125
@@ -104,12 +189,16 @@ class PhaseEstimation(GeneralAlgorithm):
         print(PE.measure())
         """
         assert unitary.unitary, "Matrix must be unitary!"
+        assert approximation_degree is None or approximation_degree >= 0, \
+            "approximation degree must be non-negative"
         self.unitary = unitary
+        self.approximation_degree = approximation_degree
+        self.fidelity_bound = qft_fidelity_bound(size, approximation_degree)
 
         self.auxiliary = eigenvector
         self.auxsize = int(math.log2(eigenvector.num_rows))
 
-        super().__init__(size)
+        super().__init__(size, state_vector)
 
     def initial_state(self) -> Matrix:
         """
@@ -119,49 +208,71 @@ class PhaseEstimation(GeneralAlgorithm):
         init = super().initial_state()
         return tp.tensor_product(self.auxiliary, init)
 
-    def first_layer(self) -> Matrix:
+    def first_layer(self) -> Circuit:
         """
-        Tensor Hadamard (first register) with Identity (auxiliary)
+        Hadamard gates on the first register, and the identity on the
+        auxiliary register
         """
-        id = g.multi_gate(self.auxsize, [], g.Gate.I)
-        return tp.tensor_product(
-            id,
-            g.multi_gate(self.size, [i for i in range(self.size)], g.Gate.H)
-        )
+        circuit = Circuit(self.size + self.auxsize)
+        circuit.multi_gate([i for i in range(self.size)], g.Gate.H)
+        return circuit
 
-    def second_layer(self) -> Matrix:
+    def unitary_powers(self) -> List[Matrix]:
         """
-        Control-U Gate applied to auxiliary register
-        """
-        totalsize = self.size+self.auxsize
-        gate = g.multi_gate(totalsize, [], g.Gate.I)
-        rep = 0
-        for i in range(0, self.size):
-            for j in range(2**rep):
-                n = self.size-1-i
-                gate = g.control_u(totalsize, n, self.unitary) * gate
-            rep += 1
-        return gate
+        Compute U^(2^i) for each counting qubit i, by repeatedly squaring
+        the unitary.
 
-    def third_layer(self):
-        """"
-        Inverse QFT Gate tensor for the first register
+        returns:
+            List[Matrix]: The powers of the unitary, indexed by the counting
+            qubit
         """
-        id = g.multi_gate(self.auxsize, [], g.Gate.I)
-        return tp.tensor_product(
-            id,
-            inverse_qft_gate(self.size)
-        )
+        powers = [self.unitary]
+        for _ in range(1, self.size):
+            powers.append(powers[-1] * powers[-1])
+        return powers
 
-    def construct_circuit(self):
+    def second_layer(self) -> Circuit:
         """
-        Combines the layers
+        Control-U Gate applied to auxiliary register, with a single
+        control-U^(2^i) gate for each counting qubit i
         """
-        first = self.first_layer()
-        second = self.second_layer()
-        third = self.third_layer()
+        circuit = Circuit(self.size + self.auxsize)
+        for i, power in enumerate(self.unitary_powers()):
+            circuit.control_u(self.size-1-i, power)
+        return circuit
 
-        return third * second * first
+    def third_layer(self) -> Circuit:
+        """"
+        Inverse QFT Gate on the first register, applied with the FFT unless
+        it is approximated
+        """
+        totalsize = self.size + self.auxsize
+        circuit = Circuit(totalsize)
+        if self.approximation_degree is None:
+            circuit.qft(self.size, inverse=True)
+            return circuit
+
+        for i in range(int(self.size/2)):
+            # swap() indexes from the most significant qubit of the full
+            # register, so offset the targets past the auxiliary register
+            circuit.swap(totalsize-1-i, totalsize-self.size+i)
+        for i in range(0, self.size):
+            first = max(0, i-self.approximation_degree)
+            for j in range(first, i):
+                phi = -2*math.pi/2**(i+1-j)
+                circuit.control_phase([j], i, phi)
+            circuit.multi_gate([i], g.Gate.H)
+        return circuit
+
+    def construct_circuit(self) -> Circuit:
+        """
+        Combines the layers, where the first register occupies the lowest
+        'size' qubits and the auxiliary register the remaining qubits.
+        """
+        circuit = self.first_layer()
+        circuit.extend(self.second_layer())
+        circuit.extend(self.third_layer())
+        return circuit
 
     def measure_probabilities(self):
         p = self.probabilities()
@@ -173,23 +284,15 @@ class PhaseEstimation(GeneralAlgorithm):
 
     def probabilities(self) -> List[float]:
         """
-        Returns the amplitudes of the measured state, representing the
-        probabilities to be in each state.
+        Returns the probabilities to measure each state of the counting
+        register, summed over the states of the auxiliary register.
 
         returns:
             List[float]: A list of states, where each element is the
                 probability to be in that state.
         """
-        n = 2 ** self.size
-
-        result = DefaultMatrix.zeros(n)
-        for i in range(2**self.size):
-            tp_mat = DefaultMatrix.zeros(n)
-            tp_mat[i][0] = 1
-            trial = tp.tensor_product(self.auxiliary, tp_mat)
-            result[i] = (trial.transpose()*self.state)[0]
-
-        return reg.measure(result)
+        return reg.marginal_probabilities(
+            self.state, [i for i in range(self.size)])
 
     def measure_phase(self) -> float:
         """
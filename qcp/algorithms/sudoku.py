@@ -4,6 +4,7 @@ from typing import List, Tuple
 import qcp.gates as g
 import qcp.register as reg
 from qcp.algorithms import GeneralAlgorithm
+from qcp.circuit import Circuit
 
 # This class uses Grover's algorithm to solve the 2x2 sudoku board with 4
 # entries V0, V1, V2, V3 and two number choices, 0 & 1
@@ -23,10 +24,10 @@ from qcp.algorithms import GeneralAlgorithm
 
 class Sudoku(GeneralAlgorithm):
 
-    def __init__(self):
-        super().__init__(9)
+    def __init__(self, state_vector: bool = False):
+        super().__init__(9, state_vector)
 
-    def oracle(self):
+    def oracle(self) -> Circuit:
         """
         The oracle gate for this problem checks the inputs to see whether the
         conditions have been met, using self.sudoku_conditions(), stores
@@ -34,16 +35,17 @@ class Sudoku(GeneralAlgorithm):
         using a cnot gate, and then resets all the condition qubits that were
         changed by self.sudoku_conditions()
 
-        :return: Matrix: representing the oracle gate
+        :return: Circuit: the gates of the oracle
         """
-        had = g.multi_gate(9, [8], g.Gate.H)
-        z = g.multi_gate(9, [8], g.Gate.Z)
-        cond = self.sudoku_conditions()
-        cnot = g.control_x(9, [4, 5, 6, 7], 8)
-        oracle = cond * cnot * cond * z * had
+        oracle = Circuit(9)
+        oracle.multi_gate([8], g.Gate.H)
+        oracle.multi_gate([8], g.Gate.Z)
+        oracle.extend(self.sudoku_conditions())
+        oracle.control_x([4, 5, 6, 7], 8)
+        oracle.extend(self.sudoku_conditions())
         return oracle
 
-    def sudoku_conditions(self):
+    def sudoku_conditions(self) -> Circuit:
         """
         For the 2x2 sudoku board there are 4 conditions which must be true for
         a solution to be valid:
@@ -54,33 +56,40 @@ class Sudoku(GeneralAlgorithm):
         the variables cond1,..,cond4 respectively enforce these conditions by
         applying XOR gates across the relevant input qubits and outputting in
         the relative condition qubit
-        :return: Matrix: representing all of the sudoku conditions
+        :return: Circuit: the gates of all of the sudoku conditions
         """
-        cond1 = g.control_x(9, [1], 4) * g.control_x(9, [0], 4)
-        cond2 = g.control_x(9, [2], 5) * g.control_x(9, [0], 5)
-        cond3 = g.control_x(9, [3], 6) * g.control_x(9, [1], 6)
-        cond4 = g.control_x(9, [3], 7) * g.control_x(9, [2], 7)
-        cond = cond4 * cond3 * cond2 * cond1
+        cond = Circuit(9)
+        for controls, target in [
+            ([0], 4), ([1], 4),
+            ([0], 5), ([2], 5),
+            ([1], 6), ([3], 6),
+            ([2], 7), ([3], 7)
+        ]:
+            cond.control_x(controls, target)
 
         return cond
 
-    def diffusion(self):
+    def diffusion(self) -> Circuit:
         """
         Creates a diffusion gate - a gate which amplifies the probability of
         selecting our target state
 
         returns:
-            Matrix: Matrix representing diffusion gate
+            Circuit: the gates of the diffusion gate
         """
-        had = g.multi_gate(9, [0, 1, 2, 3], g.Gate.H)
-        xs = g.multi_gate(9, [0, 1, 2, 3], g.Gate.X)
-        cz = g.control_z(9, [0, 1, 2], 3)
-
-        diff = had * xs * cz * xs * had
+        inputs = [0, 1, 2, 3]
+        diff = Circuit(9)
+        diff.multi_gate(inputs, g.Gate.H)
+        # Flip the phase of the zero state of the inputs, conditioned on
+        # the other inputs being 0
+        diff.multi_gate([3], g.Gate.X)
+        diff.control_z([0, 1, 2], 3, [0, 0, 0])
+        diff.multi_gate([3], g.Gate.X)
+        diff.multi_gate(inputs, g.Gate.H)
 
         return diff
 
-    def construct_circuit(self):
+    def construct_circuit(self) -> Circuit:
         """
         Constructs the circuit to solve the sudoku problem by implementing the
         hadamard on the first 4 qubits, then the oracle gate across the
@@ -89,15 +98,14 @@ class Sudoku(GeneralAlgorithm):
         of the solution
 
         returns:
-            Matrix representing our completed Grover's algorithm for sudoku
+            Circuit: the gates of our completed Grover's algorithm for sudoku
         """
-        had = g.multi_gate(9, [0, 1, 2, 3], g.Gate.H)
-        circuit = had
+        circuit = Circuit(9)
+        circuit.multi_gate([0, 1, 2, 3], g.Gate.H)
 
         for i in range(2):
-            circuit = self.oracle() * circuit
-
-            circuit = self.diffusion() * circuit
+            circuit.extend(self.oracle())
+            circuit.extend(self.diffusion())
 
         return circuit
 
@@ -110,10 +118,8 @@ class Sudoku(GeneralAlgorithm):
             Tuple[List[str], float]: The input solution observed and the
             probability of observing that solution
         """
-        prob = reg.measure(self.state)
-        sol_probs = [0 for _ in range(16)]
-        for i in range(len(prob)):
-            sol_probs[i % 16] += prob[i]  # type: ignore
+        # The input variables are the lowest 4 qubits
+        sol_probs = reg.marginal_probabilities(self.state, [0, 1, 2, 3])
 
         observed = random.choices(
             [i for i in range(len(sol_probs))], sol_probs, k=1)  # type: ignore
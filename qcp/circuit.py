@@ -0,0 +1,514 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Intermediate representation of a quantum circuit, as the ordered list of the
+gates from :py:mod:`qcp.gates` it applies, which can be applied to a column
+vector Matrix, or to a :py:class:`~qcp.state_vector.StateVector`, or
+materialised into the Matrix of the whole circuit.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import qcp.gates as g
+import qcp.tensor_product as tp
+import qcp.matrices.product_expression as pe
+from qcp.matrices import DiagonalMatrix, IdentityMatrix, Matrix, QFTOperator
+from qcp.state_vector import StateVector
+
+#: The names of the gates applied by
+#: :py:meth:`~Circuit.multi_gate`, which are the values of
+#: :py:class:`~qcp.gates.Gate`
+SINGLE_QUBIT_GATES = [gate.value for gate in g.Gate]
+
+#: The names of all the gates an Instruction can apply
+GATE_NAMES = SINGLE_QUBIT_GATES + [
+    "u", "cx", "cz", "cp", "swap", "cu", "qft", "iqft", "phase_flip",
+    "invert_about_mean", "diagonal", "unitary"
+]
+
+
+class Instruction:
+    """
+    A single gate of a Circuit, given by the name of the gate, the qubits it
+    acts on, the qubits that control it, and any other parameters of the
+    gate.
+    """
+
+    def __init__(self, name: str, targets: List[int],
+                 controls: Optional[List[int]] = None,
+                 params: Sequence[Any] = (),
+                 control_values: Optional[List[int]] = None):
+        """
+        Initialise the Instruction
+
+        :param str name: The name of the gate
+        :param List[int] targets: The qubits the gate acts on
+        :param Optional[List[int]] controls: The qubits that control the
+            gate
+        :param Sequence[Any] params: Any other parameters of the gate, such
+            as the phase of a phase shift.
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        assert name in GATE_NAMES, "unknown gate name"
+        self.name = name
+        self.targets = targets
+        self.controls = controls if controls is not None else []
+        self.params = tuple(params)
+        self.control_values = control_values if control_values is not None \
+            else [1] * len(self.controls)
+        assert len(self.control_values) == len(self.controls), \
+            "need a control value for each control bit"
+        # The matrix of the gate on each size of register it has been
+        # constructed for
+        self._matrices: Dict[int, Matrix] = {}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Instruction):
+            return NotImplemented
+        return self.name == other.name and \
+            self.targets == other.targets and \
+            self.controls == other.controls and \
+            self.control_values == other.control_values and \
+            self.params == other.params
+
+    def __repr__(self) -> str:
+        return f"Instruction({self.name!r}, {self.targets}, " + \
+            f"{self.controls}, {self.params}, {self.control_values})"
+
+    @property
+    def qubits(self) -> List[int]:
+        """
+        All the qubits the gate involves, the controls and the targets
+
+        returns:
+            List[int]: The qubits
+        """
+        return self.controls + self.targets
+
+    def to_matrix(self, size: int) -> Matrix:
+        """
+        The matrix of the gate on a register of the given size, which is
+        only constructed the first time, as the gate isn't modified after it
+        is added to a circuit, so running a circuit repeatedly doesn't
+        rebuild the matrices of its gates.
+
+        :param int size: The number of qubits in the register
+        returns:
+            Matrix: The matrix of the gate
+        """
+        if size not in self._matrices:
+            self._matrices[size] = self._construct_matrix(size)
+        return self._matrices[size]
+
+    def _construct_matrix(self, size: int) -> Matrix:
+        """
+        Construct the matrix of the gate on a register of the given size,
+        with :py:mod:`qcp.gates`
+
+        :param int size: The number of qubits in the register
+        returns:
+            Matrix: The matrix of the gate
+        """
+        if self.name in SINGLE_QUBIT_GATES:
+            phi = self.params[0] if self.params else 0j
+            return g.multi_gate(size, self.targets, g.Gate(self.name), phi)
+        elif self.name == "u":
+            return g.single_qubit_gate(size, self.targets, self.params[0])
+        elif self.name == "cx":
+            return g.control_x(size, self.controls, self.targets[0],
+                               self.control_values)
+        elif self.name == "cz":
+            return g.control_z(size, self.controls, self.targets[0],
+                               self.control_values)
+        elif self.name == "cp":
+            return g.control_phase(size, self.controls, self.targets[0],
+                                   self.params[0], self.control_values)
+        elif self.name == "swap":
+            # The targets are stored little endian, but swap() indexes
+            # from the most significant qubit
+            return g.swap(size, size - 1 - self.targets[0],
+                          size - 1 - self.targets[1])
+        elif self.name == "cu":
+            return g.controlled_unitary(size, self.controls[0],
+                                        self.params[1], self.params[0],
+                                        self.control_values[0])
+        elif self.name in ["qft", "iqft"]:
+            n = len(self.targets)
+            qft = QFTOperator(n, inverse=self.name == "iqft")
+            return tp.tensor_product(IdentityMatrix(2 ** (size - n)), qft)
+        elif self.name == "phase_flip":
+            flipped = set(self.params)
+            return DiagonalMatrix([
+                -1 if i in flipped else 1 for i in range(2 ** size)
+            ])
+        elif self.name == "invert_about_mean":
+            all_qubits = [i for i in range(size)]
+            h = g.multi_gate(size, all_qubits, g.Gate.H)
+            x = g.multi_gate(size, all_qubits, g.Gate.X)
+            cz = g.control_z(size, all_qubits[:-1], size - 1)
+            return h * (x * (cz * (x * h)))
+        # Otherwise the gate is the given diagonal or unitary matrix
+        return self.params[0]
+
+    def apply(self, state: StateVector):
+        """
+        Apply the gate directly to the amplitudes of the state vector
+
+        :param StateVector state: The register to apply the gate to
+        """
+        if self.name in SINGLE_QUBIT_GATES:
+            phi = self.params[0] if self.params else 0j
+            state.multi_gate(self.targets, g.Gate(self.name), phi)
+        elif self.name == "u":
+            for t in self.targets:
+                state.apply_gate(t, self.params[0])
+        elif self.name == "cx":
+            state.control_x(self.controls, self.targets[0],
+                            self.control_values)
+        elif self.name == "cz":
+            state.control_z(self.controls, self.targets[0],
+                            self.control_values)
+        elif self.name == "cp":
+            state.control_phase(self.controls, self.targets[0],
+                                self.params[0], self.control_values)
+        elif self.name == "swap":
+            state.swap(state.size - 1 - self.targets[0],
+                       state.size - 1 - self.targets[1])
+        elif self.name == "cu":
+            state.controlled_unitary(self.controls[0], self.params[1],
+                                     self.params[0], self.control_values[0])
+        elif self.name in ["qft", "iqft"]:
+            state.qft(len(self.targets), inverse=self.name == "iqft")
+        elif self.name == "phase_flip":
+            for index in self.params:
+                state.phase_flip(index)
+        elif self.name == "invert_about_mean":
+            state.invert_about_mean()
+        elif self.name == "diagonal":
+            state.apply_diagonal(self.params[0].diagonal)
+        else:
+            result = self.params[0] * state.to_matrix()
+            state.amplitudes[:] = [row[0] for row in result.get_state()]
+
+    def cost(self, size: int) -> int:
+        """
+        Estimate the number of operations needed to apply the gate to the
+        state vector of a register of the given size.
+
+        :param int size: The number of qubits in the register
+        returns:
+            int: The estimated cost of the gate
+        """
+        n = 2 ** size
+        if self.name == "i":
+            return 0
+        elif self.name in SINGLE_QUBIT_GATES or self.name == "u":
+            return len(self.targets) * n
+        elif self.name == "cu":
+            # Each block of amplitudes where the control qubit has its
+            # control value is multiplied by the unitary
+            return (n // 2) * self.params[0].num_rows
+        elif self.name in ["qft", "iqft"]:
+            return n * (len(self.targets) + 1)
+        elif self.name == "phase_flip":
+            return len(self.params)
+        elif self.name == "unitary":
+            return pe.estimate_nnz(self.params[0])
+        # The remaining gates update each amplitude once
+        return n
+
+
+class Circuit:
+    """
+    The ordered list of the gates of a quantum circuit on a register of the
+    given number of qubits.
+
+    Each gate is added with the method of the same name as the function in
+    :py:mod:`qcp.gates` that constructs it, and the circuit is only turned
+    into matrices when it is run, or explicitly with
+    :py:meth:`~Circuit.to_matrix`.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialise the empty circuit
+
+        :param int size: The number of qubits in the register
+        """
+        assert size > 0, "need at least one qubit"
+        self.size = size
+        self.instructions: List[Instruction] = []
+
+    def __len__(self) -> int:
+        """
+        Return the number of gates in the circuit
+
+        returns:
+            int: The number of gates
+        """
+        return len(self.instructions)
+
+    def __iter__(self) -> Iterator[Instruction]:
+        """
+        Iterate over the gates of the circuit, in the order they are applied
+
+        returns:
+            Iterator[Instruction]: The gates of the circuit
+        """
+        return iter(self.instructions)
+
+    def _check_bits(self, qubits: List[int]):
+        """
+        Check that the qubits are within the register
+
+        :param List[int] qubits: The qubits to check
+        """
+        for q in qubits:
+            assert q in range(self.size), "qubit out of range"
+
+    def append(self, instruction: Instruction):
+        """
+        Add the gate to the end of the circuit
+
+        :param Instruction instruction: The gate to add
+        """
+        self._check_bits(instruction.qubits)
+        self.instructions.append(instruction)
+
+    def extend(self, other: Circuit):
+        """
+        Add the gates of the other circuit to the end of this circuit
+
+        :param Circuit other: The circuit to add
+        """
+        assert other.size == self.size, \
+            "circuits must act on the same number of qubits"
+        self.instructions.extend(other.instructions)
+
+    def multi_gate(self, targets: List[int], gate: g.Gate, phi=0j):
+        """
+        Add the gate of :py:func:`qcp.gates.multi_gate`
+
+        :param List[int] targets: list of qubits to apply the gate to
+        :param Gate gate: The gate to apply
+        :param complex phi: The phase for the phase shift gate
+        """
+        params = [phi] if gate == g.Gate.P else []
+        self.append(Instruction(gate.value, list(targets), params=params))
+
+    def control_x(self, controls: List[int], target: int,
+                  control_values: Optional[List[int]] = None):
+        """
+        Add the gate of :py:func:`qcp.gates.control_x`
+
+        :param List[int] controls: The control qubits
+        :param int target: The target qubit
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self.append(Instruction("cx", [target], list(controls),
+                                control_values=control_values))
+
+    def control_z(self, controls: List[int], target: int,
+                  control_values: Optional[List[int]] = None):
+        """
+        Add the gate of :py:func:`qcp.gates.control_z`
+
+        :param List[int] controls: The control qubits
+        :param int target: The target qubit
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self.append(Instruction("cz", [target], list(controls),
+                                control_values=control_values))
+
+    def control_phase(self, controls: List[int], target: int, phi: complex,
+                      control_values: Optional[List[int]] = None):
+        """
+        Add the gate of :py:func:`qcp.gates.control_phase`
+
+        :param List[int] controls: The control qubits
+        :param int target: The target qubit
+        :param complex phi: The angle of the phase shift
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self.append(Instruction("cp", [target], list(controls), [phi],
+                                control_values))
+
+    def swap(self, target0: int, target1: int):
+        """
+        Add the gate of :py:func:`qcp.gates.swap`
+
+        The targets are indexed from the most significant qubit, as in
+        :py:func:`qcp.gates.swap`, but are stored as the little endian
+        qubits they act on, like the other gates.
+
+        :param int target0: The first target bit to swap
+        :param int target1: The second target bit to swap
+        """
+        self.append(Instruction("swap", [self.size - 1 - target0,
+                                         self.size - 1 - target1]))
+
+    def control_u(self, control: int, unitary: Matrix,
+                  control_value: int = 1):
+        """
+        Add the gate of :py:func:`qcp.gates.control_u`, where the unitary
+        acts on the most significant qubits of the register.
+
+        :param int control: The control qubit
+        :param Matrix unitary: The unitary gate to apply
+        :param int control_value: The value, 0 or 1, the control qubit must
+            have for the unitary to be applied
+        """
+        targetsize = unitary.num_rows.bit_length() - 1
+        target = self.size - targetsize
+        self.controlled_unitary(target - 1 - control, target, unitary,
+                                control_value)
+
+    def controlled_unitary(self, control: int, target: int, unitary: Matrix,
+                           control_value: int = 1):
+        """
+        Add the gate of :py:func:`qcp.gates.controlled_unitary`
+
+        :param int control: The control qubit
+        :param int target: The lowest of the qubits the unitary acts on
+        :param Matrix unitary: The unitary gate to apply
+        :param int control_value: The value, 0 or 1, the control qubit must
+            have for the unitary to be applied
+        """
+        targetsize = unitary.num_rows.bit_length() - 1
+        targets = [i for i in range(target, target + targetsize)]
+        self.append(Instruction("cu", targets, [control], [unitary, target],
+                                [control_value]))
+
+    def qft(self, size: int, inverse: bool = False):
+        """
+        Add the Quantum Fourier Transform of the lowest qubits of the
+        register, :py:class:`~qcp.matrices.qft_operator.QFTOperator`
+
+        :param int size: The number of qubits to transform
+        :param bool inverse: Whether to apply the inverse QFT
+        """
+        name = "iqft" if inverse else "qft"
+        self.append(Instruction(name, [i for i in range(size)]))
+
+    def phase_flip(self, indices: List[int]):
+        """
+        Add the oracle that flips the sign of the amplitudes of the given
+        basis states
+
+        :param List[int] indices: The basis states to flip
+        """
+        for index in indices:
+            assert index in range(2 ** self.size), "index out of range"
+        self.append(Instruction("phase_flip", [i for i in range(self.size)],
+                                params=sorted(set(indices))))
+
+    def invert_about_mean(self):
+        """
+        Add the diffusion gate, the reflection of the amplitudes about their
+        mean
+        """
+        self.append(Instruction("invert_about_mean",
+                                [i for i in range(self.size)]))
+
+    def single_qubit_gate(self, targets: List[int], gate: Matrix):
+        """
+        Add the gate of :py:func:`qcp.gates.single_qubit_gate`
+
+        :param List[int] targets: list of qubits to apply the gate to
+        :param Matrix gate: The 2x2 single qubit gate
+        """
+        assert gate.num_rows == 2 and gate.num_columns == 2, \
+            "can only apply single qubit gates"
+        self.append(Instruction("u", list(targets), params=[gate]))
+
+    def diagonal(self, gate: DiagonalMatrix):
+        """
+        Add the diagonal gate on the whole register, such as the merged
+        product of several phase gates
+
+        :param DiagonalMatrix gate: The diagonal matrix of the gate
+        """
+        assert gate.num_rows == 2 ** self.size, \
+            "gate must act on the whole register"
+        self.append(Instruction("diagonal", [i for i in range(self.size)],
+                                params=[gate]))
+
+    def unitary(self, matrix: Matrix):
+        """
+        Add the given matrix as a gate on the whole register
+
+        :param Matrix matrix: The matrix of the gate
+        """
+        assert matrix.square and matrix.num_rows == 2 ** self.size, \
+            "gate must act on the whole register"
+        self.append(Instruction("unitary", [i for i in range(self.size)],
+                                params=[matrix]))
+
+    def cost(self) -> int:
+        """
+        Estimate the number of operations needed to apply the circuit to
+        the state vector of the register.
+
+        returns:
+            int: The estimated cost of the circuit
+        """
+        return sum(ins.cost(self.size) for ins in self.instructions)
+
+    def to_matrix(self) -> Matrix:
+        """
+        Materialise the circuit into the product of the matrices of its
+        gates
+
+        returns:
+            Matrix: The matrix of the circuit
+        """
+        circuit: Matrix = IdentityMatrix(2 ** self.size)
+        for instruction in self.instructions:
+            circuit = instruction.to_matrix(self.size) * circuit
+        return circuit
+
+    def run(self, state: Matrix) -> Matrix:
+        """
+        Apply the circuit to the column vector of the register, one gate at
+        a time, without constructing the matrix of the whole circuit.
+
+        :param Matrix state: The column vector of the register
+        returns:
+            Matrix: The column vector after the circuit is applied
+        """
+        assert state.num_rows == 2 ** self.size, \
+            "state must have an amplitude for each state of the register"
+        for instruction in self.instructions:
+            state = instruction.to_matrix(self.size) * state
+        return state
+
+    def apply(self, state: StateVector):
+        """
+        Apply the circuit directly to the state vector in place
+
+        :param StateVector state: The register to apply the circuit to
+        """
+        assert state.size == self.size, \
+            "state must have an amplitude for each state of the register"
+        for instruction in self.instructions:
+            instruction.apply(state)
@@ -17,11 +17,11 @@ Grover's Algorithm
 """
 import math
 import cmath
-from qcp.matrices import Matrix, DefaultMatrix, SPARSE
+from qcp.matrices import Matrix, DiagonalMatrix, IdentityMatrix, \
+    HadamardLayer, KroneckerOperator, PermutationMatrix, ControlledOperator
 import qcp.constants as c
-from qcp.matrices.types import MATRIX, SCALARS
-import qcp.tensor_product as tp
-from typing import List
+from qcp.matrices.types import SCALARS
+from typing import List, Optional, Tuple
 import enum
 
 
@@ -46,7 +46,8 @@ class Gate(enum.Enum):
 def multi_gate(size: int, targets: List[int], gate: Gate, phi=0j) -> Matrix:
     """
     Constructs a (2**size by 2**size) gate matrix that applies a
-    specific gate to one or more specified qubits
+    specific gate to one or more specified qubits, as a KroneckerOperator
+    of the single qubit gates, so that the full matrix isn't constructed
 
     :param size int: total number of qubits in circuit
     :param targets List[int]: list of qubits the specified gate will be
@@ -57,8 +58,9 @@ def multi_gate(size: int, targets: List[int], gate: Gate, phi=0j) -> Matrix:
         Matrix: Matrix representing the composite gate
     """
 
+    g: Matrix
     if gate is Gate.H:
-        g = c.TWO_HADAMARD
+        return HadamardLayer(size, targets)
     elif gate is Gate.X:
         g = c.PAULI_X
     elif gate is Gate.Z:
@@ -66,16 +68,67 @@ def multi_gate(size: int, targets: List[int], gate: Gate, phi=0j) -> Matrix:
     elif gate is Gate.P:
         g = phase_shift(phi)
     else:
-        return DefaultMatrix.identity(2 ** size)
+        return IdentityMatrix(2 ** size)
 
-    m: Matrix = DefaultMatrix([[1]])
+    return single_qubit_gate(size, targets, g)
 
-    for i in range(size):
+
+def single_qubit_gate(size: int, targets: List[int], gate: Matrix) -> Matrix:
+    """
+    Constructs a (2**size by 2**size) gate matrix that applies the given
+    2x2 gate to each of the specified qubits, as a KroneckerOperator
+
+    :param size int: total number of qubits in circuit
+    :param targets List[int]: list of qubits the gate will be applied to,
+                    indexing from 0.
+    :param gate Matrix: The 2x2 single qubit gate
+    returns:
+        Matrix: Matrix representing the composite gate
+    """
+    assert gate.num_rows == 2 and gate.num_columns == 2, \
+        "can only apply single qubit gates"
+
+    # The most significant qubit is the first factor of the tensor product
+    factors: List[Matrix] = []
+    for i in range(size - 1, -1, -1):
         if i in targets:
-            m = tp.tensor_product(g, m)
+            factors.append(gate)
         else:
-            m = tp.tensor_product(c.IDENTITY, m)
-    return m
+            factors.append(IdentityMatrix(2))
+    return KroneckerOperator(factors)
+
+
+def control_mask(controls: List[int],
+                 control_values: Optional[List[int]] = None
+                 ) -> Tuple[int, int]:
+    """
+    Construct the bitmask of the control bits, and the value the masked
+    bits of a state index must equal for the controlled gate to act on that
+    state.
+
+    EG: controls = [0, 2, 4] with control_values = [1, 0, 1]
+    gives the mask 10101 and the value 10001 in binary notation
+
+    :param List[int] controls: List of control qubits
+    :param Optional[List[int]] control_values: The value, 0 or 1, each
+        control qubit must have for the gate to act, defaults to 1 for
+        every control qubit
+    returns:
+        Tuple[int, int]: The bitmask of the control bits, and the value of
+        the masked bits
+    """
+    if control_values is None:
+        control_values = [1] * len(controls)
+    assert len(control_values) == len(controls), \
+        "need a control value for each control bit"
+
+    mask = 0
+    value = 0
+    for con, val in zip(controls, control_values):
+        assert val in (0, 1), "control values must be 0 or 1"
+        mask |= 1 << con
+        value |= val << con
+    return mask, value
 
 
 # NOTE:
@@ -92,7 +145,9 @@ def multi_gate(size: int, targets: List[int], gate: Gate, phi=0j) -> Matrix:
 # range [0, 3]
 
 
-def control_x(size: int, controls: List[int], target: int) -> Matrix:
+def control_x(size: int, controls: List[int], target: int,
+              control_values: Optional[List[int]] = None
+              ) -> PermutationMatrix:
     """
     Constructs a (2**size by 2**size) control-x gate with
     given controls and target
@@ -101,8 +156,11 @@ def control_x(size: int, controls: List[int], target: int) -> Matrix:
     :param List[int] controls: List of control qubits,
         if empty, 0th bit is used as the control.
     :param int target: target qubit the x gate will be applied to
+    :param Optional[List[int]] control_values: The value each control
+        qubit must have for the gate to act, defaults to 1 for every
+        control qubit
     returns:
-        Matrix: Matrix representing the gate
+        PermutationMatrix: Matrix representing the gate
     """
     assert size > 1, "need minimum of two qubits"
     n = 2 ** size
@@ -117,16 +175,12 @@ def control_x(size: int, controls: List[int], target: int) -> Matrix:
     assert target not in \
         controls, "control bits and target bit cannot be the same"
 
-    m: SPARSE = {}
+    # The column of the non-zero entry in each row of the gate
+    perm: List[int] = []
 
-    # Use set() to ignore repeat control bits, as we are only interested in
-    # unique control bits
-    # since the controls are the bit positions, we can convert this to a
-    # bitmask by summing them at 2**idx
-    # EG: controls = [0, 2, 4]
-    # corresponds to 0, 4, 16 as numbers,
-    # bitmask is 10101 in binary notation
-    mask = sum(2 ** c for c in set(controls))
+    # The controls are the bit positions, so we can convert them to a
+    # bitmask, and the value the masked bits need to have
+    mask, value = control_mask(controls, control_values)
 
     # Find the bit index of the target
     target_bit = 2 ** target
@@ -138,13 +192,13 @@ def control_x(size: int, controls: List[int], target: int) -> Matrix:
         condition = i & mask
 
         x = i
-        if condition >= mask:
+        if condition == value:
             # bit flip the targetted bit by the control bits
             x ^= target_bit
 
-        m[i] = {x: 1}
+        perm.append(x)
 
-    return DefaultMatrix(m, h=n, w=n)
+    return PermutationMatrix(perm)
 
 
 # NOTE:
@@ -161,8 +215,10 @@ def control_x(size: int, controls: List[int], target: int) -> Matrix:
 # range [0, 3]
 
 
-def _generic_control(size: int, controls: List[int],
-                     target: int, cval: SCALARS) -> Matrix:
+def _generic_control(size: int, controls: List[int], target: int,
+                     cval: SCALARS,
+                     control_values: Optional[List[int]] = None
+                     ) -> DiagonalMatrix:
     """
     Constructs a (2**size by 2**size) control gate with
     given controls, target and the control value.
@@ -173,8 +229,11 @@ def _generic_control(size: int, controls: List[int],
     :param List[int] controls: List of control qubits
     :param int target: target qubit the gate will be applied to
     :param SCALARS cval: The control value in the gate
+    :param Optional[List[int]] control_values: The value each control
+        qubit must have for the gate to act, defaults to 1 for every
+        control qubit
     returns:
-        Matrix: Matrix representing the gate
+        DiagonalMatrix: Matrix representing the gate
     """
     assert size > 1, "need minimum of two qubits"
     n = 2 ** size
@@ -189,16 +248,12 @@ def _generic_control(size: int, controls: List[int],
     assert target not in \
         controls, "control bits and target bit cannot be the same"
 
-    m: SPARSE = {}
+    # The diagonal elements of the gate
+    diagonal: List[SCALARS] = []
 
-    # Use set() to ignore repeat control bits, as we are only interested in
-    # unique control bits
-    # since the controls are the bit positions, we can convert this to a
-    # bitmask by summing them at 2**idx
-    # EG: controls = [0, 2, 4]
-    # corresponds to 0, 4, 16 as numbers,
-    # bitmask is 10101 in binary notation
-    mask = sum(2 ** c for c in set(controls))
+    # The controls are the bit positions, so we can convert them to a
+    # bitmask, and the value the masked bits need to have
+    mask, value = control_mask(controls, control_values)
 
     target_bit = 2 ** target
 
@@ -206,15 +261,13 @@ def _generic_control(size: int, controls: List[int],
         condition1 = (i & target_bit)
         condition2 = i & mask
         val: SCALARS = 1
-        # Modulo 2 filters out an bits that don't meet the condition,
-        # Any number that is of the form of all ones, like 3 = 11, or 7 = 111
-        # Can be determined by taking their modulus with 2, since binary is in
-        # powers of 2.
-        if condition1 == target_bit and condition2 >= mask:
+        # The gate acts when the target bit is set, and the control bits
+        # have their control values
+        if condition1 == target_bit and condition2 == value:
             val = cval
-        m[i] = {i: val}
+        diagonal.append(val)
 
-    return DefaultMatrix(m, h=n, w=n)
+    return DiagonalMatrix(diagonal)
 
 
 # NOTE:
@@ -231,7 +284,8 @@ def _generic_control(size: int, controls: List[int],
 # range [0, 3]
 
 
-def control_z(size: int, controls: List[int], target: int) -> Matrix:
+def control_z(size: int, controls: List[int], target: int,
+              control_values: Optional[List[int]] = None) -> DiagonalMatrix:
     """
     Constructs a (2**size by 2**size) control-z gate with
      given controls and target
@@ -239,10 +293,13 @@ def control_z(size: int, controls: List[int], target: int) -> Matrix:
     :param int size: total number of qubits in circuit
     :param List[int] controls: List of control qubits
     :param int target: target qubit the z gate will be applied to
+    :param Optional[List[int]] control_values: The value each control
+        qubit must have for the gate to act, defaults to 1 for every
+        control qubit
     returns:
-        Matrix: Matrix representing the gate
+        DiagonalMatrix: Matrix representing the gate
     """
-    return _generic_control(size, controls, target, -1)
+    return _generic_control(size, controls, target, -1, control_values)
 
 
 # NOTE:
@@ -260,7 +317,8 @@ def control_z(size: int, controls: List[int], target: int) -> Matrix:
 
 
 def control_phase(size: int, controls: List[int], target: int,
-                  phi: complex) -> Matrix:
+                  phi: complex, control_values: Optional[List[int]] = None
+                  ) -> DiagonalMatrix:
     """
     Constructs a (2**size by 2**size) control-phase gate with
     given controls and target
@@ -269,25 +327,28 @@ def control_phase(size: int, controls: List[int], target: int,
     :param List[int] controls: List of control qubits
     :param int target: target qubit the phase gate will be applied to
     :param complex phi: angle the target qubit will be phase shifted by
+    :param Optional[List[int]] control_values: The value each control
+        qubit must have for the gate to act, defaults to 1 for every
+        control qubit
     returns:
-        Matrix: Matrix representing the gate
+        DiagonalMatrix: Matrix representing the gate
     """
     val = cmath.exp(1j * phi)
-    return _generic_control(size, controls, target, val)
+    return _generic_control(size, controls, target, val, control_values)
 
 
-def phase_shift(phi: complex) -> Matrix:
+def phase_shift(phi: complex) -> DiagonalMatrix:
     """
     Creates a 2 x 2 phase shift matrix
 
     :param complex phi: angle the qubit is phase shifted by
     returns:
-        Matrix: Matrix representing the phase shift gate.
+        DiagonalMatrix: Matrix representing the phase shift gate.
     """
-    return DefaultMatrix([[1, 0], [0, cmath.exp(1j * phi)]])
+    return DiagonalMatrix([1, cmath.exp(1j * phi)])
 
 
-def swap(size: int, target0: int, target1: int) -> Matrix:
+def swap(size: int, target0: int, target1: int) -> PermutationMatrix:
     """
     Construct swap gate which swaps two states
 
@@ -296,9 +357,8 @@ def swap(size: int, target0: int, target1: int) -> Matrix:
     :param int target1: The second target bit to swap
 
     returns:
-        Matrix: Matrix representing the gate
+        PermutationMatrix: Matrix representing the gate
     """
-    # Can be optimized further
 
     assert size > 1, "need minimum of two qbits"
     assert target0 != target1, "swap targets must be different"
@@ -307,44 +367,37 @@ def swap(size: int, target0: int, target1: int) -> Matrix:
     assert target0 in bit_bounds, "first target bit out of range"
     assert target1 in bit_bounds, "second target bit out of range"
 
-    target0, target1 = sorted((target0, target1))
+    # The targets are indexed from the most significant bit, so convert
+    # them to the bit positions
+    shift0 = size - 1 - target0
+    shift1 = size - 1 - target1
+    mask = (1 << shift0) | (1 << shift1)
 
-    n = 2 ** size
-    swapgate: Matrix = DefaultMatrix.zeros(n, n)
-
-    for i in range(2**size):
-        bit_str = (bin(i)[2:].zfill(size))
-        swapbit_str = (
-            bit_str[0:target0] +
-            bit_str[target1] +
-            bit_str[target0+1:target1] +
-            bit_str[target0] +
-            bit_str[target1+1:]
-        )
-
-        bit = int(bit_str, 2)
-        swapbit = int(swapbit_str, 2)
-        vec_entries: MATRIX = [[0] for _ in range(2**size)]
-        swapvec_entries: MATRIX = [[0] for _ in range(2**size)]
-        vec_entries[bit] = [1]
-        swapvec_entries[swapbit] = [1]
-        vector = DefaultMatrix(vec_entries)
-        swapvector = DefaultMatrix(swapvec_entries)
-        # Outer product to create matrix
-        swapgate += swapvector*vector.transpose()
-
-    return swapgate
-
-
-def control_u(size: int, control: int, unitary: Matrix):
+    # The swap only changes the states where the two bits differ, which
+    # are mapped to the state with both bits flipped. The gate is its own
+    # inverse, so the state |i> is mapped to |perm[i]> and vice versa.
+    perm = [
+        i ^ mask if ((i >> shift0) ^ (i >> shift1)) & 1 else i
+        for i in range(2 ** size)
+    ]
+
+    return PermutationMatrix(perm)
+
+
+def control_u(size: int, control: int, unitary: Matrix,
+              control_value: int = 1) -> ControlledOperator:
     """
-    Implement the control U gate
+    Implement the control U gate, where the unitary acts on the most
+    significant qubits of the register, and the control qubit is indexed
+    down from the qubit below the unitary.
 
     :param int size: number of qubits
     :param int control: control qubit
     :param Matrix unitary: Unitary gate to apply
+    :param int control_value: The value, 0 or 1, the control qubit must
+        have for the unitary to be applied
     returns:
-        Matrix: Matrix representing the gate
+        ControlledOperator: Matrix representing the gate
     """
     assert size > 1, "need minimum of two qubits"
 
@@ -356,25 +409,29 @@ def control_u(size: int, control: int, unitary: Matrix):
     assert unitary.square, "unitary matrix must be square"
     assert unitary.num_rows < size, "unitary matrix too big"
 
-    gate0 = DefaultMatrix([[1, 0], [0, 0]])
-    gate1 = DefaultMatrix([[0, 0], [0, 1]])
-
     targetsize = int(math.log2(unitary.num_rows))
+    target = size - targetsize
+    return controlled_unitary(size, target - 1 - control, target, unitary,
+                              control_value)
 
-    n1 = 2**(control + targetsize)
-    id1 = DefaultMatrix.identity(n1)
-    n2 = 2**(size - 1 - control - targetsize)
-    id2 = DefaultMatrix.identity(n2)
-
-    interim1 = tp.tensor_product(gate0, id2)
-    cu_gate = tp.tensor_product(id1, interim1)
-
-    n3 = 2**control
-    id3 = DefaultMatrix.identity(n3)
 
-    interim2 = tp.tensor_product(id3, gate1)
-    interim3 = tp.tensor_product(interim2, id2)
-
-    cu_gate += tp.tensor_product(unitary, interim3)
+def controlled_unitary(size: int, control: int, target: int,
+                       unitary: Matrix, control_value: int = 1
+                       ) -> ControlledOperator:
+    """
+    Construct the gate that applies the unitary to the consecutive qubits
+    from the target qubit up when the control qubit has the control value,
+    without constructing the blocks of the identity and the unitary.
 
-    return cu_gate
+    :param int size: number of qubits
+    :param int control: control qubit
+    :param int target: The lowest of the qubits the unitary acts on
+    :param Matrix unitary: Unitary gate to apply, of dimension 2**k to act
+        on k qubits
+    :param int control_value: The value, 0 or 1, the control qubit must
+        have for the unitary to be applied
+    returns:
+        ControlledOperator: Matrix representing the gate
+    """
+    assert size > 1, "need minimum of two qubits"
+    return ControlledOperator(size, control, target, unitary, control_value)
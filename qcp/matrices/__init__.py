@@ -12,16 +12,38 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """
-Module containing pure Python implementations of matrices.
+Module containing pure Python implementations of matrices, and a numpy
+backed implementation.
 """
+from typing import TYPE_CHECKING
+
 from qcp.matrices.matrix import Matrix  # noqa: F401
 from qcp.matrices.sparse_matrix import SparseMatrix  # noqa: F401
+from qcp.matrices.csr_matrix import CSRMatrix  # noqa: F401
 from qcp.matrices.dense_matrix import DenseMatrix  # noqa: F401
+from qcp.matrices.numpy_matrix import NumpyMatrix  # noqa: F401
+from qcp.matrices.default_matrix import DefaultMatrixProxy, \
+    get_default_matrix, set_default_matrix  # noqa: F401
+from qcp.matrices.structured_matrix import StructuredMatrix  # noqa: F401
+from qcp.matrices.permutation_matrix import PermutationMatrix  # noqa: F401
+from qcp.matrices.diagonal_matrix import DiagonalMatrix  # noqa: F401
+from qcp.matrices.identity_matrix import IdentityMatrix  # noqa: F401
+from qcp.matrices.product_expression import LazyMatrix, \
+    ProductExpression  # noqa: F401
+from qcp.matrices.kronecker_operator import KroneckerOperator  # noqa: F401
+from qcp.matrices.hadamard_layer import HadamardLayer  # noqa: F401
+from qcp.matrices.qft_operator import QFTOperator  # noqa: F401
+from qcp.matrices.controlled_operator import ControlledOperator  # noqa: F401
 
 from qcp.matrices.types import SCALARS, SCALARS_T, VECTOR, \
     MATRIX, SPARSE  # noqa: F401
 
-#: Quick type referencing for the preferred `Matrix` class to use,
-#: so that if we want to change it later, all we have to do is modify this
-#: line
-DefaultMatrix = SparseMatrix
+#: Quick type referencing for the preferred `Matrix` class to use.
+#: Constructing a DefaultMatrix creates a matrix of the backend chosen by
+#: the ``QCP_DEFAULT_MATRIX`` environment variable, or by
+#: :py:func:`~qcp.matrices.default_matrix.set_default_matrix`, which is a
+#: SparseMatrix unless changed.
+if TYPE_CHECKING:
+    DefaultMatrix = SparseMatrix
+else:
+    DefaultMatrix = DefaultMatrixProxy
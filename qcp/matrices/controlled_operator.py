@@ -0,0 +1,290 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Controlled unitary gates, stored as the unitary and the qubits it acts on,
+which are applied to vectors by only updating the amplitudes where the
+control qubit has its control value.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator, Union
+
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.product_expression import LazyMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector
+from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, SPARSE, \
+    VECTOR
+
+
+def _blocks(size: int, control_bit: int, control_set: int,
+            target_mask: int) -> Iterator[int]:
+    """
+    Iterate over the states where the control bit has the control value,
+    and all the target bits are 0, the first state of each block of
+    amplitudes a controlled gate mixes.
+
+    :param int size: The number of qubits in the register
+    :param int control_bit: The bit of the control qubit
+    :param int control_set: The value of the control bit in each state
+    :param int target_mask: The bits of the target qubits
+    returns:
+        Iterator[int]: The first state index of each block
+    """
+    # Enumerate every combination of the bits that are neither the
+    # control or target bits, in increasing order
+    free = ((1 << size) - 1) & ~control_bit & ~target_mask
+    bits = 0
+    while True:
+        yield bits | control_set
+        bits = (bits - free) & free
+        if bits == 0:
+            return
+
+
+def apply_controlled(vector: VECTOR, control: int, target: int,
+                     unitary: MATRIX, control_value: int = 1):
+    """
+    Apply the controlled unitary in place to the vector, only updating the
+    amplitudes where the control qubit has the control value, by applying
+    the unitary to each block of the amplitudes that differ only in the
+    target qubits.
+
+    The qubits are indexed in the little endian convention of
+    :py:mod:`qcp.gates`, so qubit k corresponds to the bit 2**k of the
+    vector index.
+
+    :param VECTOR vector: The amplitudes to transform
+    :param int control: The control qubit
+    :param int target: The lowest of the qubits the unitary acts on
+    :param MATRIX unitary: The rows of the unitary gate
+    :param int control_value: The value, 0 or 1, the control qubit must
+        have for the unitary to be applied
+    """
+    size = len(vector).bit_length() - 1
+    dim = len(unitary)
+    control_bit = 1 << control
+    control_set = control_bit if control_value else 0
+    target_mask = (dim - 1) << target
+
+    for base in _blocks(size, control_bit, control_set, target_mask):
+        # Gather the amplitudes the unitary mixes, and apply it to them
+        indices = [base | (m << target) for m in range(dim)]
+        block = [vector[i] for i in indices]
+        for k, i in enumerate(indices):
+            vector[i] = sum(unitary[k][m] * block[m] for m in range(dim))
+
+
+class ControlledOperator(LazyMatrix):
+    """
+    The controlled unitary gate on a register, which applies the unitary to
+    a range of consecutive target qubits when the control qubit has the
+    control value, and the identity otherwise.
+
+    This is the sum of the blocks |0><0| x I and |1><1| x U (for the control
+    value 1), but neither block is constructed.
+
+    The qubits are indexed in the little endian convention of
+    :py:mod:`qcp.gates`, so qubit k corresponds to the bit 2**k of the
+    state index.
+    """
+
+    def __init__(self, size: int, control: int, target: int,
+                 unitary: Matrix, control_value: int = 1):
+        """
+        Initialise the ControlledOperator
+
+        :param int size: The number of qubits in the register
+        :param int control: The control qubit
+        :param int target: The lowest of the qubits the unitary acts on
+        :param Matrix unitary: The unitary gate, of dimension 2**k to act on
+            the k qubits from the target qubit up
+        :param int control_value: The value, 0 or 1, the control qubit must
+            have for the unitary to be applied
+        """
+        assert unitary.square, "unitary matrix must be square"
+        dim = unitary.num_rows
+        # A 1x1 unitary is a phase applied when the control qubit is set
+        assert dim & (dim - 1) == 0, \
+            "unitary matrix must act on a whole number of qubits"
+        targetsize = dim.bit_length() - 1
+
+        assert control in range(size), "control bit out of range"
+        assert target >= 0 and target + targetsize <= size, \
+            "target bits out of range"
+        assert control not in range(target, target + targetsize), \
+            "control bit cannot be a target bit"
+        assert control_value in (0, 1), "control values must be 0 or 1"
+
+        self.size = size
+        self.control = control
+        self.target = target
+        self.unitary_matrix = unitary
+        self.control_value = control_value
+
+        self._u = unitary.get_state()
+        self._dim = dim
+        self._control_bit = 1 << control
+        self._control_set = self._control_bit if control_value else 0
+        self._target_mask = (dim - 1) << target
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the ControlledOperator.
+
+        returns:
+            int: The number of rows
+        """
+        return 1 << self.size
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the ControlledOperator.
+
+        returns:
+            int: The number of columns.
+        """
+        return 1 << self.size
+
+    @property
+    def unitary(self) -> bool:
+        """
+        The controlled gate is unitary when the gate it controls is
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return self.unitary_matrix.unitary
+
+    def _controlled(self, i: int) -> bool:
+        """
+        Whether the control qubit of the state has the control value
+
+        :param int i: The state index
+        returns:
+            bool: Whether the unitary acts on the state
+        """
+        return i & self._control_bit == self._control_set
+
+    def _row(self, i: int) -> Dict[int, SCALARS]:
+        """
+        Calculate the non-zero entries of row i.
+
+        :param int i: The row index
+        returns:
+            Dict[int, SCALARS]: The column index mapping to the row values
+        """
+        if not self._controlled(i):
+            return {i: 1}
+
+        base = i & ~self._target_mask
+        r = (i & self._target_mask) >> self.target
+        return {
+            base | (m << self.target): v
+            for m, v in enumerate(self._u[r]) if v != 0
+        }
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i, which is the row of the identity if the
+        control qubit doesn't have the control value, and otherwise the row
+        of the unitary.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return SparseVector(self._row(i), self.num_columns)
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        entries: SPARSE = {i: self._row(i) for i in range(self.num_rows)}
+        return SparseMatrix(entries, w=self.num_columns, h=self.num_rows)
+
+    def transpose(self) -> ControlledOperator:
+        """
+        The transpose is the controlled transpose of the unitary.
+
+        returns:
+            ControlledOperator: The transpose of the current matrix.
+        """
+        return ControlledOperator(self.size, self.control, self.target,
+                                  self.unitary_matrix.transpose(),
+                                  self.control_value)
+
+    def conjugate(self) -> ControlledOperator:
+        """
+        The conjugate is the controlled conjugate of the unitary.
+
+        returns:
+            ControlledOperator: The conjugated matrix
+        """
+        return ControlledOperator(self.size, self.control, self.target,
+                                  self.unitary_matrix.conjugate(),
+                                  self.control_value)
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements, by only updating the amplitudes where
+        the control qubit has the control value.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The elements of the
+            resultant column vector
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+
+        v = list(vector)
+        apply_controlled(v, self.control, self.target, self._u,
+                         self.control_value)
+        return v
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return self.to_sparse() * other
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _estimate_nnz(self) -> int:
+        """
+        Half the rows are rows of the identity, and the other half rows of
+        the unitary.
+
+        returns:
+            int: The number of non-zero entries
+        """
+        return (self.num_rows // 2) * (1 + self._dim)
+
+    def _apply_cost(self) -> int:
+        """
+        The number of multiplications needed to apply the gate to a single
+        column vector.
+
+        returns:
+            int: The cost
+        """
+        return (self.num_rows // 2) * self._dim
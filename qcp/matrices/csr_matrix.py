@@ -0,0 +1,789 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import cmath
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+from qcp.matrices import Matrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector
+from qcp.matrices.structured_matrix import StructuredMatrix
+from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, SPARSE
+
+
+class _CSRRow(SparseVector):
+    """
+    Row of a CSRMatrix, where setting a value writes it through to the
+    matrix buffers, and setting a value to zero removes it from them.
+    """
+
+    def __init__(self, matrix: CSRMatrix, i: int):
+        """
+        Create the row view of the given row of the matrix
+
+        :param CSRMatrix matrix: The matrix the row belongs to
+        :param int i: The row index
+        """
+        super().__init__(matrix._row_dict(i), matrix.num_columns)
+        self._matrix = matrix
+        self._i = i
+
+    def __setitem__(self, j: int, v: SCALARS):
+        assert j < len(self), "index out of range"
+        if v == 0:
+            self._entries.pop(j, None)
+        else:
+            self._entries[j] = v
+        self._matrix._set_value(self._i, j, v)
+
+
+class CSRMatrix(Matrix):
+    """
+    Implementation of a Sparse Matrix in the Compressed Sparse Row format,
+    where the non-zero elements are stored row by row in flat
+    :py:mod:`array` buffers:
+
+    * ``indptr``: row i's entries are at positions
+      ``indptr[i]:indptr[i+1]`` of the other buffers
+    * ``indices``: the column index of each entry, sorted in each row
+    * ``data``: the values of each entry, held as separate real and
+      imaginary buffers, as :py:mod:`array` has no complex type.
+    """
+
+    def __init__(self, state: Union[MATRIX, SPARSE], w: int = -1, h: int = -1):
+        """
+        Initialise a CSRMatrix using either a List[List[]] object, or a
+        pre-indexed dictionary mapping indices to non-zero values, in the
+        same way as :py:obj:`~qcp.matrices.sparse_matrix.SparseMatrix`.
+
+        :param Union[MATRIX, SPARSE] state: object containing the
+            matrix elements.
+        :param int w: Optional overload of the Matrix width dimension
+        :param int h: Optional overload of the Matrix height dimension
+        """
+        if isinstance(state, dict):
+            # A SparseMatrix of a dictionary only refers to the entries, so
+            # is reused to infer the dimensions without copying them.
+            sp = SparseMatrix(state, w=w, h=h)
+            self._from_entries(state, sp.num_columns, sp.num_rows)
+            return
+
+        nrow = h if h > 0 else len(state)
+        ncol = w if w > 0 else (len(state[0]) if nrow > 0 else 0)
+        self._from_rows(state, ncol, nrow)
+
+    def _clear(self, ncol: int, nrow: int):
+        """
+        Set the dimensions, and empty the CSR buffers.
+
+        :param int ncol: The number of columns
+        :param int nrow: The number of rows
+        """
+        self._col = ncol
+        self._row = nrow
+        self._indptr = array("l", [0])
+        self._indices = array("l")
+        self._real = array("d")
+        self._imag = array("d")
+
+    def _from_rows(self, rows: MATRIX, ncol: int, nrow: int):
+        """
+        Populate the CSR buffers from the nested list of the rows, where
+        missing elements are zero, and elements beyond the dimensions are
+        ignored.
+
+        :param MATRIX rows: The elements of each row
+        :param int ncol: The number of columns
+        :param int nrow: The number of rows
+        """
+        self._clear(ncol, nrow)
+
+        for i in range(nrow):
+            row = rows[i] if i < len(rows) else []
+            for j in range(min(ncol, len(row))):
+                v = row[j]
+                # Only the non-zero elements are stored
+                if cmath.isclose(v, 0):
+                    continue
+                self._indices.append(j)
+                self._append_value(v)
+            self._indptr.append(len(self._indices))
+
+    def _from_entries(self, entries: SPARSE, ncol: int, nrow: int):
+        """
+        Populate the CSR buffers from the dictionary of non-zero entries.
+
+        :param SPARSE entries: The row/column index mapping to the values
+        :param int ncol: The number of columns
+        :param int nrow: The number of rows
+        """
+        self._clear(ncol, nrow)
+
+        for i in range(nrow):
+            row = entries.get(i, {})
+            for j in sorted(row.keys()):
+                v = row[j]
+                if cmath.isclose(v, 0):
+                    continue
+                self._indices.append(j)
+                self._append_value(v)
+            self._indptr.append(len(self._indices))
+
+    def _append_value(self, v: SCALARS):
+        """
+        Append the value to the data buffers
+
+        :param SCALARS v: The value to append
+        """
+        c = complex(v)
+        self._real.append(c.real)
+        self._imag.append(c.imag)
+
+    @staticmethod
+    def _empty(nrow: int, ncol: int) -> CSRMatrix:
+        """
+        Create a CSRMatrix with empty buffers, to be filled row by row
+
+        :param int nrow: The number of rows
+        :param int ncol: The number of columns
+        returns:
+            CSRMatrix: The matrix with no entries
+        """
+        m = CSRMatrix.__new__(CSRMatrix)
+        m._clear(ncol, nrow)
+        return m
+
+    @staticmethod
+    def from_sparse(entries: SPARSE, w: int = -1, h: int = -1) -> CSRMatrix:
+        """
+        Create a CSRMatrix from the dictionary format used by
+        :py:obj:`~qcp.matrices.sparse_matrix.SparseMatrix`
+
+        :param SPARSE entries: The row/column index mapping to the values
+        :param int w: Optional overload of the Matrix width dimension
+        :param int h: Optional overload of the Matrix height dimension
+        returns:
+            CSRMatrix: The matrix of the given entries
+        """
+        return CSRMatrix(entries, w=w, h=h)
+
+    @staticmethod
+    def from_coo(rows: Sequence[int], cols: Sequence[int],
+                 values: Sequence[SCALARS], w: int, h: int) -> CSRMatrix:
+        """
+        Create a CSRMatrix from coordinate format triplets, where repeated
+        row/column pairs are summed together.
+
+        :param Sequence[int] rows: The row index of each value
+        :param Sequence[int] cols: The column index of each value
+        :param Sequence[SCALARS] values: The values
+        :param int w: The Matrix width dimension
+        :param int h: The Matrix height dimension
+        returns:
+            CSRMatrix: The matrix of the given entries
+        """
+        assert len(rows) == len(cols) == len(values), \
+            "coordinate lists must be the same length"
+        for i, j in zip(rows, cols):
+            assert i < h and j < w, "index out of range"
+
+        # Walk the triplets in row/column order, so the buffers are filled
+        # row by row, summing the runs of repeated row/column pairs
+        order = sorted(range(len(values)), key=lambda k: (rows[k], cols[k]))
+        m = CSRMatrix._empty(h, w)
+        k = 0
+        for i in range(h):
+            while k < len(order) and rows[order[k]] == i:
+                j = cols[order[k]]
+                v: SCALARS = 0
+                while k < len(order) and rows[order[k]] == i and \
+                        cols[order[k]] == j:
+                    v += values[order[k]]
+                    k += 1
+                if cmath.isclose(v, 0):
+                    continue
+                m._indices.append(j)
+                m._append_value(v)
+            m._indptr.append(len(m._indices))
+
+        return m
+
+    @staticmethod
+    def from_matrix(m: Matrix) -> CSRMatrix:
+        """
+        Convert any Matrix into a CSRMatrix, without copying if it is
+        already a CSRMatrix.
+
+        :param Matrix m: The matrix to convert
+        returns:
+            CSRMatrix: The matrix with the same elements
+        """
+        if isinstance(m, CSRMatrix):
+            return m
+        if isinstance(m, SparseMatrix):
+            return CSRMatrix(m._entries, w=m.num_columns, h=m.num_rows)
+        return CSRMatrix(m.get_state(), w=m.num_columns, h=m.num_rows)
+
+    @staticmethod
+    def identity(n: int) -> CSRMatrix:
+        """
+        Create the identity matrix with the given dimensions
+
+        :param int n: The matrix dimension
+        returns:
+            CSRMatrix: The CSRMatrix identity matrix object.
+        """
+        assert isinstance(n, int), "matrix dimension must be an integer"
+        assert n > 0, "Matrix dimension must be positive"
+
+        m = CSRMatrix._empty(n, n)
+        m._indptr = array("l", range(n + 1))
+        m._indices = array("l", range(n))
+        m._real = array("d", [1.0]) * n
+        m._imag = array("d", [0.0]) * n
+        return m
+
+    @staticmethod
+    def zeros(nrow: int, ncol: int = 1) -> CSRMatrix:
+        """
+        Create a CSRMatrix of given dimensions, where each value of the
+        matrix is zero.
+
+        :param int nrow: The row dimension of the CSRMatrix
+        :param int ncol: The (optional) column dimenion of the CSRMatrix
+            defaults to 1, to be a column vector.
+        returns:
+            CSRMatrix: The matrix object of our given size.
+        """
+        m = CSRMatrix._empty(nrow, ncol)
+        m._indptr = array("l", [0]) * (nrow + 1)
+        return m
+
+    @property
+    def indptr(self) -> array:
+        """
+        The buffer of offsets of each row in the indices/data buffers
+
+        returns:
+            array: The num_rows + 1 row offsets
+        """
+        return self._indptr
+
+    @property
+    def indices(self) -> array:
+        """
+        The buffer of column indices of the non-zero entries
+
+        returns:
+            array: The column indices
+        """
+        return self._indices
+
+    @property
+    def data(self) -> List[SCALARS]:
+        """
+        The values of the non-zero entries, in the same order as the
+        indices buffer
+
+        returns:
+            List[SCALARS]: The values
+        """
+        return [self._value(p) for p in range(len(self._indices))]
+
+    @property
+    def nnz(self) -> int:
+        """
+        The number of stored non-zero entries
+
+        returns:
+            int: The number of entries
+        """
+        return len(self._indices)
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the CSRMatrix.
+
+        returns:
+            int: The number of rows
+        """
+        return self._row
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the CSRMatrix.
+
+        returns:
+            int: The number of columns.
+        """
+        return self._col
+
+    @property
+    def unitary(self) -> bool:
+        """
+        Check if matrix is Unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        if not self.square:
+            return False
+        test = self.transpose().conjugate()._dot_csr(self)
+        for i in range(test.num_rows):
+            row = dict(test.iter_row(i))
+            if not cmath.isclose(row.pop(i, 0), 1):
+                return False
+            for v in row.values():
+                if not cmath.isclose(v, 0, abs_tol=1e-9):
+                    return False
+        return True
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows in the CSRMatrix.
+
+        returns:
+            int: The number of rows in the CSRMatrix
+        """
+        return self._row
+
+    def _value(self, p: int) -> SCALARS:
+        """
+        Read the value at the given position of the data buffers
+
+        :param int p: The position in the buffers
+        returns:
+            SCALARS: The value, as a float if it is real.
+        """
+        im = self._imag[p]
+        if im == 0:
+            return self._real[p]
+        return complex(self._real[p], im)
+
+    def iter_row(self, i: int) -> Iterator[Tuple[int, SCALARS]]:
+        """
+        Iterate over the non-zero entries of the given row, in order of
+        increasing column index.
+
+        :param int i: The row index
+        returns:
+            Iterator[Tuple[int, SCALARS]]: The column index and value of
+            each entry
+        """
+        assert i < self.num_rows, "index out of range"
+        for p in range(self._indptr[i], self._indptr[i + 1]):
+            yield self._indices[p], self._value(p)
+
+    def iter_rows(self) -> Iterator[Tuple[int, int, SCALARS]]:
+        """
+        Iterate over all the non-zero entries, row by row.
+
+        returns:
+            Iterator[Tuple[int, int, SCALARS]]: The row index, column index
+            and value of each entry
+        """
+        indptr, indices = self._indptr, self._indices
+        for i in range(self._row):
+            for p in range(indptr[i], indptr[i + 1]):
+                yield i, indices[p], self._value(p)
+
+    def _row_dict(self, i: int) -> Dict[int, SCALARS]:
+        """
+        The non-zero entries of the given row as a dictionary
+
+        :param int i: The row index
+        returns:
+            Dict[int, SCALARS]: The column index mapping to the values
+        """
+        return dict(self.iter_row(i))
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Convert to the dictionary backed SparseMatrix
+
+        returns:
+            SparseMatrix: The matrix with the same elements
+        """
+        entries: SPARSE = {i: self._row_dict(i) for i in range(self._row)}
+        return SparseMatrix(entries, w=self._col, h=self._row)
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the given row as a SparseVector, where setting an element of
+        the row sets it in the matrix.
+
+        :param int i: The row index
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return _CSRRow(self, i)
+
+    def _set_value(self, i: int, j: int, v: SCALARS):
+        """
+        Set a single element of the matrix, inserting it into the buffers
+        if the entry was not stored yet, or removing it from the buffers if
+        the new value is zero, so zeros are never stored.
+
+        :param int i: The row index
+        :param int j: The column index
+        :param SCALARS v: The new value
+        """
+        assert j < self.num_columns, "index out of range"
+        c = complex(v)
+        start, end = self._indptr[i], self._indptr[i + 1]
+        p = start
+        while p < end and self._indices[p] < j:
+            p += 1
+        stored = p < end and self._indices[p] == j
+
+        if c == 0:
+            if stored:
+                del self._indices[p]
+                del self._real[p]
+                del self._imag[p]
+                self._shift_rows(i, -1)
+        elif stored:
+            self._real[p] = c.real
+            self._imag[p] = c.imag
+        else:
+            self._indices.insert(p, j)
+            self._real.insert(p, c.real)
+            self._imag.insert(p, c.imag)
+            self._shift_rows(i, 1)
+
+    def _shift_rows(self, i: int, delta: int):
+        """
+        Move the offsets of the rows after the given row, after the number
+        of entries in the row changed.
+
+        :param int i: The row index whose entries changed
+        :param int delta: The change in the number of entries of the row
+        """
+        for k in range(i + 1, self._row + 1):
+            self._indptr[k] += delta
+
+    def __setitem__(self, i: int, v:  # type: ignore[override]
+                    Union[SparseVector, List[SCALARS], Dict[int, SCALARS]]
+                    ):
+        """
+        Replace the given row in place.
+
+        The entries of the row are spliced into the buffers, which moves the
+        entries of all the following rows, so assigning rows one at a time
+        costs O(nnz) each. Build the matrix from all its rows at once, or
+        with :py:meth:`~CSRMatrix.from_coo`, instead where possible.
+
+        :param int i: The row index to modify
+        :param Union[SparseVector, List[SCALARS], Dict[int, SCALARS]] v: The
+            new row, zeros in which aren't stored
+        """
+        assert i < self.num_rows, "index out of range"
+        if isinstance(v, list):
+            assert len(v) == self.num_columns, "row dimension does not match"
+            row = SparseVector(v, self.num_columns)._entries
+        elif isinstance(v, dict):
+            row = v
+        else:
+            row = v._entries
+
+        indices = array("l")
+        real = array("d")
+        imag = array("d")
+        for j in sorted(row.keys()):
+            assert j < self.num_columns, "index out of range"
+            c = complex(row[j])
+            if c == 0:
+                continue
+            indices.append(j)
+            real.append(c.real)
+            imag.append(c.imag)
+
+        start, end = self._indptr[i], self._indptr[i + 1]
+        self._indices[start:end] = indices
+        self._real[start:end] = real
+        self._imag[start:end] = imag
+        self._shift_rows(i, len(indices) - (end - start))
+
+    def get_state(self) -> MATRIX:
+        """
+        Return the matrix values as a nested list
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values indexed by row/column
+        """
+        list_representation: MATRIX = [
+            [0 for _ in range(self.num_columns)] for _ in range(self.num_rows)
+        ]
+        for i, j, v in self.iter_rows():
+            list_representation[i][j] = v
+
+        return list_representation
+
+    def rows(self) -> MATRIX:
+        """
+        Equivalent to get_state().
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values indexed by row/column
+        """
+        return self.get_state()
+
+    def columns(self) -> MATRIX:
+        """
+        The transpose of the matrix as a nested list
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values transposed, indexed by column/row
+        """
+        return self.transpose().get_state()
+
+    def transpose(self) -> CSRMatrix:
+        """
+        Flips the matrix elements along the diagonal, and return a new
+        CSRMatrix containing these values.
+
+        The entries are bucketed by column in a single pass, so the
+        transpose takes O(nnz + num_columns) time.
+
+        returns:
+            CSRMatrix: The transpose of the current matrix.
+        """
+        nnz = self.nnz
+        counts = [0] * (self._col + 1)
+        for j in self._indices:
+            counts[j + 1] += 1
+        for j in range(self._col):
+            counts[j + 1] += counts[j]
+
+        t = CSRMatrix._empty(self._col, self._row)
+        t._indptr = array("l", counts)
+        t._indices = array("l", [0]) * nnz
+        t._real = array("d", [0.0]) * nnz
+        t._imag = array("d", [0.0]) * nnz
+
+        # The next free position in each of the transposed rows
+        pos = counts[:-1]
+        for i in range(self._row):
+            for p in range(self._indptr[i], self._indptr[i + 1]):
+                j = self._indices[p]
+                q = pos[j]
+                t._indices[q] = i
+                t._real[q] = self._real[p]
+                t._imag[q] = self._imag[p]
+                pos[j] += 1
+
+        return t
+
+    def _copy_with(self, real: array, imag: array) -> CSRMatrix:
+        """
+        Create a CSRMatrix with the same sparsity structure, but with the
+        given data buffers.
+
+        :param array real: The real parts of the values
+        :param array imag: The imaginary parts of the values
+        returns:
+            CSRMatrix: The new matrix
+        """
+        m = CSRMatrix._empty(self._row, self._col)
+        m._indptr = array("l", self._indptr)
+        m._indices = array("l", self._indices)
+        m._real = real
+        m._imag = imag
+        return m
+
+    def conjugate(self) -> CSRMatrix:
+        """
+        Create a new CSRMatrix where each value in the matrix is the
+        complex conjugate of the current matrix values.
+
+        returns:
+            CSRMatrix: The conjugated matrix.
+        """
+        return self._copy_with(array("d", self._real),
+                               array("d", [-v for v in self._imag]))
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the matrix
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        assert self.square, "can only take the trace of square matrices"
+        tr: SCALARS = 0
+        for i in range(self.num_rows):
+            for j, v in self.iter_row(i):
+                if j == i:
+                    tr += v
+                    break
+        return tr
+
+    def _merge(self, other: Matrix, alpha: SCALARS) -> CSRMatrix:
+        """
+        Calculate self + alpha * other by merging the sorted rows of both
+        matrices.
+
+        :param Matrix other: The matrix to add
+        :param SCALARS alpha: The factor to scale the other matrix by
+        returns:
+            CSRMatrix: A new matrix of the sum
+        """
+        o = CSRMatrix.from_matrix(other)
+        result = CSRMatrix._empty(self._row, self._col)
+
+        for i in range(self._row):
+            row = self._row_dict(i)
+            for j, v in o.iter_row(i):
+                row[j] = row.get(j, 0) + alpha * v
+            for j in sorted(row.keys()):
+                if cmath.isclose(row[j], 0):
+                    continue
+                result._indices.append(j)
+                result._append_value(row[j])
+            result._indptr.append(len(result._indices))
+
+        return result
+
+    def copy(self) -> CSRMatrix:
+        """
+        Create a copy of this CSRMatrix, that can be modified without
+        changing this matrix.
+
+        returns:
+            CSRMatrix: The copied matrix
+        """
+        m = CSRMatrix.__new__(CSRMatrix)
+        m._col = self._col
+        m._row = self._row
+        m._indptr = array("l", self._indptr)
+        m._indices = array("l", self._indices)
+        m._real = array("d", self._real)
+        m._imag = array("d", self._imag)
+        return m
+
+    def __add__(self, other: Matrix) -> Matrix:
+        assert self.num_rows == other.num_rows and \
+            self.num_columns == other.num_columns, \
+            "Matrix dimensions must be equal for addition"
+        return self._merge(other, 1)
+
+    def __sub__(self, other: Matrix) -> Matrix:
+        assert self.num_rows == other.num_rows and \
+            self.num_columns == other.num_columns, \
+            "Matrix dimensions must be equal for subtraction"
+        return self._merge(other, -1)
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            s = complex(other)
+            real = array("d")
+            imag = array("d")
+            for re, im in zip(self._real, self._imag):
+                v = complex(re, im) * s
+                real.append(v.real)
+                imag.append(v.imag)
+            return self._copy_with(real, imag)
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        assert other.num_rows > 0, "taking dot product with empty matrix"
+        assert self.num_columns == other.num_rows, \
+            "matrices don't match on their row/column dimensions"
+
+        if isinstance(other, StructuredMatrix):
+            return other._rdot(self)
+        return self._dot_csr(CSRMatrix.from_matrix(other))
+
+    def _dot_csr(self, other: CSRMatrix) -> CSRMatrix:
+        """
+        Row-wise product of two CSRMatrix objects, where each row of this
+        matrix scales and accumulates the rows of the other matrix that its
+        non-zero entries select, so only non-zero products are computed.
+
+        :param CSRMatrix other: The matrix to dot product with this one.
+
+        returns:
+            CSRMatrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        result = CSRMatrix._empty(self._row, other._col)
+        indptr, indices = self._indptr, self._indices
+        real, imag = self._real, self._imag
+        o_indptr, o_indices = other._indptr, other._indices
+        o_real, o_imag = other._real, other._imag
+        r_indices, r_real, r_imag = \
+            result._indices, result._real, result._imag
+
+        for i in range(self._row):
+            # The real and imaginary parts of the row are accumulated
+            # separately, straight from the buffers
+            acc_re: Dict[int, float] = {}
+            acc_im: Dict[int, float] = {}
+            for p in range(indptr[i], indptr[i + 1]):
+                a_re = real[p]
+                a_im = imag[p]
+                k = indices[p]
+                for q in range(o_indptr[k], o_indptr[k + 1]):
+                    j = o_indices[q]
+                    b_re = o_real[q]
+                    b_im = o_imag[q]
+                    acc_re[j] = acc_re.get(j, 0.0) + a_re * b_re - a_im * b_im
+                    acc_im[j] = acc_im.get(j, 0.0) + a_re * b_im + a_im * b_re
+
+            for j in sorted(acc_re.keys()):
+                re = acc_re[j]
+                im = acc_im[j]
+                if re == 0 and im == 0:
+                    continue
+                r_indices.append(j)
+                r_real.append(re)
+                r_imag.append(im)
+            result._indptr.append(len(r_indices))
+
+        return result
+
+    def __str__(self) -> str:
+        total_string = ""
+        state = self.get_state()
+        for i in range(self.num_rows):
+            row_repr = []
+            for v in state[i]:
+                if isinstance(v, complex) and cmath.isclose(v.imag, 0):
+                    v = v.real
+                row_repr.append(f"{v:3.3g}")
+            total_string += "[" + ",".join(row_repr) + "]"
+            # Don't add newline for last row:
+            total_string += self._optional_newline(i, self.num_rows)
+        return total_string
@@ -0,0 +1,123 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Selection of the `Matrix` implementation used as the
+:py:obj:`~qcp.matrices.DefaultMatrix`.
+
+The backend can be chosen before the program starts with the
+``QCP_DEFAULT_MATRIX`` environment variable, or at runtime with
+:py:func:`~qcp.matrices.default_matrix.set_default_matrix`.
+"""
+import os
+from abc import ABCMeta
+from typing import Dict, Type, Union
+
+from qcp.matrices.csr_matrix import CSRMatrix
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import NumpyMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix
+from qcp.matrices.types import SPARSE
+
+#: Name of the environment variable used to choose the default backend
+ENVIRONMENT_VARIABLE = "QCP_DEFAULT_MATRIX"
+
+#: The Matrix implementations that can be used as the DefaultMatrix, they
+#: all accept the (state, w, h) constructor arguments
+BACKENDS: Dict[str, Type[Matrix]] = {
+    "sparse": SparseMatrix,
+    "csr": CSRMatrix,
+    "numpy": NumpyMatrix,
+}
+
+_default: Type[Matrix] = SparseMatrix
+
+
+def get_default_matrix() -> Type[Matrix]:
+    """
+    Get the Matrix implementation currently used as the DefaultMatrix
+
+    returns:
+        Type[Matrix]: The Matrix class
+    """
+    return _default
+
+
+def set_default_matrix(backend: Union[str, Type[Matrix]]):
+    """
+    Change the Matrix implementation used by the DefaultMatrix.
+
+    Matrices that were already constructed, such as those in
+    :py:mod:`qcp.constants`, keep their type.
+
+    :param Union[str, Type[Matrix]] backend: Either the name of the backend
+        in :py:obj:`~qcp.matrices.default_matrix.BACKENDS`, or the Matrix
+        class itself.
+    """
+    global _default
+
+    if isinstance(backend, str):
+        assert backend.lower() in BACKENDS, \
+            f"unknown matrix backend '{backend}', " + \
+            f"choose from: {', '.join(BACKENDS.keys())}"
+        backend = BACKENDS[backend.lower()]
+
+    assert issubclass(backend, Matrix), "backend must be a Matrix class"
+    _default = backend
+
+
+def matrix_like(m: Matrix, entries: SPARSE, w: int, h: int) -> Matrix:
+    """
+    Construct a matrix from the given entries, using the same backend as the
+    given matrix if it is one of the
+    :py:obj:`~qcp.matrices.default_matrix.BACKENDS`, or the current default
+    backend otherwise.
+
+    :param Matrix m: The matrix to match the backend of
+    :param SPARSE entries: The non-zero entries of the new matrix
+    :param int w: The width of the new matrix
+    :param int h: The height of the new matrix
+    returns:
+        Matrix: The new matrix
+    """
+    backend = type(m) if type(m) in BACKENDS.values() else _default
+    return backend(entries, w=w, h=h)  # type: ignore[arg-type, call-arg]
+
+
+class _DefaultMatrixMeta(ABCMeta):
+    """
+    Metaclass that forwards the construction, static methods and instance
+    checks of the DefaultMatrix to the currently selected backend
+    """
+
+    def __call__(cls, *args, **kwargs):
+        return _default(*args, **kwargs)
+
+    def __getattr__(cls, name: str):
+        return getattr(_default, name)
+
+    def __instancecheck__(cls, instance) -> bool:
+        return isinstance(instance, _default)
+
+
+class DefaultMatrixProxy(metaclass=_DefaultMatrixMeta):
+    """
+    Stand-in for the selected Matrix implementation, so that modules that
+    imported the DefaultMatrix pick up a change of backend without needing
+    to be modified.
+    """
+    pass
+
+
+if os.environ.get(ENVIRONMENT_VARIABLE):
+    set_default_matrix(os.environ[ENVIRONMENT_VARIABLE])
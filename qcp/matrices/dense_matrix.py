@@ -17,6 +17,7 @@ import cmath
 from typing import Union
 
 from qcp.matrices import Matrix
+from qcp.matrices.structured_matrix import StructuredMatrix
 from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, VECTOR
 
 
@@ -188,6 +189,16 @@ class DenseMatrix(Matrix):
     def __iter__(self):
         return iter(self.get_state())
 
+    def copy(self) -> DenseMatrix:
+        """
+        Create a copy of this DenseMatrix, that can be modified without
+        changing this matrix.
+
+        returns:
+            DenseMatrix: The copied matrix
+        """
+        return DenseMatrix([list(row) for row in self._state])
+
     def __add__(self, other: Matrix) -> Matrix:
         assert len(self) == len(other) and len(self[0]) == len(
             other[0]), "Matrix dimensions must be equal for addition"
@@ -226,6 +237,11 @@ class DenseMatrix(Matrix):
             Matrix: A new matrix that conforms to the rules of matrix
             dot producting.
         """
+        # Structured matrices check the dimensions themselves, without
+        # needing to construct their columns
+        if isinstance(other, StructuredMatrix):
+            return other._rdot(self)
+
         assert len(other) > 0, "taking dot product with empty matrix"
         assert len(self) == len(other.columns()[
             0]), "matrices don't match on their row/column dimensions"
@@ -0,0 +1,264 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import numpy as np
+
+from qcp.matrices.default_matrix import matrix_like
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import DTYPE, NumpyMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector, \
+    _row_entries
+from qcp.matrices.structured_matrix import StructuredMatrix
+from qcp.matrices.types import SCALARS, SCALARS_T, SPARSE, VECTOR
+
+
+class DiagonalMatrix(StructuredMatrix):
+    """
+    Implementation of a diagonal matrix, such as the Z/phase/controlled phase
+    gates, stored as the flat complex128 numpy array of the diagonal
+    elements, so products with it are vectorised.
+
+    Applying the matrix to a vector v gives the vector with elements
+    diagonal[i] * v[i].
+    """
+
+    def __init__(self, diagonal: Union[Sequence[SCALARS], np.ndarray]):
+        """
+        Initialise the DiagonalMatrix from the elements on the diagonal.
+
+        :param Union[Sequence[SCALARS], np.ndarray] diagonal: The diagonal
+            elements
+        """
+        assert len(diagonal) > 0, \
+            "attempting to initialise matrix with no dimensions"
+        self._diagonal = np.array(diagonal, dtype=DTYPE)
+        assert self._diagonal.ndim == 1, "the diagonal must be flat"
+
+    @staticmethod
+    def identity(n: int) -> DiagonalMatrix:
+        """
+        Create the identity matrix with the given dimensions
+
+        :param int n: The matrix dimension
+        returns:
+            DiagonalMatrix: The identity matrix of given dimension
+        """
+        assert isinstance(n, int), "matrix dimension must be an integer"
+        assert n > 0, "Matrix dimension must be positive"
+
+        return DiagonalMatrix(np.ones(n, dtype=DTYPE))
+
+    @property
+    def diagonal(self) -> VECTOR:
+        """
+        The elements on the diagonal of the matrix.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The diagonal elements
+        """
+        return self._diagonal.tolist()
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The underlying complex128 numpy array of the diagonal elements.
+
+        returns:
+            np.ndarray: The 1D array of the diagonal elements
+        """
+        return self._diagonal
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the DiagonalMatrix.
+
+        returns:
+            int: The number of rows
+        """
+        return len(self._diagonal)
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the DiagonalMatrix.
+
+        returns:
+            int: The number of columns.
+        """
+        return len(self._diagonal)
+
+    @property
+    def unitary(self) -> bool:
+        """
+        A diagonal matrix is unitary if all the diagonal elements have unit
+        magnitude.
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return bool(np.allclose(np.abs(self._diagonal), 1, rtol=1E-9,
+                                atol=0))
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i, as a sparse vector with the single diagonal
+        entry.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        d = complex(self._diagonal[i])
+        return SparseVector({} if d == 0 else {i: d}, self.num_columns)
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        n = self.num_rows
+        entries: SPARSE = {
+            i: {} if d == 0 else {i: d}
+            for i, d in enumerate(self._diagonal.tolist())
+        }
+        return SparseMatrix(entries, w=n, h=n)
+
+    def transpose(self) -> DiagonalMatrix:
+        """
+        A diagonal matrix is symmetric, so the transpose is the same matrix.
+
+        returns:
+            DiagonalMatrix: The transpose of the current matrix.
+        """
+        return DiagonalMatrix(self._diagonal)
+
+    def conjugate(self) -> DiagonalMatrix:
+        """
+        Create a new DiagonalMatrix where each diagonal element is the
+        complex conjugate of the current diagonal elements.
+
+        returns:
+            DiagonalMatrix: The conjugated matrix
+        """
+        return DiagonalMatrix(self._diagonal.conjugate())
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the matrix
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        return complex(self._diagonal.sum())
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The scaled elements
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+        return (self._diagonal * np.asarray(vector, dtype=DTYPE)).tolist()
+
+    def __add__(self, other: Matrix) -> Matrix:
+        if isinstance(other, DiagonalMatrix):
+            assert self.num_rows == other.num_rows, \
+                "Matrix dimensions must be equal for addition"
+            return DiagonalMatrix(self._diagonal + other._diagonal)
+        return self.to_sparse() + other
+
+    def __sub__(self, other: Matrix) -> Matrix:
+        if isinstance(other, DiagonalMatrix):
+            assert self.num_rows == other.num_rows, \
+                "Matrix dimensions must be equal for subtraction"
+            return DiagonalMatrix(self._diagonal - other._diagonal)
+        return self.to_sparse() - other
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return DiagonalMatrix(self._diagonal * other)
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        which scales each row of the other Matrix by the matching diagonal
+        element.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=False)
+
+        if isinstance(other, DiagonalMatrix):
+            return DiagonalMatrix(self._diagonal * other._diagonal)
+        if isinstance(other, NumpyMatrix):
+            return NumpyMatrix(self._diagonal[:, np.newaxis] * other.array)
+        if isinstance(other, StructuredMatrix):
+            return other._rdot(self)
+
+        entries: SPARSE = {}
+        for i, d in enumerate(self._diagonal.tolist()):
+            # The row entries are non-zero, so only a zero on the diagonal
+            # gives zeros in the result
+            if d == 0:
+                entries[i] = {}
+                continue
+            entries[i] = {j: d * v for j, v in _row_entries(other, i).items()}
+        return matrix_like(other, entries, other.num_columns, self.num_rows)
+
+    def _rdot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product with this matrix on the right hand side,
+        other * self, which scales each column of the other Matrix by the
+        matching diagonal element.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=True)
+
+        if isinstance(other, NumpyMatrix):
+            return NumpyMatrix(other.array * self._diagonal[np.newaxis, :])
+
+        diagonal = self._diagonal.tolist()
+        entries: SPARSE = {}
+        for i in range(other.num_rows):
+            entries[i] = {
+                j: v * diagonal[j] for j, v in _row_entries(other, i).items()
+                if diagonal[j] != 0
+            }
+        return matrix_like(other, entries, self.num_columns, other.num_rows)
@@ -0,0 +1,130 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Layers of Hadamard gates, which are applied to vectors with the fast
+Walsh-Hadamard transform.
+"""
+from __future__ import annotations
+
+import math
+from typing import Iterable, List
+
+from qcp.matrices.default_matrix import get_default_matrix
+from qcp.matrices.identity_matrix import IdentityMatrix
+from qcp.matrices.kronecker_operator import KroneckerOperator
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.types import VECTOR
+
+
+def walsh_hadamard(vector: VECTOR, targets: Iterable[int]):
+    """
+    Apply a Hadamard gate to each of the target qubits of the vector in
+    place, with the butterflies of the fast Walsh-Hadamard transform, in
+    O(len(targets) * len(vector)) operations.
+
+    The qubits are indexed in the little endian convention of
+    :py:mod:`qcp.gates`, so qubit k corresponds to the bit 2**k of the
+    vector index.
+
+    :param VECTOR vector: The amplitudes to transform
+    :param Iterable[int] targets: The qubits to apply the Hadamard gate to
+    """
+    n = len(vector)
+    bits = set(targets)
+    for t in bits:
+        assert 1 << t < n, "target bit out of range"
+
+    for t in bits:
+        stride = 1 << t
+        for block in range(0, n, 2 * stride):
+            for i in range(block, block + stride):
+                j = i + stride
+                a = vector[i]
+                b = vector[j]
+                vector[i] = a + b
+                vector[j] = a - b
+
+    # Normalise once at the end, rather than at each butterfly
+    if bits:
+        scale = 2 ** (-len(bits) / 2)
+        for i in range(n):
+            vector[i] *= scale
+
+
+class HadamardLayer(KroneckerOperator):
+    """
+    KroneckerOperator of Hadamard gates on the targeted qubits, and the
+    identity on the rest, that is applied to vectors with the fast
+    Walsh-Hadamard transform.
+    """
+
+    def __init__(self, size: int, targets: List[int]):
+        """
+        Initialise the layer of Hadamard gates
+
+        :param int size: The number of qubits
+        :param List[int] targets: The qubits to apply the Hadamard gate to
+        """
+        assert size > 0, "need at least one qubit"
+        self.size = size
+        self.targets = sorted(set(targets))
+        for t in self.targets:
+            assert t in range(size), "target bit out of range"
+
+        factor = 1 / math.sqrt(2)
+        backend = get_default_matrix()
+        hadamard = backend([[factor, factor], [factor, -factor]])
+
+        # The most significant qubit is the first factor of the tensor
+        # product
+        factors: List[Matrix] = [
+            hadamard if i in self.targets else IdentityMatrix(2)
+            for i in range(size - 1, -1, -1)
+        ]
+        super().__init__(factors)
+
+    def transpose(self) -> HadamardLayer:
+        """
+        The Hadamard gate is symmetric, so the transpose is the same matrix.
+
+        returns:
+            HadamardLayer: The transpose of the current matrix.
+        """
+        return self
+
+    def conjugate(self) -> HadamardLayer:
+        """
+        The Hadamard gate is real, so the conjugate is the same matrix.
+
+        returns:
+            HadamardLayer: The conjugated matrix
+        """
+        return self
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements, with the fast Walsh-Hadamard transform.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The elements of the
+            resultant column vector
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+
+        v = list(vector)
+        walsh_hadamard(v, self.targets)
+        return v
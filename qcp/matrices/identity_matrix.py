@@ -0,0 +1,209 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Union
+
+from qcp.matrices.csr_matrix import CSRMatrix
+from qcp.matrices.dense_matrix import DenseMatrix
+from qcp.matrices.diagonal_matrix import DiagonalMatrix
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import NumpyMatrix
+from qcp.matrices.permutation_matrix import PermutationMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector
+from qcp.matrices.structured_matrix import StructuredMatrix
+from qcp.matrices.types import SCALARS, SCALARS_T, VECTOR
+
+
+def _copy(other: Matrix) -> Matrix:
+    """
+    Copy the matrix, so the product with the identity can be modified
+    without changing the matrix it was multiplied with. The elements of a
+    StructuredMatrix can't be modified, so those aren't copied.
+
+    :param Matrix other: The matrix to copy
+    returns:
+        Matrix: The copy of the matrix
+    """
+    if isinstance(other, (SparseMatrix, CSRMatrix, DenseMatrix,
+                          NumpyMatrix)):
+        return other.copy()
+    return other
+
+
+class IdentityMatrix(StructuredMatrix):
+    """
+    Implementation of the identity matrix, that only stores it's dimension.
+
+    Multiplying any matrix by the IdentityMatrix returns that matrix
+    unchanged, without doing any work.
+    """
+
+    def __init__(self, n: int):
+        """
+        Initialise the IdentityMatrix with the given dimension
+
+        :param int n: The matrix dimension
+        """
+        assert isinstance(n, int), "matrix dimension must be an integer"
+        assert n > 0, "Matrix dimension must be positive"
+
+        self._n = n
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the IdentityMatrix.
+
+        returns:
+            int: The number of rows
+        """
+        return self._n
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the IdentityMatrix.
+
+        returns:
+            int: The number of columns.
+        """
+        return self._n
+
+    @property
+    def unitary(self) -> bool:
+        """
+        The identity matrix is always unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return True
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i, as a sparse vector with the single non-zero
+        entry.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return SparseVector({i: 1}, self.num_columns)
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        return SparseMatrix.identity(self._n)
+
+    def as_permutation(self) -> PermutationMatrix:
+        """
+        Represent the identity as the PermutationMatrix that leaves every
+        index in place.
+
+        returns:
+            PermutationMatrix: The identity permutation
+        """
+        return PermutationMatrix.identity(self._n)
+
+    def as_diagonal(self) -> DiagonalMatrix:
+        """
+        Represent the identity as the DiagonalMatrix of ones.
+
+        returns:
+            DiagonalMatrix: The diagonal identity matrix
+        """
+        return DiagonalMatrix.identity(self._n)
+
+    def transpose(self) -> IdentityMatrix:
+        """
+        The identity is symmetric, so the transpose is the same matrix.
+
+        returns:
+            IdentityMatrix: The transpose of the current matrix.
+        """
+        return self
+
+    def conjugate(self) -> IdentityMatrix:
+        """
+        The identity is real, so the conjugate is the same matrix.
+
+        returns:
+            IdentityMatrix: The conjugated matrix
+        """
+        return self
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the matrix, which is
+        the dimension of the matrix.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        return self._n
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: A copy of the elements
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+        return list(vector)
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return DiagonalMatrix([other] * self._n)
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        which is a copy of the other Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: The copy of the other matrix
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=False)
+        return _copy(other)
+
+    def _rdot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product with this matrix on the right hand side,
+        other * self, which is a copy of the other Matrix.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+
+        returns:
+            Matrix: The copy of the other matrix
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=True)
+        return _copy(other)
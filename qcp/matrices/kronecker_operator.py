@@ -0,0 +1,366 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from qcp.matrices.default_matrix import matrix_like
+from qcp.matrices.diagonal_matrix import DiagonalMatrix
+from qcp.matrices.identity_matrix import IdentityMatrix
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import NumpyMatrix
+from qcp.matrices.product_expression import LazyMatrix, estimate_nnz
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector, \
+    _row_entries
+from qcp.matrices.types import SCALARS, SCALARS_T, SPARSE, VECTOR
+
+
+class KroneckerOperator(LazyMatrix):
+    """
+    Lazy representation of the tensor product of a list of small matrices,
+    such as a layer of single qubit gates, which is applied to a vector one
+    factor at a time instead of constructing the full matrix.
+
+    The factors are in the same order as
+    :py:meth:`qcp.tensor_product.tensor_product`, so the first factor acts on
+    the most significant part of the indices.
+
+    Products with other square matrices are deferred into a
+    :py:obj:`~qcp.matrices.product_expression.ProductExpression`, unless
+    they can be multiplied factor by factor.
+    """
+
+    def __init__(self, factors: Sequence[Matrix]):
+        """
+        Initialise the KroneckerOperator from the factors of the tensor
+        product, nested KroneckerOperators are flattened into their factors.
+
+        :param Sequence[Matrix] factors: The matrices to tensor product
+        """
+        assert len(factors) > 0, "need at least one factor"
+
+        self._factors: List[Matrix] = []
+        for f in factors:
+            if isinstance(f, KroneckerOperator):
+                self._factors.extend(f.factors)
+            else:
+                self._factors.append(f)
+
+    @property
+    def factors(self) -> List[Matrix]:
+        """
+        The factors of the tensor product.
+
+        returns:
+            List[Matrix]: The matrices in the tensor product
+        """
+        return self._factors
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the KroneckerOperator.
+
+        returns:
+            int: The number of rows
+        """
+        return math.prod(f.num_rows for f in self._factors)
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the KroneckerOperator.
+
+        returns:
+            int: The number of columns.
+        """
+        return math.prod(f.num_columns for f in self._factors)
+
+    @property
+    def unitary(self) -> bool:
+        """
+        The tensor product of unitary matrices is unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return all(f.unitary for f in self._factors)
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i, from the tensor product of the matching rows
+        of each factor.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return SparseVector(self._row(i), self.num_columns)
+
+    def _row(self, i: int) -> Dict[int, SCALARS]:
+        """
+        Calculate the non-zero entries of row i.
+
+        :param int i: The row index
+        returns:
+            Dict[int, SCALARS]: The column index mapping to the row values
+        """
+        # Split the row index into the row index of each factor, the last
+        # factor varies the fastest
+        indices = []
+        for f in reversed(self._factors):
+            i, r = divmod(i, f.num_rows)
+            indices.append(r)
+        indices.reverse()
+
+        row: Dict[int, SCALARS] = {0: 1}
+        for f, r in zip(self._factors, indices):
+            q = f.num_columns
+            f_row = _row_entries(f, r)
+            row = {
+                j * q + k: v * a
+                for j, v in row.items() for k, a in f_row.items()
+            }
+        return row
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        entries: SPARSE = {i: self._row(i) for i in range(self.num_rows)}
+        return SparseMatrix(entries, w=self.num_columns, h=self.num_rows)
+
+    def materialise(self) -> Matrix:
+        """
+        Construct the full matrix of the tensor product, using the default
+        Matrix backend.
+
+        returns:
+            Matrix: The tensor product of the factors
+        """
+        sparse = self.to_sparse()
+        return matrix_like(self, sparse._entries, sparse.num_columns,
+                           sparse.num_rows)
+
+    def transpose(self) -> KroneckerOperator:
+        """
+        The transpose of a tensor product is the tensor product of the
+        transposed factors.
+
+        returns:
+            KroneckerOperator: The transpose of the current matrix.
+        """
+        return KroneckerOperator([f.transpose() for f in self._factors])
+
+    def conjugate(self) -> KroneckerOperator:
+        """
+        The conjugate of a tensor product is the tensor product of the
+        conjugated factors.
+
+        returns:
+            KroneckerOperator: The conjugated matrix
+        """
+        return KroneckerOperator([f.conjugate() for f in self._factors])
+
+    def trace(self) -> SCALARS:
+        """
+        The trace of a tensor product is the product of the traces of the
+        factors.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        assert self.square, "can only take the trace of square matrices"
+        tr: SCALARS = 1
+        for f in self._factors:
+            tr *= f.trace()
+        return tr
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements, by applying each factor in turn to the
+        index of the vector it acts on.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The elements of the
+            resultant column vector
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+
+        dims = [f.num_columns for f in self._factors]
+        v = list(vector)
+
+        for t, f in enumerate(self._factors):
+            if isinstance(f, IdentityMatrix):
+                continue
+
+            q = dims[t]
+            p = f.num_rows
+            # The vector index is split as (left, factor index, right)
+            left = math.prod(dims[:t])
+            right = math.prod(dims[t + 1:])
+
+            rows = [_row_entries(f, i) for i in range(p)]
+            out: VECTOR = [0] * (left * p * right)
+            for lft in range(left):
+                base_in = lft * q * right
+                base_out = lft * p * right
+                for i, row in enumerate(rows):
+                    o = base_out + i * right
+                    for k, a in row.items():
+                        src = base_in + k * right
+                        for r in range(right):
+                            out[o + r] += a * v[src + r]
+
+            v = out
+            dims[t] = p
+
+        return v
+
+    def _apply_numpy(self, array: np.ndarray) -> np.ndarray:
+        """
+        Calculate the product of this matrix with the columns of a 2D numpy
+        array, contracting each factor with the matching axis.
+
+        :param np.ndarray array: The matrix to apply this matrix to
+        returns:
+            np.ndarray: The resultant matrix
+        """
+        ncol = array.shape[1]
+        x = array.reshape([f.num_columns for f in self._factors] + [ncol])
+
+        for t, f in enumerate(self._factors):
+            if isinstance(f, IdentityMatrix):
+                continue
+            factor = NumpyMatrix.from_matrix(f).array
+            x = np.moveaxis(np.tensordot(factor, x, axes=([1], [t])), 0, t)
+
+        return x.reshape(self.num_rows, ncol)
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            # Scale using a 1x1 factor, to leave the other factors unchanged
+            return KroneckerOperator([DiagonalMatrix([other])] +
+                                     self._factors)
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _matches(self, other: KroneckerOperator) -> bool:
+        """
+        Whether the factors of the two tensor products can be multiplied
+        together factor by factor.
+
+        :param KroneckerOperator other: The right hand side of the product
+        returns:
+            bool: Whether the factor dimensions match
+        """
+        return len(self._factors) == len(other._factors) and all(
+            a.num_columns == b.num_rows
+            for a, b in zip(self._factors, other._factors)
+        )
+
+    def _estimate_nnz(self) -> int:
+        """
+        The number of non-zero entries is the product of the number in each
+        factor.
+
+        returns:
+            int: The estimated number of non-zero entries
+        """
+        nnz = 1
+        for f in self._factors:
+            nnz *= estimate_nnz(f)
+        return nnz
+
+    def _apply_cost(self) -> Optional[int]:
+        """
+        The number of multiplications needed to apply this matrix to a
+        single column vector, one factor at a time.
+
+        returns:
+            Optional[int]: The cost
+        """
+        size = max(self.num_rows, self.num_columns)
+        return sum(
+            size // f.num_columns * estimate_nnz(f)
+            for f in self._factors if not isinstance(f, IdentityMatrix)
+        )
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        factor by factor if the other matrix is a matching
+        KroneckerOperator, otherwise deferring the product or applying this
+        matrix to each column of the other Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=False)
+
+        if isinstance(other, KroneckerOperator) and self._matches(other):
+            # (A x B)(C x D) = AC x BD
+            return KroneckerOperator([
+                a * b for a, b in zip(self._factors, other._factors)
+            ])
+        return super()._dot(other)
+
+    def _eager_dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        by applying this matrix to each column of the other Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        if isinstance(other, NumpyMatrix):
+            return NumpyMatrix(self._apply_numpy(other.array))
+        return super()._eager_dot(other)
+
+    def _eager_rdot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product with this matrix on the right hand side,
+        other * self, by applying the transpose of this matrix to each row of
+        the other Matrix.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        if isinstance(other, NumpyMatrix):
+            transposed = self.transpose()
+            return NumpyMatrix(transposed._apply_numpy(other.array.T).T)
+        return super()._eager_rdot(other)
@@ -0,0 +1,331 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+import cmath
+from typing import Union
+
+import numpy as np
+
+from qcp.matrices import Matrix
+from qcp.matrices.structured_matrix import StructuredMatrix
+from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, SPARSE
+
+#: The element type all NumpyMatrix arrays are stored as
+DTYPE = np.complex128
+
+
+class NumpyMatrix(Matrix):
+    """
+    Implementation of a Matrix backed by a contiguous complex128 numpy
+    array, so that the matrix operations are vectorised.
+    """
+
+    # Stop numpy scalars/arrays from trying to broadcast over the matrix in
+    # binary operations, so that the Matrix operator overloads are used
+    __array_ufunc__ = None
+
+    def __init__(self, state: Union[MATRIX, SPARSE, np.ndarray],
+                 w: int = -1, h: int = -1):
+        """
+        Initialise the NumpyMatrix, using either a nested list, a
+        pre-indexed dictionary mapping indices to non-zero values in the
+        same format as :py:obj:`~qcp.matrices.sparse_matrix.SparseMatrix`,
+        or a 2D numpy array.
+
+        :param Union[MATRIX, SPARSE, np.ndarray] state: object containing
+            the matrix elements.
+        :param int w: Optional overload of the Matrix width dimension
+        :param int h: Optional overload of the Matrix height dimension
+        """
+        if isinstance(state, np.ndarray):
+            assert state.ndim == 2, "numpy arrays must be two dimensional"
+            self._array = np.ascontiguousarray(state, dtype=DTYPE)
+            return
+
+        if isinstance(state, dict):
+            nrow = h if h > 0 else (max(state.keys()) + 1 if state else 1)
+            ncol = w
+            if ncol <= 0:
+                ncol = max(
+                    [max(row.keys()) + 1 for row in state.values() if row],
+                    default=0
+                )
+
+            self._array = np.zeros((nrow, ncol), dtype=DTYPE)
+            for i, entries in state.items():
+                for j, v in entries.items():
+                    self._array[i, j] = v
+            return
+
+        assert len(
+            state) > 0, "attempting to initialise matrix with no dimensions"
+        nrow = h if h > 0 else len(state)
+        ncol = w if w > 0 else len(state[0])
+
+        self._array = np.zeros((nrow, ncol), dtype=DTYPE)
+        for i in range(min(nrow, len(state))):
+            row = state[i][:ncol]
+            self._array[i, :len(row)] = row
+
+    @staticmethod
+    def identity(n: int) -> NumpyMatrix:
+        """
+        Create the identity matrix with the given dimensions
+
+        :param int n: The matrix dimension
+        returns:
+            NumpyMatrix: The identity matrix of given dimension
+        """
+        assert isinstance(n, int), "matrix dimension must be an integer"
+        assert n > 0, "Matrix dimension must be positive"
+
+        return NumpyMatrix(np.eye(n, dtype=DTYPE))
+
+    @staticmethod
+    def zeros(nrow: int, ncol: int = 1) -> NumpyMatrix:
+        """
+        Create a NumpyMatrix of given dimensions, where each value of the
+        matrix is zero.
+
+        :param int nrow: The row dimension of the NumpyMatrix
+        :param int ncol: The (optional) column dimenion of the NumpyMatrix
+            defaults to 1, to be a column vector.
+        returns:
+            NumpyMatrix: The matrix object of our given size.
+        """
+        return NumpyMatrix(np.zeros((nrow, ncol), dtype=DTYPE))
+
+    @staticmethod
+    def from_matrix(m: Matrix) -> NumpyMatrix:
+        """
+        Convert any Matrix into a NumpyMatrix, without copying if it is
+        already a NumpyMatrix.
+
+        :param Matrix m: The matrix to convert
+        returns:
+            NumpyMatrix: The matrix with the same elements
+        """
+        if isinstance(m, NumpyMatrix):
+            return m
+        return NumpyMatrix(m.get_state(), w=m.num_columns, h=m.num_rows)
+
+    @property
+    def array(self) -> np.ndarray:
+        """
+        The underlying complex128 numpy array of the matrix elements.
+
+        returns:
+            np.ndarray: The 2D array of the matrix elements
+        """
+        return self._array
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the NumpyMatrix.
+
+        returns:
+            int: The number of rows
+        """
+        return self._array.shape[0]
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the NumpyMatrix.
+
+        returns:
+            int: The number of columns.
+        """
+        return self._array.shape[1]
+
+    @property
+    def unitary(self) -> bool:
+        """
+        Check if matrix is Unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        if not self.square:
+            return False
+        test = self._array.conj().T @ self._array
+        return bool(np.allclose(test, np.eye(self.num_rows)))
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows in the NumpyMatrix.
+
+        returns:
+            int: The number of rows in the NumpyMatrix
+        """
+        return self.num_rows
+
+    def __getitem__(self, i: int) -> np.ndarray:  # type: ignore[override]
+        """
+        Get a view of the row of index i, so that modifying the row
+        elements modifies the matrix.
+
+        :param int i: The row index to get.
+        returns:
+            np.ndarray: View of the row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return self._array[i]
+
+    def __setitem__(self, i: int, v):
+        """
+        Set the given row inplace to the new row values in the given list.
+
+        :param int i: The row index to modify
+        :param VECTOR v: The list of values to set the row to
+        """
+        assert i < self.num_rows, "index out of range"
+        assert len(v) == self.num_columns, "row dimension does not match"
+
+        self._array[i] = v
+
+    def get_state(self) -> MATRIX:
+        """
+        Return the matrix values as a nested list
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values indexed by row/column
+        """
+        return self._array.tolist()
+
+    def rows(self) -> MATRIX:
+        """
+        Equivalent to
+        :py:meth:`~qcp.matrices.numpy_matrix.NumpyMatrix.get_state`.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values indexed by row/column
+        """
+        return self.get_state()
+
+    def columns(self) -> MATRIX:
+        """
+        The transpose of the matrix as a nested list
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values transposed, indexed by column/row.
+        """
+        return self._array.T.tolist()
+
+    def transpose(self) -> NumpyMatrix:
+        """
+        Flips the matrix elements along the diagonal, and return a new
+        NumpyMatrix containing these values.
+
+        returns:
+            NumpyMatrix: The transpose of the current matrix.
+        """
+        return NumpyMatrix(self._array.T)
+
+    def conjugate(self) -> NumpyMatrix:
+        """
+        Create a new NumpyMatrix where each value in the matrix is the
+        complex conjugate of the current matrix values.
+
+        returns:
+            NumpyMatrix: The conjugated matrix
+        """
+        return NumpyMatrix(self._array.conj())
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the matrix
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        assert self.square, "can only take the trace of square matrices"
+        return complex(np.trace(self._array))
+
+    def copy(self) -> NumpyMatrix:
+        """
+        Create a copy of this NumpyMatrix, that can be modified without
+        changing this matrix.
+
+        returns:
+            NumpyMatrix: The copied matrix
+        """
+        return NumpyMatrix(self._array.copy())
+
+    def __add__(self, other: Matrix) -> Matrix:
+        assert self.num_rows == other.num_rows and \
+            self.num_columns == other.num_columns, \
+            "Matrix dimensions must be equal for addition"
+
+        return NumpyMatrix(
+            self._array + NumpyMatrix.from_matrix(other)._array)
+
+    def __sub__(self, other: Matrix) -> Matrix:
+        assert self.num_rows == other.num_rows and \
+            self.num_columns == other.num_columns, \
+            "Matrix dimensions must be equal for subtraction"
+
+        return NumpyMatrix(
+            self._array - NumpyMatrix.from_matrix(other)._array)
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return NumpyMatrix(self._array * other)
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        using the BLAS backed numpy matrix product.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        assert other.num_rows > 0, "taking dot product with empty matrix"
+        assert self.num_columns == other.num_rows, \
+            "matrices don't match on their row/column dimensions"
+
+        if isinstance(other, StructuredMatrix):
+            return other._rdot(self)
+        return NumpyMatrix(
+            self._array @ NumpyMatrix.from_matrix(other)._array)
+
+    def __str__(self) -> str:
+        total_string = ""
+        N = self.num_rows
+        for i in range(N):
+            row_repr = []
+            for v in self._array[i]:
+                # Show the real part only for real values, for a neater
+                # matrix
+                if cmath.isclose(v.imag, 0, abs_tol=1e-9):
+                    row_repr.append(f"{v.real:3.3g}")
+                else:
+                    row_repr.append(f"{v:3.3g}")
+            total_string += "[" + ",".join(row_repr) + "]" + \
+                self._optional_newline(i, N)
+        return total_string
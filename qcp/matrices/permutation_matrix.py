@@ -0,0 +1,233 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from array import array
+from typing import Sequence
+
+import numpy as np
+
+from qcp.matrices.default_matrix import matrix_like
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import NumpyMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector, \
+    _row_entries
+from qcp.matrices.structured_matrix import StructuredMatrix
+from qcp.matrices.types import SCALARS, SPARSE, VECTOR
+
+
+class PermutationMatrix(StructuredMatrix):
+    """
+    Implementation of a permutation matrix, such as the X/CNOT/SWAP gates,
+    stored as a single array of integer indices.
+
+    Row i of the matrix has a single entry of 1 in the column perm[i], so
+    applying the matrix to a vector v gives the vector with elements
+    v[perm[i]].
+    """
+
+    def __init__(self, perm: Sequence[int]):
+        """
+        Initialise the PermutationMatrix from the column index of the
+        non-zero entry of each row.
+
+        :param Sequence[int] perm: The column index for each row, must be a
+            rearrangement of range(len(perm))
+        """
+        n = len(perm)
+        assert n > 0, "attempting to initialise matrix with no dimensions"
+
+        seen = bytearray(n)
+        for p in perm:
+            assert 0 <= p < n and not seen[p], \
+                "permutation must contain each index exactly once"
+            seen[p] = 1
+
+        self._perm = array("l", perm)
+
+    @staticmethod
+    def identity(n: int) -> PermutationMatrix:
+        """
+        Create the identity matrix with the given dimensions
+
+        :param int n: The matrix dimension
+        returns:
+            PermutationMatrix: The identity matrix of given dimension
+        """
+        assert isinstance(n, int), "matrix dimension must be an integer"
+        assert n > 0, "Matrix dimension must be positive"
+
+        return PermutationMatrix(range(n))
+
+    @property
+    def perm(self) -> array:
+        """
+        The column index of the non-zero entry of each row.
+
+        returns:
+            array: The integer array of column indices
+        """
+        return self._perm
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the PermutationMatrix.
+
+        returns:
+            int: The number of rows
+        """
+        return len(self._perm)
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the PermutationMatrix.
+
+        returns:
+            int: The number of columns.
+        """
+        return len(self._perm)
+
+    @property
+    def unitary(self) -> bool:
+        """
+        Permutation matrices are always unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return True
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i, as a sparse vector with the single non-zero
+        entry.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return SparseVector({self._perm[i]: 1}, self.num_columns)
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        n = self.num_rows
+        entries: SPARSE = {i: {p: 1} for i, p in enumerate(self._perm)}
+        return SparseMatrix(entries, w=n, h=n)
+
+    def transpose(self) -> PermutationMatrix:
+        """
+        The transpose of a permutation matrix is the inverse permutation.
+
+        returns:
+            PermutationMatrix: The transpose of the current matrix.
+        """
+        inverse = array("l", [0]) * self.num_rows
+        for i, p in enumerate(self._perm):
+            inverse[p] = i
+        return PermutationMatrix(inverse)
+
+    def conjugate(self) -> PermutationMatrix:
+        """
+        The elements of a permutation matrix are real, so the conjugate is
+        the same matrix.
+
+        returns:
+            PermutationMatrix: The conjugated matrix
+        """
+        return PermutationMatrix(self._perm)
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the matrix, which is
+        the number of indices the permutation leaves in place.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        return sum(1 for i, p in enumerate(self._perm) if i == p)
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The permuted elements
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+        return [vector[p] for p in self._perm]
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        which reorders the rows of the other Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=False)
+
+        if isinstance(other, PermutationMatrix):
+            q = other._perm
+            return PermutationMatrix([q[p] for p in self._perm])
+        if isinstance(other, NumpyMatrix):
+            return NumpyMatrix(other.array[np.asarray(self._perm)])
+        if isinstance(other, StructuredMatrix):
+            return other._rdot(self)
+
+        entries: SPARSE = {
+            i: dict(_row_entries(other, p)) for i, p in enumerate(self._perm)
+        }
+        return matrix_like(other, entries, other.num_columns, self.num_rows)
+
+    def _rdot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product with this matrix on the right hand side,
+        other * self, which moves column k of the other Matrix to column
+        perm[k].
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=True)
+
+        if isinstance(other, NumpyMatrix):
+            result = np.empty_like(other.array)
+            result[:, np.asarray(self._perm)] = other.array
+            return NumpyMatrix(result)
+
+        perm = self._perm
+        entries: SPARSE = {}
+        for i in range(other.num_rows):
+            entries[i] = {
+                perm[k]: v for k, v in _row_entries(other, i).items()
+            }
+        return matrix_like(other, entries, self.num_columns, other.num_rows)
@@ -0,0 +1,525 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Lazy evaluation of chains of matrix products, so that a product of gates
+is only computed once it is applied to a state, in the cheapest order.
+"""
+from __future__ import annotations
+
+import cmath
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from qcp.matrices.csr_matrix import CSRMatrix
+from qcp.matrices.default_matrix import matrix_like
+from qcp.matrices.identity_matrix import IdentityMatrix
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import NumpyMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector, \
+    _row_entries
+from qcp.matrices.structured_matrix import StructuredMatrix
+from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, SPARSE, VECTOR
+
+#: Chains with more factors than this are evaluated right to left instead
+#: of searching for the cheapest order, as the search is cubic in the
+#: chain length
+MAX_OPTIMISED_CHAIN = 24
+
+
+class LazyMatrix(StructuredMatrix):
+    """
+    Base class of the matrices that defer their products with other square
+    matrices into a
+    :py:obj:`~qcp.matrices.product_expression.ProductExpression`, while
+    products with vectors (or any non square matrix) are computed
+    immediately.
+    """
+
+    def _lazy_with(self, other: Matrix) -> bool:
+        """
+        Whether the product with the other matrix should be deferred, which
+        is the case for products of square operators.
+
+        :param Matrix other: The other matrix in the product
+        returns:
+            bool: Whether to defer the product
+        """
+        return self.square and other.square and other.num_rows > 1
+
+    def _estimate_nnz(self) -> int:
+        """
+        Estimate the number of non-zero entries in the matrix, used to
+        choose the order products are evaluated in.
+
+        returns:
+            int: The estimated number of non-zero entries
+        """
+        return self.num_rows * self.num_columns
+
+    def _apply_cost(self) -> Optional[int]:
+        """
+        The number of multiplications needed to apply this matrix to a
+        single column vector, if it is cheaper than a sparse product.
+
+        returns:
+            Optional[int]: The cost, or None to use the sparse estimate
+        """
+        return None
+
+    def _eager_dot(self, other: Matrix) -> Matrix:
+        """
+        Compute the product self * other immediately, by applying this
+        matrix to each column of the other Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+        returns:
+            Matrix: The product
+        """
+        columns = other.transpose()
+        entries: SPARSE = {i: {} for i in range(self.num_rows)}
+        for j in range(other.num_columns):
+            vector: VECTOR = [0] * other.num_rows
+            for k, v in _row_entries(columns, j).items():
+                vector[k] = v
+
+            for i, val in enumerate(self.apply(vector)):
+                if not cmath.isclose(val, 0):
+                    entries[i][j] = val
+
+        return matrix_like(other, entries, other.num_columns, self.num_rows)
+
+    def _eager_rdot(self, other: Matrix) -> Matrix:
+        """
+        Compute the product other * self immediately, by applying the
+        transpose of this matrix to each row of the other Matrix.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+        returns:
+            Matrix: The product
+        """
+        transposed = self.transpose()
+        assert isinstance(transposed, StructuredMatrix)
+        entries: SPARSE = {}
+        for i in range(other.num_rows):
+            vector: VECTOR = [0] * other.num_columns
+            for k, v in _row_entries(other, i).items():
+                vector[k] = v
+
+            entries[i] = {
+                j: val for j, val in enumerate(transposed.apply(vector))
+                if not cmath.isclose(val, 0)
+            }
+
+        return matrix_like(other, entries, self.num_columns, other.num_rows)
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        deferring the product if both are square operators.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=False)
+        if self._lazy_with(other):
+            return ProductExpression.of([self, other])
+        return self._eager_dot(other)
+
+    def _rdot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product with this matrix on the right hand side,
+        other * self, deferring the product if both are square operators.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        self._check_dot(other.num_rows, other.num_columns, left=True)
+        if self._lazy_with(other):
+            return ProductExpression.of([other, self])
+        return self._eager_rdot(other)
+
+
+class ProductExpression(LazyMatrix):
+    """
+    Lazy product of a chain of matrices.
+
+    The product is only computed when it is applied to a column vector, or
+    when the elements are accessed, in which case the result is cached. The
+    order the chain is multiplied in is chosen to minimise the estimated
+    number of multiplications, based off of the shape and number of non-zero
+    entries of each factor.
+    """
+
+    def __init__(self, factors: Sequence[Matrix]):
+        """
+        Initialise the ProductExpression from the factors of the product, in
+        the order they are multiplied. Nested ProductExpressions are
+        flattened into their factors.
+
+        :param Sequence[Matrix] factors: The matrices to multiply
+        """
+        assert len(factors) > 0, "need at least one factor"
+
+        self._factors: List[Matrix] = []
+        for f in factors:
+            if isinstance(f, ProductExpression):
+                self._factors.extend(f.factors)
+            else:
+                self._factors.append(f)
+
+        for a, b in zip(self._factors, self._factors[1:]):
+            assert b.num_rows > 0, "taking dot product with empty matrix"
+            assert a.num_columns == b.num_rows, \
+                "matrices don't match on their row/column dimensions"
+
+        self._cache: Optional[Matrix] = None
+
+    @staticmethod
+    def of(factors: Sequence[Matrix]) -> Matrix:
+        """
+        Create the product of the given factors, leaving out any identity
+        factors, and not wrapping a single factor in a ProductExpression.
+
+        :param Sequence[Matrix] factors: The matrices to multiply
+        returns:
+            Matrix: The lazy product of the factors
+        """
+        remaining = [f for f in factors if not isinstance(f, IdentityMatrix)]
+        if len(remaining) == 0:
+            return factors[0]
+        if len(remaining) == 1:
+            return remaining[0]
+        return ProductExpression(remaining)
+
+    @property
+    def factors(self) -> List[Matrix]:
+        """
+        The factors of the product.
+
+        returns:
+            List[Matrix]: The matrices in the product, in order
+        """
+        return self._factors
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the product.
+
+        returns:
+            int: The number of rows
+        """
+        return self._factors[0].num_rows
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the product.
+
+        returns:
+            int: The number of columns.
+        """
+        return self._factors[-1].num_columns
+
+    @property
+    def unitary(self) -> bool:
+        """
+        The product of unitary matrices is unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return all(f.unitary for f in self._factors)
+
+    def materialise(self) -> Matrix:
+        """
+        Compute the product of the chain, which is cached for later calls.
+
+        returns:
+            Matrix: The product of the factors
+        """
+        if self._cache is None:
+            self._cache = evaluate_chain(self._factors)
+        return self._cache
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        m = self.materialise()
+        if isinstance(m, SparseMatrix):
+            # Don't hand out the cached product, as it can be modified
+            return m.copy()
+        return SparseMatrix(m.get_state(), w=m.num_columns, h=m.num_rows)
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i of the computed product.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        return SparseVector(dict(_row_entries(self.materialise(), i)),
+                            self.num_columns)
+
+    def get_state(self) -> MATRIX:
+        """
+        Returns the elements of the computed product as a nested list,
+        indexed by the row/column indices.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values
+        """
+        return self.materialise().get_state()
+
+    def transpose(self) -> ProductExpression:
+        """
+        The transpose of a product is the product of the transposed factors
+        in the reverse order.
+
+        returns:
+            ProductExpression: The transpose of the current matrix.
+        """
+        return ProductExpression(
+            [f.transpose() for f in reversed(self._factors)])
+
+    def conjugate(self) -> ProductExpression:
+        """
+        The conjugate of a product is the product of the conjugated factors.
+
+        returns:
+            ProductExpression: The conjugated matrix
+        """
+        return ProductExpression([f.conjugate() for f in self._factors])
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the computed product
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        return self.materialise().trace()
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements, by applying the factors from right to
+        left.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The elements of the
+            resultant column vector
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+
+        v = list(vector)
+        for f in reversed(self._factors):
+            if isinstance(f, StructuredMatrix):
+                v = f.apply(v)
+                continue
+            v = [
+                sum(a * v[k] for k, a in _row_entries(f, i).items())
+                for i in range(f.num_rows)
+            ]
+        return v
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return ProductExpression(
+                [IdentityMatrix(self.num_rows) * other] + self._factors)
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _eager_dot(self, other: Matrix) -> Matrix:
+        """
+        Compute the product of the chain with the other matrix on the right,
+        such as a state vector.
+
+        :param Matrix other: The matrix to dot product with this one.
+        returns:
+            Matrix: The product
+        """
+        if self._cache is not None:
+            return multiply(self._cache, other)
+        return evaluate_chain(self._factors + [other])
+
+    def _eager_rdot(self, other: Matrix) -> Matrix:
+        """
+        Compute the product of the chain with the other matrix on the left.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+        returns:
+            Matrix: The product
+        """
+        if self._cache is not None:
+            return multiply(other, self._cache)
+        return evaluate_chain([other] + self._factors)
+
+
+def multiply(a: Matrix, b: Matrix) -> Matrix:
+    """
+    Compute the product of two matrices immediately, even when they are
+    lazy.
+
+    :param Matrix a: The left hand matrix
+    :param Matrix b: The right hand matrix
+    returns:
+        Matrix: The product a * b
+    """
+    if isinstance(a, LazyMatrix):
+        return a._eager_dot(b)
+    if isinstance(b, LazyMatrix):
+        return b._eager_rdot(a)
+    return a * b
+
+
+def estimate_nnz(m: Matrix) -> int:
+    """
+    Estimate the number of non-zero entries in the given matrix.
+
+    :param Matrix m: The matrix
+    returns:
+        int: The (estimated) number of non-zero entries
+    """
+    if isinstance(m, SparseMatrix):
+        return sum(len(row) for row in m._entries.values())
+    if isinstance(m, CSRMatrix):
+        return m.nnz
+    if isinstance(m, NumpyMatrix):
+        return int(np.count_nonzero(m.array))
+    if isinstance(m, LazyMatrix):
+        return m._estimate_nnz()
+    if isinstance(m, StructuredMatrix):
+        # The permutation, diagonal and identity matrices have one entry
+        # per row
+        return m.num_rows
+    return m.num_rows * m.num_columns
+
+
+def _product_cost(left: Optional[Matrix], right: Optional[Matrix],
+                  nnz_left: int, nnz_right: int,
+                  rows: int, inner: int, cols: int) -> int:
+    """
+    Estimate the number of multiplications in the product of two matrices.
+
+    Products are assumed to cost the number of pairs of non-zero entries
+    that meet, with the entries spread uniformly, unless one side is a
+    single factor that is cheaper to apply to each column (or row) of the
+    other side.
+
+    :param Optional[Matrix] left: The left operand, if it is a single factor
+    :param Optional[Matrix] right: The right operand, if it is a single
+        factor
+    :param int nnz_left: The number of non-zero entries of the left operand
+    :param int nnz_right: The number of non-zero entries of the right operand
+    :param int rows: The number of rows of the left operand
+    :param int inner: The shared dimension
+    :param int cols: The number of columns of the right operand
+    returns:
+        int: The estimated cost
+    """
+    cost = max(1, nnz_left * nnz_right // max(inner, 1))
+    if isinstance(left, LazyMatrix):
+        apply_cost = left._apply_cost()
+        if apply_cost is not None:
+            cost = min(cost, cols * apply_cost)
+    if isinstance(right, LazyMatrix):
+        apply_cost = right._apply_cost()
+        if apply_cost is not None:
+            cost = min(cost, rows * apply_cost)
+    return cost
+
+
+def evaluate_chain(factors: Sequence[Matrix]) -> Matrix:
+    """
+    Compute the product of a chain of matrices, choosing the order of the
+    multiplications using the matrix chain dynamic programme, with the
+    estimated cost of each product from the matrix shapes and number of
+    non-zero entries.
+
+    Chains longer than
+    :py:obj:`~qcp.matrices.product_expression.MAX_OPTIMISED_CHAIN` are
+    multiplied from right to left.
+
+    :param Sequence[Matrix] factors: The matrices to multiply
+    returns:
+        Matrix: The product
+    """
+    n = len(factors)
+    if n == 1:
+        return factors[0]
+
+    if n > MAX_OPTIMISED_CHAIN:
+        result = factors[-1]
+        for f in reversed(factors[:-1]):
+            result = multiply(f, result)
+        return result
+
+    rows = [f.num_rows for f in factors]
+    cols = [f.num_columns for f in factors]
+
+    # cost[i][j] is the cheapest cost of the product of factors i..j, with
+    # split[i][j] where it is split in two, and nnz[i][j] the estimated
+    # number of non-zero entries in the result
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    nnz = [[0] * n for _ in range(n)]
+    for i, f in enumerate(factors):
+        nnz[i][i] = estimate_nnz(f)
+
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            best = -1
+            for s in range(i, j):
+                c = cost[i][s] + cost[s + 1][j] + _product_cost(
+                    factors[i] if s == i else None,
+                    factors[j] if s + 1 == j else None,
+                    nnz[i][s], nnz[s + 1][j], rows[i], cols[s], cols[j])
+                if best < 0 or c < best:
+                    best = c
+                    split[i][j] = s
+            cost[i][j] = best
+
+            s = split[i][j]
+            density = nnz[i][s] * nnz[s + 1][j] // max(cols[s], 1)
+            nnz[i][j] = max(1, min(rows[i] * cols[j], density))
+
+    def product(i: int, j: int) -> Matrix:
+        if i == j:
+            return factors[i]
+        s = split[i][j]
+        return multiply(product(i, s), product(s + 1, j))
+
+    return product(0, n - 1)
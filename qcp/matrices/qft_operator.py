@@ -0,0 +1,274 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The Quantum Fourier Transform, applied to vectors with the radix-2 Fast
+Fourier Transform instead of constructing it from gates.
+"""
+from __future__ import annotations
+
+import cmath
+import math
+from typing import Union
+
+import numpy as np
+
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.numpy_matrix import NumpyMatrix
+from qcp.matrices.product_expression import LazyMatrix
+from qcp.matrices.sparse_matrix import SparseMatrix, SparseVector
+from qcp.matrices.types import SCALARS, SCALARS_T, SPARSE, VECTOR
+
+
+def fourier_transform(vector: VECTOR, size: int, inverse: bool = False):
+    """
+    Apply the Quantum Fourier Transform in place to each consecutive block
+    of 2**size amplitudes of the vector, which transforms the lowest size
+    qubits of the register, using the iterative radix-2 Fast Fourier
+    Transform in O(size * len(vector)) operations.
+
+    The QFT maps the amplitude of state k to the amplitude of state j with
+    the factor exp(2 pi i j k / 2**size) / sqrt(2**size), and the inverse
+    QFT with the conjugate factor.
+
+    :param VECTOR vector: The amplitudes to transform
+    :param int size: The number of qubits to transform
+    :param bool inverse: Whether to apply the inverse QFT
+    """
+    assert size > 0, "need at least one qubit"
+    n = 1 << size
+    assert len(vector) % n == 0, \
+        "vector length must be a multiple of the transform length"
+    sign = -1 if inverse else 1
+
+    for base in range(0, len(vector), n):
+        # Reorder each block into bit reversed order, the order the
+        # butterflies below combine the amplitudes in
+        j = 0
+        for i in range(1, n):
+            bit = n >> 1
+            while j & bit:
+                j ^= bit
+                bit >>= 1
+            j |= bit
+            if i < j:
+                vector[base + i], vector[base + j] = \
+                    vector[base + j], vector[base + i]
+
+    length = 2
+    while length <= n:
+        half = length // 2
+        twiddles = [
+            cmath.exp(sign * 2j * math.pi * k / length) for k in range(half)
+        ]
+        for start in range(0, len(vector), length):
+            for k in range(half):
+                a = vector[start + k]
+                b = vector[start + k + half] * twiddles[k]
+                vector[start + k] = a + b
+                vector[start + k + half] = a - b
+        length <<= 1
+
+    scale = 1 / math.sqrt(n)
+    for i in range(len(vector)):
+        vector[i] *= scale
+
+
+class QFTOperator(LazyMatrix):
+    """
+    The Quantum Fourier Transform (or it's inverse) of the lowest size qubits
+    of a register, equal to the gate built QFT of
+    :py:func:`~qcp.algorithms.phase_estimation.qft_gate`, which is applied
+    to vectors with the Fast Fourier Transform.
+    """
+
+    def __init__(self, size: int, inverse: bool = False, blocks: int = 1):
+        """
+        Initialise the QFTOperator
+
+        :param int size: The number of qubits to transform
+        :param bool inverse: Whether this is the inverse QFT
+        :param int blocks: The number of blocks of 2**size amplitudes that
+            are transformed, so that the QFT acts on the lowest qubits of a
+            larger register, as the tensor product of the identity with the
+            QFT
+        """
+        assert size > 0, "need at least one qubit"
+        assert blocks > 0, "need at least one block"
+
+        self.size = size
+        self.inverse = inverse
+        self.blocks = blocks
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Return the number of rows in the QFTOperator.
+
+        returns:
+            int: The number of rows
+        """
+        return self.blocks << self.size
+
+    @property
+    def num_columns(self) -> int:
+        """
+        Return the number of columns in the QFTOperator.
+
+        returns:
+            int: The number of columns.
+        """
+        return self.blocks << self.size
+
+    @property
+    def unitary(self) -> bool:
+        """
+        The QFT is always unitary
+
+        returns:
+            bool: Whether the matrix is unitary
+        """
+        return True
+
+    def _value(self, j: int, k: int) -> SCALARS:
+        """
+        The element of the transform of a single block
+
+        :param int j: The row index within the block
+        :param int k: The column index within the block
+        returns:
+            SCALARS: The matrix element
+        """
+        n = 1 << self.size
+        sign = -1 if self.inverse else 1
+        return cmath.exp(sign * 2j * math.pi * ((j * k) % n) / n) / \
+            math.sqrt(n)
+
+    def __getitem__(self, i: int) -> SparseVector:  # type: ignore[override]
+        """
+        Get the row of index i, which is non-zero over the block containing
+        i.
+
+        :param int i: The row index to get.
+        returns:
+            SparseVector: The row elements
+        """
+        assert i < self.num_rows, "index out of range"
+        block, j = divmod(i, 1 << self.size)
+        base = block << self.size
+        return SparseVector(
+            {base + k: self._value(j, k) for k in range(1 << self.size)},
+            self.num_columns)
+
+    def to_sparse(self) -> SparseMatrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+        n = 1 << self.size
+        entries: SPARSE = {}
+        for i in range(self.num_rows):
+            block, j = divmod(i, n)
+            entries[i] = {
+                (block * n) + k: self._value(j, k) for k in range(n)
+            }
+        return SparseMatrix(entries, w=self.num_columns, h=self.num_rows)
+
+    def transpose(self) -> QFTOperator:
+        """
+        The QFT is symmetric, so the transpose is the same matrix.
+
+        returns:
+            QFTOperator: The transpose of the current matrix.
+        """
+        return self
+
+    def conjugate(self) -> QFTOperator:
+        """
+        The conjugate of the QFT is the inverse QFT, and vice versa.
+
+        returns:
+            QFTOperator: The conjugated matrix
+        """
+        return QFTOperator(self.size, not self.inverse, self.blocks)
+
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements, with the Fast Fourier Transform.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The elements of the
+            resultant column vector
+        """
+        assert len(vector) == self.num_columns, \
+            "matrices don't match on their row/column dimensions"
+
+        v = list(vector)
+        fourier_transform(v, self.size, self.inverse)
+        return v
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return self.to_sparse() * other
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def _estimate_nnz(self) -> int:
+        """
+        Each block of the QFT is dense.
+
+        returns:
+            int: The number of non-zero entries
+        """
+        return self.num_rows << self.size
+
+    def _apply_cost(self) -> int:
+        """
+        The number of multiplications needed to apply the FFT to a single
+        column vector.
+
+        returns:
+            int: The cost
+        """
+        return self.num_rows * (self.size + 1)
+
+    def _eager_dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix,
+        with numpy's FFT for numpy matrices, otherwise by applying the FFT
+        to each column of the other Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        if isinstance(other, NumpyMatrix):
+            n = 1 << self.size
+            blocks = other.array.reshape(self.blocks, n, other.num_columns)
+            # numpy's FFT uses the opposite sign convention to the QFT
+            if self.inverse:
+                result = np.fft.fft(blocks, axis=1) / math.sqrt(n)
+            else:
+                result = np.fft.ifft(blocks, axis=1) * math.sqrt(n)
+            return NumpyMatrix(result.reshape(self.num_rows,
+                                              other.num_columns))
+        return super()._eager_dot(other)
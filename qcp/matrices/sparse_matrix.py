@@ -15,9 +15,10 @@ from __future__ import annotations
 
 import cmath
 from copy import deepcopy
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Union
 
 from qcp.matrices import Matrix
+from qcp.matrices.structured_matrix import StructuredMatrix
 from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, SPARSE
 
 
@@ -50,6 +51,26 @@ def _list_to_dict(vals: List[SCALARS], limit: int = -1) -> Dict[int, SCALARS]:
     return d
 
 
+def _row_entries(m: Matrix, i: int) -> Dict[int, SCALARS]:
+    """
+    Get the non-zero entries in the given row of any Matrix, without
+    iterating over its zero entries when the matrix is sparse.
+
+    :param Matrix m: The matrix to read the row of
+    :param int i: The row index
+    returns:
+        Dict[int, :py:obj:`~qcp.matrices.types.SCALARS`]: The column index
+        mapping to the non-zero values
+    """
+    if isinstance(m, SparseMatrix):
+        return m._entries.get(i, {})
+
+    row = m[i]
+    if isinstance(row, SparseVector):
+        return row._entries
+    return _list_to_dict(list(row), limit=m.num_columns)
+
+
 class SparseVector:
     """
     Sparse implementation of a row vector, where only the non-zero elements
@@ -394,29 +415,66 @@ class SparseMatrix(Matrix):
 
         return tr
 
-    def __add__(self, other: Matrix) -> Matrix:
+    def axpy(self, other: Matrix, alpha: SCALARS = 1) -> SparseMatrix:
+        """
+        Add alpha times the other matrix to this matrix in place, by merging
+        the non-zero entries of the other matrix into this one, so that the
+        cost is O(nnz(self) + nnz(other)) for sparse operands.
+
+        :param Matrix other: The matrix to add to this one.
+        :param SCALARS alpha: The factor to scale the other matrix by.
+
+        returns:
+            SparseMatrix: This matrix, after the addition
+        """
         row_match = self.num_rows == other.num_rows
         column_match = self.num_columns == other.num_columns
         assert row_match and \
             column_match, "Matrix dimensions must be equal for addition"
 
-        for i in range(other.num_rows):
-            for j in range(other.num_columns):
-                # Don't bother trying to add zero values
-                other_val = other[i][j]
-                if cmath.isclose(other_val, 0):
-                    continue
+        rows: Iterable[int] = range(other.num_rows)
+        if isinstance(other, SparseMatrix):
+            rows = other._entries.keys()
+
+        for i in rows:
+            other_row = _row_entries(other, i)
+            if not other_row:
+                continue
+
+            row = self._entries.setdefault(i, {})
+            for j, other_val in other_row.items():
+                val = row.get(j, 0) + alpha * other_val
                 # Since the SparseMatrix only keeps track of non-zero
-                # entries, track this new entry if it becomes non-zero
-                if j not in self._entries[i]:
-                    self._entries[i][j] = other_val
+                # entries, stop tracking any entries that cancel out
+                if cmath.isclose(val, 0):
+                    row.pop(j, None)
                 else:
-                    self._entries[i][j] += other_val
+                    row[j] = val
 
         return self
 
+    def copy(self) -> SparseMatrix:
+        """
+        Create a copy of this SparseMatrix, that can be modified without
+        changing this matrix.
+
+        returns:
+            SparseMatrix: The copied matrix
+        """
+        entries: SPARSE = {i: dict(row) for i, row in self._entries.items()}
+        return SparseMatrix(entries, w=self.num_columns, h=self.num_rows)
+
+    def __add__(self, other: Matrix) -> Matrix:
+        return self.copy().axpy(other, 1)
+
     def __sub__(self, other: Matrix) -> Matrix:
-        return self + (-1 * other)
+        return self.copy().axpy(other, -1)
+
+    def __iadd__(self, other: Matrix) -> Matrix:
+        return self.axpy(other, 1)
+
+    def __isub__(self, other: Matrix) -> Matrix:
+        return self.axpy(other, -1)
 
     def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
 
@@ -444,6 +502,8 @@ class SparseMatrix(Matrix):
         assert self.num_columns == other.num_rows, \
             "matrices don't match on their row/column dimensions"
 
+        if isinstance(other, StructuredMatrix):
+            return other._rdot(self)
         if isinstance(other, SparseMatrix):
             return self._dot_sparse(other)
 
@@ -467,7 +527,13 @@ class SparseMatrix(Matrix):
         Optimisation of the
         :py:meth:`~qcp.matrices.sparse_matrix.SparseMatrix._dot` method in the
         case where both Matrices are SparseMatrix objects, in which case we
-        only need to consider the non-zero entries of the matrices
+        only need to consider the non-zero entries of the matrices.
+
+        Uses Gustavson's row-wise algorithm: each non-zero entry self[i][k]
+        scales row k of the other matrix, which is scattered into an
+        accumulator for row i of the result. Only non-zero products are
+        ever visited, so the cost scales with the number of multiplications
+        rather than with the width of the matrices.
 
         :param SparseMatrix other: The matrix to dot product with this one.
 
@@ -483,28 +549,25 @@ class SparseMatrix(Matrix):
 
         other_entries = other._entries
 
-        # Multiply entries in row/columns by each other
         for i, row in self._entries.items():
-            for j in range(other.num_columns):
+            # The accumulator for the i'th row of the result
+            acc = entries[i]
+
+            for k, v in row.items():
+                other_row = other_entries.get(k)
+                # Rows of zeros don't contribute
+                if not other_row:
+                    continue
 
-                for k in row.keys():
-                    # If the entry doesn't exist in the other
-                    # dictionary row/column, skip the entry
-                    if k not in other_entries:
-                        continue
-                    if j not in other_entries[k]:
-                        continue
-                    # row[k] is guaranteed to be non-zero since we're iterating
-                    # over row.keys()
-                    val = other_entries[k][j] * row[k]
-                    # Don't add on the value if it is ~= 0
-                    if cmath.isclose(val, 0):
-                        continue
-
-                    if j not in entries[i]:
-                        entries[i][j] = val
+                for j, other_v in other_row.items():
+                    if j in acc:
+                        acc[j] += v * other_v
                     else:
-                        entries[i][j] += val
+                        acc[j] = v * other_v
+
+            # Don't keep entries that cancelled out to ~= 0
+            for j in [j for j, val in acc.items() if cmath.isclose(val, 0)]:
+                del acc[j]
 
         return SparseMatrix(entries, w=other.num_columns, h=self.num_rows)
 
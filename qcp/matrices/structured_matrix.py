@@ -0,0 +1,200 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Base class for the matrices that are stored by their structure (which
+entries are non-zero) rather than by a list of their elements.
+"""
+from __future__ import annotations
+
+import abc
+from typing import Union
+
+from qcp.matrices.matrix import Matrix
+from qcp.matrices.types import MATRIX, SCALARS, SCALARS_T, VECTOR
+
+
+class StructuredMatrix(Matrix):
+    """
+    A Matrix whose elements are implied by a compact representation, such as
+    a permutation of the basis states.
+
+    Products with other matrices are computed directly from the compact
+    representation, the other Matrix implementations hand over to
+    :py:meth:`~qcp.matrices.structured_matrix.StructuredMatrix._rdot` when
+    they are multiplied by a StructuredMatrix. Any other operation works on
+    the equivalent SparseMatrix from
+    :py:meth:`~qcp.matrices.structured_matrix.StructuredMatrix.to_sparse`.
+    """
+
+    @abc.abstractmethod
+    def to_sparse(self) -> Matrix:
+        """
+        Construct the SparseMatrix with the same elements as this matrix.
+
+        returns:
+            SparseMatrix: The equivalent sparse matrix
+        """
+
+    @abc.abstractmethod
+    def apply(self, vector: VECTOR) -> VECTOR:
+        """
+        Calculate the product of this matrix with the column vector given as
+        a flat list of its elements, such as the amplitudes of a quantum
+        register.
+
+        :param VECTOR vector: The elements of the column vector
+        returns:
+            :py:obj:`~qcp.matrices.types.VECTOR`: The elements of the
+            resultant column vector
+        """
+
+    def _dot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product between this Matrix, and another Matrix.
+
+        :param Matrix other: The matrix to dot product with this one.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        return self.to_sparse() * other
+
+    def _rdot(self, other: Matrix) -> Matrix:
+        """
+        Calculate the dot product with this matrix on the right hand side,
+        other * self.
+
+        :param Matrix other: The matrix to pre-multiply this one with.
+
+        returns:
+            Matrix: A new matrix that conforms to the rules of matrix
+            dot producting.
+        """
+        return other * self.to_sparse()
+
+    def _check_dot(self, other_rows: int, other_columns: int, left: bool):
+        """
+        Verify the dimensions of the other matrix in a dot product with this
+        matrix match.
+
+        :param int other_rows: The number of rows of the other matrix
+        :param int other_columns: The number of columns of the other matrix
+        :param bool left: Whether the other matrix is on the left hand side
+        """
+        assert other_rows > 0, "taking dot product with empty matrix"
+        if left:
+            assert other_columns == self.num_rows, \
+                "matrices don't match on their row/column dimensions"
+        else:
+            assert self.num_columns == other_rows, \
+                "matrices don't match on their row/column dimensions"
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows in the matrix.
+
+        returns:
+            int: The number of rows
+        """
+        return self.num_rows
+
+    def __setitem__(self, i: int, v: VECTOR):
+        """
+        The elements of a StructuredMatrix are fixed by its structure, so
+        can't be modified, use
+        :py:meth:`~qcp.matrices.structured_matrix.StructuredMatrix.to_sparse`
+        to get a modifiable copy.
+        """
+        assert False, "cannot modify the elements of a structured matrix"
+
+    def get_state(self) -> MATRIX:
+        """
+        Returns the matrix values as a nested list, indexed by the
+        row/column indices.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values
+        """
+        return self.to_sparse().get_state()
+
+    def rows(self) -> MATRIX:
+        """
+        Equivalent to
+        :py:meth:`~qcp.matrices.structured_matrix.StructuredMatrix.get_state`.
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values indexed by row/column
+        """
+        return self.get_state()
+
+    def columns(self) -> MATRIX:
+        """
+        The transpose of the matrix as a nested list
+
+        returns:
+            :py:obj:`~qcp.matrices.types.MATRIX`: A nested list of the matrix
+            values transposed, indexed by column/row.
+        """
+        return self.to_sparse().columns()
+
+    def transpose(self) -> Matrix:
+        """
+        Flips the matrix elements along the diagonal, and return a new matrix
+        containing these values.
+
+        returns:
+            Matrix: The transpose of the current matrix.
+        """
+        return self.to_sparse().transpose()
+
+    def conjugate(self) -> Matrix:
+        """
+        Create a new matrix where each value in the matrix is the complex
+        conjugate of the current matrix values.
+
+        returns:
+            Matrix: The conjugated matrix
+        """
+        return self.to_sparse().conjugate()
+
+    def trace(self) -> SCALARS:
+        """
+        Calculate the sum of the diagonal elements of the matrix
+
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The sum of all diagonal
+            elements.
+        """
+        return self.to_sparse().trace()
+
+    def __add__(self, other: Matrix) -> Matrix:
+        return self.to_sparse() + other
+
+    def __sub__(self, other: Matrix) -> Matrix:
+        return self.to_sparse() - other
+
+    def __mul__(self, other: Union[SCALARS, Matrix]) -> Matrix:
+        if isinstance(other, SCALARS_T):
+            return self.to_sparse() * other
+
+        elif isinstance(other, Matrix):
+            return self._dot(other)
+
+        return NotImplemented
+
+    def __str__(self) -> str:
+        return str(self.to_sparse())
@@ -0,0 +1,293 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Peephole optimisation of the gates of a :py:class:`~qcp.circuit.Circuit`,
+which removes redundant gates before the circuit is run.
+
+Each pass walks the gates in order, and compares each gate to the last gate
+before it that shares a qubit with it, as the gates in between commute with
+it.
+"""
+import cmath
+from typing import Callable, List, Optional, Tuple
+
+import qcp.constants as c
+import qcp.gates as g
+from qcp.circuit import SINGLE_QUBIT_GATES, Circuit, Instruction
+from qcp.matrices import DefaultMatrix, DiagonalMatrix, Matrix
+from qcp.matrices.types import VECTOR
+
+#: The gates that are their own inverse, so two equal gates cancel
+SELF_INVERSE_GATES = ["h", "x", "z", "cx", "cz", "swap", "phase_flip",
+                      "invert_about_mean"]
+
+#: The single qubit gates that are fused together
+FUSED_GATES = [name for name in SINGLE_QUBIT_GATES if name != "i"] + ["u"]
+
+#: The gates that are diagonal, which are merged together
+DIAGONAL_GATES = ["z", "p", "i", "cz", "cp", "phase_flip", "diagonal"]
+
+#: An optimisation pass, which returns the optimised copy of the circuit
+PASS = Callable[[Circuit], Circuit]
+
+
+class OptimisationReport:
+    """
+    The number of gates, and the estimated cost of applying the circuit,
+    before and after it was optimised.
+    """
+
+    def __init__(self, gates_before: int, gates_after: int,
+                 cost_before: int, cost_after: int):
+        """
+        Initialise the OptimisationReport
+
+        :param int gates_before: The number of gates of the original circuit
+        :param int gates_after: The number of gates of the optimised circuit
+        :param int cost_before: The estimated cost of the original circuit
+        :param int cost_after: The estimated cost of the optimised circuit
+        """
+        self.gates_before = gates_before
+        self.gates_after = gates_after
+        self.cost_before = cost_before
+        self.cost_after = cost_after
+
+    @property
+    def gates_saved(self) -> int:
+        """
+        The number of gates removed by the optimisation
+
+        returns:
+            int: The number of gates saved
+        """
+        return self.gates_before - self.gates_after
+
+    @property
+    def cost_saved(self) -> float:
+        """
+        The fraction of the estimated cost of the circuit saved by the
+        optimisation
+
+        returns:
+            float: The fraction of the cost saved
+        """
+        if self.cost_before == 0:
+            return 0.0
+        return 1 - self.cost_after / self.cost_before
+
+    def __str__(self) -> str:
+        return f"gates: {self.gates_before} -> {self.gates_after} " + \
+            f"({self.gates_saved} saved), estimated cost: " + \
+            f"{self.cost_before} -> {self.cost_after} " + \
+            f"({self.cost_saved:.1%} saved)"
+
+
+def _last_overlapping(instructions: List[Instruction],
+                      qubits: List[int]) -> int:
+    """
+    Find the last gate that shares a qubit with the given qubits
+
+    :param List[Instruction] instructions: The gates to search
+    :param List[int] qubits: The qubits to look for
+    returns:
+        int: The index of the last gate that shares a qubit, or -1 if there
+        is no such gate
+    """
+    bits = set(qubits)
+    for k in range(len(instructions) - 1, -1, -1):
+        if bits.intersection(instructions[k].qubits):
+            return k
+    return -1
+
+
+def _single_qubit_matrix(instruction: Instruction) -> Matrix:
+    """
+    The 2x2 matrix of the single qubit gate
+
+    :param Instruction instruction: The single qubit gate
+    returns:
+        Matrix: The 2x2 gate
+    """
+    if instruction.name == "h":
+        return c.TWO_HADAMARD
+    elif instruction.name == "x":
+        return c.PAULI_X
+    elif instruction.name == "z":
+        return c.PAULI_Z
+    elif instruction.name == "p":
+        return g.phase_shift(instruction.params[0])
+    return instruction.params[0]
+
+
+def _is_identity(gate: Matrix) -> bool:
+    """
+    Whether the 2x2 gate is the identity
+
+    :param Matrix gate: The 2x2 gate
+    returns:
+        bool: Whether the gate is the identity
+    """
+    return all(cmath.isclose(gate[i][j], 1 if i == j else 0, abs_tol=1E-12)
+               for i in range(2) for j in range(2))
+
+
+def _diagonal(instruction: Instruction, size: int) -> VECTOR:
+    """
+    The entries of the diagonal of the diagonal gate
+
+    :param Instruction instruction: The diagonal gate
+    :param int size: The number of qubits in the register
+    returns:
+        VECTOR: The diagonal entries
+    """
+    n = 2 ** size
+    name = instruction.name
+    if name == "diagonal":
+        return list(instruction.params[0].diagonal)
+    elif name == "phase_flip":
+        flipped = set(instruction.params)
+        return [-1 if i in flipped else 1 for i in range(n)]
+    elif name == "i":
+        return [1] * n
+
+    val = -1 if name in ["z", "cz"] else cmath.exp(1j * instruction.params[0])
+    if name in ["z", "p"]:
+        mask = 0
+        for t in instruction.targets:
+            mask |= 1 << t
+        # The phase applies once for each target bit that is set
+        return [val ** bin(i & mask).count("1") for i in range(n)]
+
+    # The controlled phase only applies when the control bits have their
+    # control values, and the target bit is set
+    mask, value = g.control_mask(instruction.controls,
+                                 instruction.control_values)
+    mask |= 1 << instruction.targets[0]
+    value |= 1 << instruction.targets[0]
+    return [val if i & mask == value else 1 for i in range(n)]
+
+
+def cancel_inverses(circuit: Circuit) -> Circuit:
+    """
+    Remove pairs of equal self-inverse gates, with no gates between them on
+    the same qubits, and any identity gates.
+
+    :param Circuit circuit: The circuit to optimise
+    returns:
+        Circuit: The optimised circuit
+    """
+    optimised = Circuit(circuit.size)
+    gates = optimised.instructions
+    for ins in circuit:
+        if ins.name == "i":
+            continue
+
+        k = _last_overlapping(gates, ins.qubits)
+        if k >= 0 and ins.name in SELF_INVERSE_GATES and gates[k] == ins:
+            del gates[k]
+        else:
+            gates.append(ins)
+    return optimised
+
+
+def fuse_single_qubit_gates(circuit: Circuit) -> Circuit:
+    """
+    Fuse consecutive single qubit gates on the same qubits into a single 2x2
+    gate, which is removed if it is the identity.
+
+    :param Circuit circuit: The circuit to optimise
+    returns:
+        Circuit: The optimised circuit
+    """
+    optimised = Circuit(circuit.size)
+    gates = optimised.instructions
+    for ins in circuit:
+        if ins.name in FUSED_GATES:
+            k = _last_overlapping(gates, ins.targets)
+            if k >= 0 and gates[k].name in FUSED_GATES and \
+                    set(gates[k].targets) == set(ins.targets):
+                fused = _single_qubit_matrix(ins) * \
+                    _single_qubit_matrix(gates[k])
+                if _is_identity(fused):
+                    del gates[k]
+                else:
+                    gates[k] = Instruction("u", gates[k].targets,
+                                           params=[DefaultMatrix(
+                                               fused.get_state())])
+                continue
+        gates.append(ins)
+    return optimised
+
+
+def merge_diagonal_gates(circuit: Circuit) -> Circuit:
+    """
+    Merge consecutive diagonal gates into a single diagonal gate on the
+    whole register, when it is cheaper to apply than the separate gates.
+
+    :param Circuit circuit: The circuit to optimise
+    returns:
+        Circuit: The optimised circuit
+    """
+    size = circuit.size
+    all_qubits = [i for i in range(size)]
+    optimised = Circuit(size)
+    gates = optimised.instructions
+    for ins in circuit:
+        if ins.name in DIAGONAL_GATES:
+            k = _last_overlapping(gates, ins.qubits)
+            if k >= 0 and gates[k].name in DIAGONAL_GATES:
+                diagonal = [a * b for a, b in zip(_diagonal(gates[k], size),
+                                                  _diagonal(ins, size))]
+                merged = Instruction("diagonal", all_qubits,
+                                     params=[DiagonalMatrix(diagonal)])
+                if merged.cost(size) < gates[k].cost(size) + ins.cost(size):
+                    gates[k] = merged
+                    continue
+        gates.append(ins)
+    return optimised
+
+
+#: The passes applied by :py:func:`optimise` by default
+DEFAULT_PASSES: List[PASS] = [
+    cancel_inverses, merge_diagonal_gates, fuse_single_qubit_gates
+]
+
+
+def optimise(circuit: Circuit, passes: Optional[List[PASS]] = None
+             ) -> Tuple[Circuit, OptimisationReport]:
+    """
+    Apply the optimisation passes to the circuit, until they stop removing
+    gates or reducing the cost of the circuit.
+
+    :param Circuit circuit: The circuit to optimise
+    :param Optional[List[PASS]] passes: The passes to apply in order,
+        defaults to DEFAULT_PASSES
+    returns:
+        Tuple[Circuit, OptimisationReport]: The optimised circuit, and the
+        savings made by the optimisation
+    """
+    if passes is None:
+        passes = DEFAULT_PASSES
+
+    optimised = circuit
+    while True:
+        before = (len(optimised), optimised.cost())
+        for p in passes:
+            optimised = p(optimised)
+        if (len(optimised), optimised.cost()) == before:
+            break
+
+    report = OptimisationReport(len(circuit), len(optimised),
+                                circuit.cost(), optimised.cost())
+    return optimised, report
@@ -16,8 +16,10 @@ Code that converts a given column vector to the probability distributions of
 observing the qbits in each state
 """
 from qcp.matrices import Matrix
+import abc
 import cmath
-from typing import List
+import random
+from typing import Dict, List, Optional, Sequence, Union, overload
 
 from qcp.matrices.types import SCALARS
 
@@ -46,6 +48,56 @@ def measure(mat: Matrix) -> List[float]:
     return probabilities
 
 
+def marginal_probabilities(mat: Matrix, qubits: List[int]) -> List[float]:
+    """
+    Compute the probabilities of observing each state of the given subset
+    of the qbits, summed over the states of the remaining qbits.
+
+    :param Matrix mat: the column vector of qbit states to measure.
+    :param List[int] qubits: the qbits to find the probabilities of, where
+        bit b of the returned state index is the state of qubits[b]
+    returns:
+        List[float]: list of the 2**len(qubits) probabilities of observing
+        the qbits in each state, normalised to total probability of 1.
+    """
+    return marginalise(measure(mat), qubits)
+
+
+def marginalise(probabilities: Sequence[float],
+                qubits: List[int]) -> List[float]:
+    """
+    Sum the probabilities of the register states over the states of every
+    qbit not in the given subset, in a single pass over the probabilities.
+
+    :param Sequence[float] probabilities: the probabilities of each state
+        of the register
+    :param List[int] qubits: the qbits to keep, where bit b of the returned
+        state index is the state of qubits[b]
+    returns:
+        List[float]: list of the 2**len(qubits) marginal probabilities
+    """
+    n = len(probabilities)
+    assert len(set(qubits)) == len(qubits), "qubits must be distinct"
+    for q in qubits:
+        assert q >= 0 and 1 << q < n, "qubit out of range"
+
+    marginal = [0.0 for _ in range(2 ** len(qubits))]
+
+    # The usual case of the lowest qbits is just the low bits of the index
+    if qubits == [i for i in range(len(qubits))]:
+        mask = len(marginal) - 1
+        for i, p in enumerate(probabilities):
+            marginal[i & mask] += p
+        return marginal
+
+    for i, p in enumerate(probabilities):
+        k = 0
+        for b, q in enumerate(qubits):
+            k |= ((i >> q) & 1) << b
+        marginal[k] += p
+    return marginal
+
+
 def _magnitude(v: SCALARS) -> float:
     """
     Measure the probability magnitude of the given scalar in the
@@ -59,3 +111,164 @@ def _magnitude(v: SCALARS) -> float:
         return (v * v.conjugate()).real
     else:
         return v**2
+
+
+class Sampler(Sequence[float], abc.ABC):
+    """
+    The probabilities of observing each state of a register, which states
+    are sampled from, and which are read like a list of the probabilities.
+    """
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """
+        Return the number of states
+
+        returns:
+            int: The number of states
+        """
+
+    @overload
+    def __getitem__(self, i: int) -> float:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[float]:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]
+                    ) -> Union[float, List[float]]:
+        """
+        Get the probability of observing the given state, or the list of
+        probabilities of the given slice of states
+
+        :param Union[int, slice] i: The index of the state, or the slice of
+            indices
+        returns:
+            Union[float, List[float]]: The probability of the state, or the
+            probabilities of each state in the slice
+        """
+        n = len(self)
+        if isinstance(i, slice):
+            return [self.probability(k) for k in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if i not in range(n):
+            raise IndexError("state index out of range")
+        return self.probability(i)
+
+    @abc.abstractmethod
+    def probability(self, i: int) -> float:
+        """
+        Get the probability of observing the given state
+
+        :param int i: The index of the state, in range(len(self))
+        returns:
+            float: The probability of the state
+        """
+
+    @abc.abstractmethod
+    def sample(self, rng: Optional[random.Random] = None) -> int:
+        """
+        Sample a single state
+
+        :param Optional[random.Random] rng: The random number generator to
+            use, defaults to the random module
+        returns:
+            int: The index of the state observed
+        """
+
+    def sample_counts(self, shots: int,
+                      rng: Optional[random.Random] = None) -> Dict[int, int]:
+        """
+        Sample the given number of shots
+
+        :param int shots: The number of states to sample
+        :param Optional[random.Random] rng: The random number generator to
+            use, defaults to the random module
+        returns:
+            Dict[int, int]: The number of times each state was observed,
+            for the states observed at least once
+        """
+        assert shots > 0, "number of shots must be positive"
+        counts: Dict[int, int] = {}
+        for _ in range(shots):
+            i = self.sample(rng)
+            counts[i] = counts.get(i, 0) + 1
+        return counts
+
+
+class AliasTable(Sampler):
+    """
+    Walker's alias table of the probabilities of observing each state, which
+    is built once in O(n) and then samples a state in O(1) per shot.
+    """
+
+    def __init__(self, probabilities: Sequence[float]):
+        """
+        Build the alias table of the given probabilities, which are
+        normalised if they don't sum to 1.
+
+        :param Sequence[float] probabilities: The probability of each state
+        """
+        n = len(probabilities)
+        assert n > 0, "need at least one state"
+        total = sum(probabilities)
+        assert total > 0, "total probability must be positive"
+
+        self.probabilities = [p / total for p in probabilities]
+
+        # Split each state into a column of height 1, where the state is
+        # accepted with the probability accept[i], and otherwise the column
+        # is filled by the alias state
+        scaled = [p * n for p in self.probabilities]
+        self._accept = [1.0 for _ in range(n)]
+        self._alias = [i for i in range(n)]
+
+        small = [i for i, s in enumerate(scaled) if s < 1]
+        large = [i for i, s in enumerate(scaled) if s >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self._accept[less] = scaled[less]
+            self._alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def __len__(self) -> int:
+        """
+        Return the number of states in the table
+
+        returns:
+            int: The number of states
+        """
+        return len(self._accept)
+
+    def probability(self, i: int) -> float:
+        """
+        Get the (normalised) probability of observing the given state
+
+        :param int i: The index of the state
+        returns:
+            float: The probability of the state
+        """
+        return self.probabilities[i]
+
+    def sample(self, rng: Optional[random.Random] = None) -> int:
+        """
+        Sample a single state
+
+        :param Optional[random.Random] rng: The random number generator to
+            use, defaults to the random module
+        returns:
+            int: The index of the state observed
+        """
+        u = (rng.random() if rng is not None else random.random()) * len(self)
+        i = min(int(u), len(self) - 1)
+        # The fractional part decides between the state and it's alias
+        if u - i < self._accept[i]:
+            return i
+        return self._alias[i]
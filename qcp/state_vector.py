@@ -0,0 +1,425 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Simulation engine that applies the gates from :py:mod:`qcp.gates` directly
+to a list of 2**n amplitudes, without ever constructing the
+(2**n by 2**n) gate matrices.
+"""
+from __future__ import annotations
+
+import cmath
+import math
+from typing import List, Optional
+
+import qcp.gates as g
+import qcp.register as reg
+from qcp.matrices import SPARSE, DefaultMatrix, Matrix
+from qcp.matrices.controlled_operator import apply_controlled
+from qcp.matrices.hadamard_layer import walsh_hadamard
+from qcp.matrices.qft_operator import fourier_transform
+from qcp.matrices.types import SCALARS, VECTOR
+
+
+class StateVector:
+    """
+    Representation of a quantum register as a flat list of the 2**size
+    amplitudes, where each gate is applied in place by updating the pairs
+    (or blocks) of amplitudes it mixes.
+
+    The qubit indexing follows the same little endian convention as
+    :py:mod:`qcp.gates`, so qubit k corresponds to the bit 2**k of the
+    amplitude index.
+    """
+
+    def __init__(self, amplitudes: VECTOR):
+        """
+        Initialise the StateVector from the given list of amplitudes.
+
+        :param VECTOR amplitudes: The 2**size amplitudes of the register
+        """
+        n = len(amplitudes)
+        assert n > 1 and n & (n - 1) == 0, \
+            "number of amplitudes must be a power of two"
+
+        self.amplitudes = amplitudes
+        self.size = int(math.log2(n))
+
+    @staticmethod
+    def from_matrix(mat: Matrix) -> StateVector:
+        """
+        Create a StateVector from the given column vector Matrix
+
+        :param Matrix mat: The column vector of the register
+        returns:
+            StateVector: The amplitudes of the column vector.
+        """
+        assert mat.num_columns == 1, \
+            "can only create a state vector from column matrices"
+        return StateVector([row[0] for row in mat.get_state()])
+
+    def to_matrix(self) -> Matrix:
+        """
+        Convert the amplitudes into a column vector Matrix
+
+        returns:
+            Matrix: The column vector of the register
+        """
+        n = len(self.amplitudes)
+        entries: SPARSE = {i: {} for i in range(n)}
+        for i, v in enumerate(self.amplitudes):
+            if cmath.isclose(v, 0):
+                continue
+            entries[i][0] = v
+
+        return DefaultMatrix(entries, w=1, h=n)
+
+    def marginal_probabilities(self, qubits: List[int]) -> List[float]:
+        """
+        Sum the squared magnitudes of the amplitudes over the states of the
+        qubits not in the given subset, with
+        :py:func:`qcp.register.marginalise`
+
+        :param List[int] qubits: the qubits to find the probabilities of,
+            where bit b of the returned state index is the state of
+            qubits[b]
+        returns:
+            List[float]: list of the 2**len(qubits) probabilities
+        """
+        return reg.marginalise(
+            [abs(a) ** 2 for a in self.amplitudes], qubits)
+
+    def __len__(self) -> int:
+        """
+        Return the number of amplitudes in the register
+
+        returns:
+            int: The number of amplitudes, 2**size
+        """
+        return len(self.amplitudes)
+
+    def __getitem__(self, i: int) -> SCALARS:
+        """
+        Get the amplitude of the basis state with the given index
+
+        :param int i: The index of the basis state
+        returns:
+            :py:obj:`~qcp.matrices.types.SCALARS`: The amplitude
+        """
+        return self.amplitudes[i]
+
+    def _check_bits(self, controls: List[int], target: int):
+        """
+        Verify that the given control/target bits can be applied to this
+        register, using the same conditions as :py:mod:`qcp.gates`
+
+        :param List[int] controls: List of control qubits
+        :param int target: The target qubit
+        """
+        assert self.size > 1, "need minimum of two qubits"
+        assert isinstance(controls, list)
+
+        bit_bounds = range(self.size)
+        for con in controls:
+            assert con in bit_bounds, "control bit out of range"
+        assert target in bit_bounds, "target bit out of range"
+
+        assert target not in \
+            controls, "control bits and target bit cannot be the same"
+
+    def apply_gate(self, target: int, gate: Matrix):
+        """
+        Apply the given 2x2 gate to the target qubit, by updating every
+        pair of amplitudes whose indices differ only in the target bit.
+
+        :param int target: The qubit to apply the gate to
+        :param Matrix gate: The 2x2 single qubit gate
+        """
+        assert gate.num_rows == 2 and gate.num_columns == 2, \
+            "can only apply single qubit gates"
+        assert target in range(self.size), "target bit out of range"
+
+        a, b = gate[0][0], gate[0][1]
+        d, e = gate[1][0], gate[1][1]
+
+        amps = self.amplitudes
+        n = len(amps)
+        stride = 1 << target
+
+        # Iterate over the blocks where the target bit is 0, with the
+        # matching amplitude with the target bit set 'stride' entries on
+        for block in range(0, n, 2 * stride):
+            for i in range(block, block + stride):
+                j = i + stride
+                x0, x1 = amps[i], amps[j]
+                amps[i] = a * x0 + b * x1
+                amps[j] = d * x0 + e * x1
+
+    def multi_gate(self, targets: List[int], gate: g.Gate, phi=0j):
+        """
+        Apply the given gate to each of the targeted qubits, equivalent to
+        applying :py:meth:`qcp.gates.multi_gate`
+
+        :param List[int] targets: list of qubits the gate is applied to
+        :param Gate gate: Enum of which gate we want to apply
+        :param complex phi: Phase angle for the phase gate
+        """
+        if gate is g.Gate.X:
+            for t in set(targets):
+                self._pauli_x(t)
+        elif gate is g.Gate.Z:
+            for t in set(targets):
+                self._phase(t, -1)
+        elif gate is g.Gate.P:
+            val = cmath.exp(1j * phi)
+            for t in set(targets):
+                self._phase(t, val)
+        elif gate is g.Gate.H:
+            walsh_hadamard(self.amplitudes, targets)
+
+    def _pauli_x(self, target: int):
+        """
+        Swap each pair of amplitudes differing in the target bit
+
+        :param int target: The qubit to flip
+        """
+        assert target in range(self.size), "target bit out of range"
+        amps = self.amplitudes
+        n = len(amps)
+        stride = 1 << target
+
+        for block in range(0, n, 2 * stride):
+            for i in range(block, block + stride):
+                j = i + stride
+                amps[i], amps[j] = amps[j], amps[i]
+
+    def _phase(self, target: int, val: SCALARS):
+        """
+        Scale each amplitude with the target bit set by the given value
+
+        :param int target: The qubit to phase shift
+        :param SCALARS val: The value to scale the amplitudes by
+        """
+        assert target in range(self.size), "target bit out of range"
+        amps = self.amplitudes
+        n = len(amps)
+        stride = 1 << target
+
+        for block in range(stride, n, 2 * stride):
+            for i in range(block, block + stride):
+                amps[i] *= val
+
+    def control_x(self, controls: List[int], target: int,
+                  control_values: Optional[List[int]] = None):
+        """
+        Apply a control-x gate, equivalent to :py:meth:`qcp.gates.control_x`
+
+        :param List[int] controls: List of control qubits
+        :param int target: target qubit the x gate will be applied to
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self._check_bits(controls, target)
+
+        amps = self.amplitudes
+        mask, value = g.control_mask(controls, control_values)
+        target_bit = 2 ** target
+
+        for i in range(len(amps)):
+            # Only visit each pair once, from the index with target bit 0
+            if i & target_bit or i & mask != value:
+                continue
+            j = i | target_bit
+            amps[i], amps[j] = amps[j], amps[i]
+
+    def _generic_control(self, controls: List[int], target: int,
+                         cval: SCALARS,
+                         control_values: Optional[List[int]] = None):
+        """
+        Scale the amplitudes where the control bits have their control
+        values and the target bit is set by the control value, equivalent to
+        the diagonal gates constructed by
+        :py:meth:`qcp.gates._generic_control`
+
+        :param List[int] controls: List of control qubits
+        :param int target: target qubit the gate will be applied to
+        :param SCALARS cval: The control value in the gate
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self._check_bits(controls, target)
+
+        amps = self.amplitudes
+        mask, value = g.control_mask(controls, control_values)
+        mask |= 2 ** target
+        value |= 2 ** target
+
+        for i in range(len(amps)):
+            if i & mask == value:
+                amps[i] *= cval
+
+    def control_z(self, controls: List[int], target: int,
+                  control_values: Optional[List[int]] = None):
+        """
+        Apply a control-z gate, equivalent to :py:meth:`qcp.gates.control_z`
+
+        :param List[int] controls: List of control qubits
+        :param int target: target qubit the z gate will be applied to
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self._generic_control(controls, target, -1, control_values)
+
+    def control_phase(self, controls: List[int], target: int, phi: complex,
+                      control_values: Optional[List[int]] = None):
+        """
+        Apply a control-phase gate, equivalent to
+        :py:meth:`qcp.gates.control_phase`
+
+        :param List[int] controls: List of control qubits
+        :param int target: target qubit the phase gate will be applied to
+        :param complex phi: angle the target qubit will be phase shifted by
+        :param Optional[List[int]] control_values: The value each control
+            qubit must have for the gate to act, defaults to 1 for every
+            control qubit
+        """
+        self._generic_control(controls, target, cmath.exp(1j * phi),
+                              control_values)
+
+    def swap(self, target0: int, target1: int):
+        """
+        Swap the two target qubits, equivalent to :py:meth:`qcp.gates.swap`
+
+        :param int target0: The first target bit to swap
+        :param int target1: The second target bit to swap
+        """
+        assert self.size > 1, "need minimum of two qbits"
+        assert target0 != target1, "swap targets must be different"
+
+        bit_bounds = range(self.size)
+        assert target0 in bit_bounds, "first target bit out of range"
+        assert target1 in bit_bounds, "second target bit out of range"
+
+        # qcp.gates.swap() indexes the targets from the most significant
+        # bit, so convert to the bit positions
+        bit0 = 2 ** (self.size - 1 - target0)
+        bit1 = 2 ** (self.size - 1 - target1)
+
+        amps = self.amplitudes
+        for i in range(len(amps)):
+            # Only the states where the two bits differ are changed, visit
+            # each pair once from the state with bit0 set
+            if i & bit0 and not i & bit1:
+                j = i ^ bit0 ^ bit1
+                amps[i], amps[j] = amps[j], amps[i]
+
+    def control_u(self, control: int, unitary: Matrix,
+                  control_value: int = 1):
+        """
+        Apply the control U gate, equivalent to
+        :py:meth:`qcp.gates.control_u`, where the unitary acts on the most
+        significant qubits of the register.
+
+        :param int control: control qubit
+        :param Matrix unitary: Unitary gate to apply
+        :param int control_value: The value, 0 or 1, the control qubit must
+            have for the unitary to be applied
+        """
+        assert self.size > 1, "need minimum of two qubits"
+        assert control in range(self.size), "control bit out of range"
+        assert unitary.square, "unitary matrix must be square"
+        assert unitary.num_rows < self.size, "unitary matrix too big"
+        assert control_value in (0, 1), "control values must be 0 or 1"
+
+        targetsize = int(math.log2(unitary.num_rows))
+        target = self.size - targetsize
+        self.controlled_unitary(target - 1 - control, target, unitary,
+                                control_value)
+
+    def controlled_unitary(self, control: int, target: int, unitary: Matrix,
+                           control_value: int = 1):
+        """
+        Apply the unitary to the consecutive qubits from the target qubit up
+        when the control qubit has the control value, equivalent to
+        :py:meth:`qcp.gates.controlled_unitary`, which only updates the
+        amplitudes where the control qubit has the control value.
+
+        :param int control: control qubit
+        :param int target: The lowest of the qubits the unitary acts on
+        :param Matrix unitary: Unitary gate to apply
+        :param int control_value: The value, 0 or 1, the control qubit must
+            have for the unitary to be applied
+        """
+        assert unitary.square, "unitary matrix must be square"
+        targetsize = unitary.num_rows.bit_length() - 1
+        assert control in range(self.size), "control bit out of range"
+        assert target >= 0 and target + targetsize <= self.size, \
+            "target bits out of range"
+        assert control not in range(target, target + targetsize), \
+            "control bit cannot be a target bit"
+        assert control_value in (0, 1), "control values must be 0 or 1"
+
+        apply_controlled(self.amplitudes, control, target,
+                         unitary.get_state(), control_value)
+
+    def qft(self, size: int, inverse: bool = False):
+        """
+        Apply the Quantum Fourier Transform to the lowest qubits of the
+        register with the FFT, equivalent to
+        :py:func:`~qcp.algorithms.phase_estimation.qft_gate` tensored with
+        the identity on the remaining qubits.
+
+        :param int size: The number of qubits to transform
+        :param bool inverse: Whether to apply the inverse QFT
+        """
+        assert size in range(1, self.size + 1), "target bit out of range"
+        fourier_transform(self.amplitudes, size, inverse)
+
+    def phase_flip(self, index: int):
+        """
+        Flip the sign of the amplitude of the given basis state, the action
+        of the single target oracle
+        :py:meth:`~qcp.algorithms.grovers_algorithm.Grovers.single_target_oracle`
+
+        :param int index: The index of the basis state to flip
+        """
+        assert index in range(len(self.amplitudes)), "index out of range"
+        self.amplitudes[index] = -self.amplitudes[index]
+
+    def apply_diagonal(self, diagonal: VECTOR):
+        """
+        Multiply each amplitude by the matching entry of the diagonal of a
+        diagonal gate, such as a run of phase gates merged into one.
+
+        :param VECTOR diagonal: The diagonal entries of the gate
+        """
+        assert len(diagonal) == len(self.amplitudes), \
+            "diagonal must have an entry for each amplitude"
+        amps = self.amplitudes
+        for i, d in enumerate(diagonal):
+            amps[i] *= d
+
+    def invert_about_mean(self):
+        """
+        Reflect the amplitudes about their mean, with the same overall sign
+        as the diffusion gate
+        :py:meth:`~qcp.algorithms.grovers_algorithm.Grovers.diffusion`,
+        which maps each amplitude a to a - 2 * mean.
+        """
+        amps = self.amplitudes
+        shift = 2 * sum(amps) / len(amps)
+        for i in range(len(amps)):
+            amps[i] -= shift
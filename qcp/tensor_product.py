@@ -15,24 +15,62 @@
 Code to calculate the general tensor product between two arbitrarily sized
 matrices.
 """
-from qcp.matrices import Matrix, DefaultMatrix, SparseMatrix, MATRIX
+from qcp.matrices import Matrix, DefaultMatrix, SparseMatrix, NumpyMatrix, \
+    CSRMatrix, DiagonalMatrix, IdentityMatrix, KroneckerOperator, \
+    PermutationMatrix, QFTOperator, StructuredMatrix, MATRIX
 from typing import Dict, Union
 import cmath
+import numpy as np
 
 
-def tensor_product(A: Matrix, B: Matrix) -> Matrix:
+def tensor_product(A: Matrix, B: Matrix, lazy: bool = False) -> Matrix:
     """
     Compute the tensor product between two matrices, and return the
     resultant Matrix
 
+    If either matrix is a
+    :py:obj:`~qcp.matrices.kronecker_operator.KroneckerOperator`, or lazy is
+    set, the result is a KroneckerOperator that keeps the two matrices as
+    factors instead of computing the elements of the product.
+
     :param Matrix A: An m*n matrix
     :param Matrix B: Second p*q matrix to tensor product with
+    :param bool lazy: Whether to return the tensor product as a
+        KroneckerOperator
     returns:
         Matrix: An (m*p)*(n*q) matrix of the tensor product.
     """
+    if lazy or isinstance(A, KroneckerOperator) or \
+            isinstance(B, KroneckerOperator):
+        return KroneckerOperator([A, B])
+
+    if isinstance(A, IdentityMatrix) and isinstance(B, IdentityMatrix):
+        return IdentityMatrix(A.num_rows * B.num_rows)
+    # The QFT of the lowest qubits of a larger register
+    if isinstance(A, IdentityMatrix) and isinstance(B, QFTOperator):
+        return QFTOperator(B.size, B.inverse, A.num_rows * B.blocks)
+    # An identity takes on the structure of the other factor
+    if isinstance(A, IdentityMatrix):
+        A = _identity_like(A, B)
+    if isinstance(B, IdentityMatrix):
+        B = _identity_like(B, A)
+
+    if isinstance(A, PermutationMatrix) and isinstance(B, PermutationMatrix):
+        return _tensor_product_permutation(A, B)
+    if isinstance(A, DiagonalMatrix) and isinstance(B, DiagonalMatrix):
+        return DiagonalMatrix(np.kron(A.array, B.array))
+    # Otherwise structured matrices are combined using their sparse form
+    if isinstance(A, StructuredMatrix):
+        A = A.to_sparse()
+    if isinstance(B, StructuredMatrix):
+        B = B.to_sparse()
 
     if isinstance(A, SparseMatrix) and isinstance(B, SparseMatrix):
         return _tensor_product_sparse(A, B)
+    if isinstance(A, NumpyMatrix) or isinstance(B, NumpyMatrix):
+        return _tensor_product_numpy(A, B)
+    if isinstance(A, CSRMatrix) or isinstance(B, CSRMatrix):
+        return _tensor_product_csr(A, B)
 
     m = A.num_rows
     n = A.num_columns
@@ -142,3 +180,93 @@ def _tensor_product_sparse(A: SparseMatrix, B: SparseMatrix) -> SparseMatrix:
                     entries[i][j] = v_a * v_b
 
     return SparseMatrix(entries, w=num_columns, h=num_rows)
+
+
+def _tensor_product_numpy(A: Matrix, B: Matrix) -> NumpyMatrix:
+    """
+    Compute the tensor product between two matrices where at least one is a
+    NumpyMatrix, using the vectorised numpy Kronecker product.
+
+    :param Matrix A: An m*n matrix
+    :param Matrix B: Second p*q matrix to tensor product with
+    returns:
+        NumpyMatrix: An (m*p)*(n*q) matrix of the tensor product.
+    """
+    a = NumpyMatrix.from_matrix(A).array
+    b = NumpyMatrix.from_matrix(B).array
+
+    return NumpyMatrix(np.kron(a, b))
+
+
+def _tensor_product_csr(A: Matrix, B: Matrix) -> CSRMatrix:
+    """
+    Compute the tensor product between two matrices where at least one is a
+    CSRMatrix, writing the rows of the result straight into the CSR buffers.
+
+    :param Matrix A: An m*n matrix
+    :param Matrix B: Second p*q matrix to tensor product with
+    returns:
+        CSRMatrix: An (m*p)*(n*q) matrix of the tensor product.
+    """
+    a = CSRMatrix.from_matrix(A)
+    b = CSRMatrix.from_matrix(B)
+
+    m = a.num_rows
+    p = b.num_rows
+    q = b.num_columns
+
+    result = CSRMatrix.zeros(0, a.num_columns * q)
+    b_rows = [list(b.iter_row(r)) for r in range(p)]
+
+    # Row k*p + r of the result is row k of A, with each entry A[k][l]
+    # replaced by A[k][l] * (row r of B), shifted to the columns l*q...
+    # Since the rows of A and B are sorted, so is the result row.
+    for k in range(m):
+        a_row = list(a.iter_row(k))
+        for r in range(p):
+            for l, v_a in a_row:  # noqa: E741
+                for s, v_b in b_rows[r]:
+                    result.indices.append(l * q + s)
+                    result._append_value(v_a * v_b)
+            result.indptr.append(len(result.indices))
+
+    result._row = m * p
+    return result
+
+
+def _tensor_product_permutation(A: PermutationMatrix,
+                                B: PermutationMatrix) -> PermutationMatrix:
+    """
+    Compute the tensor product between two PermutationMatrices, which is the
+    permutation of the combined indices.
+
+    :param PermutationMatrix A: An m*m permutation matrix
+    :param PermutationMatrix B: Second p*p permutation matrix to tensor
+        product with
+    returns:
+        PermutationMatrix: An (m*p)*(m*p) permutation matrix of the tensor
+        product.
+    """
+    p = B.num_rows
+    # Row k*p + r has it's entry in the column A.perm[k]*p + B.perm[r]
+    return PermutationMatrix(
+        [a * p + b for a in A.perm for b in B.perm]
+    )
+
+
+def _identity_like(identity: IdentityMatrix, other: Matrix) -> Matrix:
+    """
+    Represent the identity matrix with the same structure as the other
+    factor of a tensor product, so that the product keeps that structure.
+
+    :param IdentityMatrix identity: The identity factor
+    :param Matrix other: The other factor of the tensor product
+    returns:
+        Matrix: The identity as a PermutationMatrix or DiagonalMatrix if the
+        other factor is one, or unchanged otherwise
+    """
+    if isinstance(other, PermutationMatrix):
+        return identity.as_permutation()
+    if isinstance(other, DiagonalMatrix):
+        return identity.as_diagonal()
+    return identity
@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import qcp.algorithms.grovers_algorithm as ga
+from qcp.circuit import Instruction
 from qcp.matrices import DefaultMatrix
 import tests.test_helpers as h
 import pytest
 import cmath
+import random
+import numpy as np
 
 
 def test_pull_set_bits():
@@ -154,7 +157,8 @@ def test_construct_circuit():
     # a while computing large circuits and oracles
     grov = ga.Grovers(2, 0)
 
-    circ4x4 = grov.construct_circuit()
+    # Without any reflections, the circuit is the layer of Hadamards
+    circ4x4 = grov.reflections_circuit(0).to_matrix()
     expected4x4 = 0.5 * DefaultMatrix([
         [1, 1, 1, 1],
         [1, -1, 1, -1],
@@ -165,7 +169,7 @@ def test_construct_circuit():
 
     # Change the circuit to be 8x8
     grov.size = 3
-    circ8x8 = grov.construct_circuit()
+    circ8x8 = grov.reflections_circuit(0).to_matrix()
     expected8x8 = 0.354 * DefaultMatrix([[1, 1, 1, 1, 1, 1, 1, 1],
                                          [1, -1, 1, -1, 1, -1, 1, -1],
                                          [1, 1, -1, -1, 1, 1, -1, -1],
@@ -189,7 +193,9 @@ def test_run():
         state[t][0] = -1
         expected4x1 = DefaultMatrix(state)
 
-        h.compare_matrices(result4x1, expected4x1)
+        # The floating point backends leave rounding errors in place of the
+        # exact zeros
+        h.compare_matrices(result4x1, expected4x1, abs_e=1E-9)
 
 
 def test_measure():
@@ -228,3 +234,141 @@ def test_measure():
         assert cmath.isclose(measured_prob3, prob_choices[1])
     else:
         assert False
+
+
+def test_measure_shots():
+    grov = ga.Grovers(3, 0)
+    grov.state = DefaultMatrix({0: {0: 0.6}, 5: {0: 0.8}}, h=8, w=1)
+
+    counts = grov.measure(shots=1000, rng=random.Random(7))
+    assert set(counts.keys()) == {0, 5}
+    assert sum(counts.values()) == 1000
+    assert counts == grov.measure(shots=1000, rng=random.Random(7))
+
+    # The alias table is built once per state
+    table = grov.sampler()
+    assert grov.sampler() is table
+    assert grov.measure(rng=random.Random(7))[0] in (0, 5)
+    assert grov.sampler() is table
+
+    # Setting the state rebuilds the table
+    grov.state = DefaultMatrix({3: {0: 1}}, h=8, w=1)
+    assert grov.sampler() is not table
+    assert grov.measure(shots=10) == {3: 10}
+    assert grov.measure() == (3, 1)
+
+
+def test_run_state_vector():
+    # Applying the gates directly to the state vector should give the same
+    # result as constructing the full circuit matrix
+    for size in [2, 3, 4]:
+        for t in range(2 ** size):
+            grov_matrix = ga.Grovers(size, t)
+            grov_vector = ga.Grovers(size, t, state_vector=True)
+            assert grov_vector.circuit is None
+
+            h.compare_matrices(grov_vector.run(), grov_matrix.run(),
+                               abs_e=1E-9)
+
+
+def test_find_targets():
+    assert ga.find_targets(3, 5) == [5]
+    assert ga.find_targets(3, [6, 1, 6]) == [1, 6]
+    # numpy integers are accepted, and converted to ints
+    targets = ga.find_targets(3, np.int64(5))
+    assert targets == [5] and type(targets[0]) is int
+    assert ga.find_targets(3, np.array([6, 1])) == [1, 6]
+    # Vectorised and scalar predicates
+    assert ga.find_targets(3, lambda x: x % 3 == 0) == [0, 3, 6]
+    assert ga.find_targets(3, lambda x: bin(x).count("1") == 2) == [3, 5, 6]
+
+    with pytest.raises(AssertionError) as ae1:
+        ga.find_targets(2, [1, 4])
+    assert ae1.match("target index must be within number of qbit indices")
+
+    with pytest.raises(AssertionError) as ae2:
+        ga.find_targets(2, lambda x: False)
+    assert ae2.match("need at least one target state")
+
+
+def test_oracle_mask():
+    grov = ga.Grovers(3, [1, 6])
+    assert grov.target == 1
+    assert grov.oracle_mask().diagonal == [1, -1, 1, 1, 1, 1, -1, 1]
+
+    # A single target gives the same oracle as the selector sandwich
+    grov = ga.Grovers(3, 5)
+    assert grov.oracle_mask().get_state() == \
+        grov.single_target_oracle().get_state()
+
+
+def test_multiple_targets():
+    targets = [2, 9, 12]
+    grov = ga.Grovers(4, targets)
+    # pi/4 sqrt(16/3) ~ 1.8
+    assert grov.num_reflections(4) == 1
+    # Constructing the circuit doesn't use up the reflections
+    assert grov.max_reflections == 1
+    assert len(grov.construct_circuit()) == 3
+
+    # The oracle and diffuser matrices are only built when used
+    assert grov._oracle is None and grov._diffuser is None
+    assert grov.oracle is grov.oracle
+    assert grov.oracle.get_state() == grov.oracle_mask().get_state()
+    h.compare_matrices(grov.diffuser, grov.diffusion())
+
+    grov.run()
+    p = grov.probabilities()
+    assert sum(p[t] for t in targets) > 0.9
+
+    grov_vector = ga.Grovers(4, targets, state_vector=True)
+    h.compare_matrices(grov_vector.run(), grov.state, abs_e=1E-9)
+
+
+@pytest.mark.parametrize("state_vector", [False, True])
+def test_search(state_vector):
+    with pytest.raises(AssertionError) as ae:
+        next(ga.Grovers(2, 0).search(growth=1))
+    assert ae.match("the reflection limit must grow between trials")
+
+    targets = [3, 17, 40]
+    grov = ga.Grovers(6, targets, state_vector=state_vector)
+    trials = list(grov.search(rng=random.Random(1)))
+
+    assert len(trials) > 0
+    # Only the last trial finds a target
+    for reflections, observed, found in trials[:-1]:
+        assert not found and observed not in targets
+    reflections, observed, found = trials[-1]
+    assert found and observed in targets
+    assert reflections < 8
+
+    # The same seed gives the same trials in either mode
+    other = ga.Grovers(6, targets, state_vector=not state_vector)
+    assert list(other.search(rng=random.Random(1))) == trials
+
+    assert len(list(grov.search(max_trials=1, rng=random.Random(1)))) == 1
+
+
+def test_search_reuses_gates(monkeypatch):
+    built = []
+    construct = Instruction._construct_matrix
+
+    def counted(self, size):
+        built.append(self.name)
+        return construct(self, size)
+
+    monkeypatch.setattr(Instruction, "_construct_matrix", counted)
+    grov = ga.Grovers(6, [3, 17, 40])
+    built.clear()
+    trials = list(grov.search(rng=random.Random(2)))
+    assert len(trials) > 1
+
+    # The Hadamards and the oracle and diffusion are built once for the
+    # whole search
+    assert sorted(built) == ["h", "invert_about_mean", "phase_flip"]
+
+    # Every reflection of a circuit shares the same gates
+    built.clear()
+    grov.reflections_circuit(4).to_matrix()
+    assert sorted(built) == ["h", "invert_about_mean", "phase_flip"]
@@ -0,0 +1,126 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import collections.abc
+import math
+import random
+
+import pytest
+
+import qcp.algorithms.grovers_algorithm as ga
+import qcp.algorithms.grovers_subspace as gs
+import qcp.register as reg
+import tests.test_helpers as h
+
+
+def test_init():
+    with pytest.raises(AssertionError) as ae:
+        _ = gs.GroversSubspace(2, 10)
+    assert ae.match("target index must be within number of qbit indices")
+
+    grov = gs.GroversSubspace(3, 1)
+    assert grov.state.num_rows == 2
+    # The initial state is the uniform superposition
+    assert grov.probabilities()[5] == pytest.approx(1 / 8)
+
+    # The same number of reflections as Grover's algorithm
+    for size in [2, 5, 10]:
+        assert gs.GroversSubspace(size, 0).max_reflections == \
+            ga.Grovers(size, 0, state_vector=True).max_reflections
+
+
+def test_construct_circuit():
+    # The closed form matches repeating the oracle and diffusion
+    for size in [2, 3, 5, 8]:
+        grov = gs.GroversSubspace(size, 0)
+        expected = grov.diffusion() * grov.oracle()
+        repeated = expected
+        for _ in range(grov.max_reflections - 1):
+            repeated = expected * repeated
+
+        h.compare_matrices(grov.circuit.to_matrix(), repeated, abs_e=1E-9)
+
+
+def test_probabilities():
+    # The probabilities should be the same as simulating the full register
+    for size in [2, 3, 4, 5]:
+        for t in [0, 2 ** size - 1, 2]:
+            full = ga.Grovers(size, t, state_vector=True)
+            subspace = gs.GroversSubspace(size, t)
+            full.run()
+            subspace.run()
+
+            expected = full.probabilities()
+            p = subspace.probabilities()
+            assert len(p) == len(expected)
+            assert list(p) == pytest.approx(expected)
+
+    with pytest.raises(IndexError):
+        _ = p[len(p)]
+
+
+def test_large_register():
+    grov = gs.GroversSubspace(60, 12345)
+    grov.run()
+
+    p = grov.probabilities()
+    assert len(p) == 2 ** 60
+    assert p[12345] > 0.99
+    assert p[0] == pytest.approx((1 - p[12345]) / (2 ** 60 - 1))
+    # The probabilities are a lazy sequence, sliced without listing them all
+    assert isinstance(p, collections.abc.Sequence)
+    assert p[-1] == p[0]
+    assert p[12344:12346] == [p[0], p[12345]]
+    assert math.isclose(p.target_probability + p.other_probability *
+                        (2 ** 60 - 1), 1)
+
+    measured, probability = grov.measure()
+    assert probability == p[measured]
+    assert measured in range(2 ** 60)
+
+
+def test_measure_probabilities(capsys):
+    grov = gs.GroversSubspace(2, 3)
+    grov.run()
+    grov.measure_probabilities()
+
+    full = ga.Grovers(2, 3)
+    full.run()
+    full.measure_probabilities()
+
+    out = [line.split(" : ") for line in capsys.readouterr().out.splitlines()]
+    for (state, prob), (expected_state, expected_prob) in zip(out[:4],
+                                                              out[4:]):
+        assert state == expected_state
+        assert float(prob) == pytest.approx(float(expected_prob), abs=1E-9)
+
+    large = gs.GroversSubspace(gs.MAX_LISTED_QUBITS + 1, 0)
+    large.measure_probabilities()
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+
+def test_measure_shots():
+    grov = gs.GroversSubspace(40, 7)
+    grov.run()
+
+    counts = grov.measure(shots=100, rng=random.Random(3))
+    assert sum(counts.values()) == 100
+    assert counts[7] > 95
+    assert counts == grov.measure(shots=100, rng=random.Random(3))
+
+    # The probabilities are sampled without building an alias table
+    sampler = grov.sampler()
+    assert isinstance(sampler, reg.Sampler)
+    assert not isinstance(sampler, reg.AliasTable)
+    assert sampler.sample_counts(50, random.Random(3)) == \
+        grov.sampler().sample_counts(50, random.Random(3))
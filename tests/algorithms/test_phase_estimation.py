@@ -0,0 +1,126 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import cmath
+import math
+
+import pytest
+
+import qcp.algorithms.phase_estimation as pe
+import qcp.gates as gts
+from qcp.matrices import DefaultMatrix
+import tests.test_helpers as h
+
+
+def phase_unitary(phase: float) -> DefaultMatrix:
+    return DefaultMatrix([[1, 0], [0, cmath.exp(2j * math.pi * phase)]])
+
+
+def test_approximate_qft():
+    # Keeping every rotation is the exact QFT
+    h.compare_matrices(pe.qft_gate(4, 3), pe.qft_gate(4), abs_e=1E-9)
+    h.compare_matrices(pe.inverse_qft_gate(4, 3), pe.inverse_qft_gate(4),
+                       abs_e=1E-9)
+    assert pe.qft_approximation_error(4, None) == 0
+    assert pe.qft_fidelity_bound(4, 3) == 1
+
+    # The approximation drops the rotations between distant qubits
+    exact = pe.inverse_qft_gate(4).get_state()
+    approx = pe.inverse_qft_gate(4, 1).get_state()
+    assert exact != approx
+
+    # R3 on the two pairs of qubits two apart, and R4 on the one pair three
+    # apart, are dropped
+    error = 2 * 2 * math.sin(math.pi / 8) + 2 * math.sin(math.pi / 16)
+    assert pe.qft_approximation_error(4, 1) == pytest.approx(error)
+    # The bound is trivial for large errors
+    assert pe.qft_fidelity_bound(4, 1) == 0
+
+    error = 2 * math.sin(math.pi / 16)
+    assert pe.qft_fidelity_bound(4, 2) == \
+        pytest.approx((1 - error ** 2 / 2) ** 2)
+
+
+def test_fidelity_bound():
+    size = 5
+    for degree in [1, 2, 3]:
+        exact = pe.qft_gate(size)
+        approx = pe.qft_gate(size, degree)
+        bound = pe.qft_fidelity_bound(size, degree)
+
+        for k in range(0, 2 ** size, 7):
+            # The fidelity of the transformed basis states
+            overlap = sum(exact[i][k].conjugate() * approx[i][k]
+                          for i in range(2 ** size))
+            assert abs(overlap) ** 2 >= bound - 1E-9
+
+
+@pytest.mark.parametrize("state_vector", [False, True])
+def test_approximate_phase_estimation(state_vector):
+    with pytest.raises(AssertionError) as ae:
+        pe.PhaseEstimation(3, phase_unitary(0.125), DefaultMatrix([[0], [1]]),
+                           approximation_degree=-1)
+    assert ae.match("approximation degree must be non-negative")
+
+    exact = pe.PhaseEstimation(5, phase_unitary(0.3),
+                               DefaultMatrix([[0], [1]]),
+                               state_vector=state_vector)
+    approx = pe.PhaseEstimation(5, phase_unitary(0.3),
+                                DefaultMatrix([[0], [1]]),
+                                state_vector=state_vector,
+                                approximation_degree=2)
+    assert exact.fidelity_bound == 1
+    assert 0 < approx.fidelity_bound < 1
+
+    exact.run()
+    approx.run()
+    p_exact = exact.probabilities()
+    p_approx = approx.probabilities()
+    assert p_approx.index(max(p_approx)) == p_exact.index(max(p_exact))
+
+
+def test_approximate_modes_match():
+    args = (4, phase_unitary(0.2), DefaultMatrix([[0], [1]]))
+    circuit = pe.PhaseEstimation(*args, approximation_degree=1)
+    vector = pe.PhaseEstimation(*args, state_vector=True,
+                                approximation_degree=1)
+    h.compare_matrices(vector.run(), circuit.run(), abs_e=1E-9)
+
+
+def test_second_layer():
+    theta = 0.3
+    U = DefaultMatrix([[math.cos(theta), -math.sin(theta)],
+                       [math.sin(theta), math.cos(theta)]])
+    est = pe.PhaseEstimation(3, U, DefaultMatrix([[1], [0]]))
+
+    powers = est.unitary_powers()
+    assert len(powers) == 3
+    h.compare_matrices(powers[2], U * U * U * U, abs_e=1E-9)
+
+    # The same as applying the control-U gate 2^i times for each qubit i
+    expected = DefaultMatrix.identity(16)
+    for i in range(3):
+        for _ in range(2 ** i):
+            expected = gts.control_u(4, 2 - i, U) * expected
+    h.compare_matrices(est.second_layer().to_matrix(), expected, abs_e=1E-9)
+
+
+def test_probabilities():
+    # An exactly representable phase is measured with certainty
+    est = pe.PhaseEstimation(3, phase_unitary(0.625),
+                             DefaultMatrix([[0], [1]]))
+    est.run()
+    p = est.probabilities()
+    assert len(p) == 8
+    assert p[5] == pytest.approx(1)
+    assert est.measure_phase() == pytest.approx(0.625)
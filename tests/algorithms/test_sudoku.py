@@ -11,6 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import qcp.algorithms.sudoku as sd
+import tests.test_helpers as h
+
 
 def test_init():
     pass
@@ -29,7 +32,13 @@ def test_diffusion():
 
 
 def test_construct_circuit():
-    pass
+    sudoku = sd.Sudoku()
+    # The initial hadamards, and the oracle and diffusion twice
+    assert len(sudoku.circuit) == 1 + 2 * (19 + 5)
+
+    # Running the circuit on the state vector gives the same state
+    vector = sd.Sudoku(state_vector=True)
+    h.compare_matrices(vector.run(), sudoku.run(), abs_e=1E-9)
 
 
 def test_measure_state():
@@ -0,0 +1,111 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.gates as gts
+from qcp.matrices import ControlledOperator, DefaultMatrix, NumpyMatrix, \
+    SparseMatrix
+from qcp.matrices.controlled_operator import apply_controlled
+import tests.test_helpers as h
+
+U2 = DefaultMatrix([[2, 3j], [4, 5]])
+U4 = DefaultMatrix([[(i + 1) * (j - 1j) for j in range(4)] for i in range(4)])
+
+
+def column(v):
+    return [[x] for x in v]
+
+
+def reference(size, control, target, unitary, control_value=1):
+    # The controlled gate, constructed from its definition
+    n = 2 ** size
+    dim = unitary.num_rows
+    mask = (dim - 1) << target
+    entries = [[0] * n for _ in range(n)]
+    for i in range(n):
+        if (i >> control) & 1 != control_value:
+            entries[i][i] = 1
+            continue
+        for m in range(dim):
+            j = (i & ~mask) | (m << target)
+            entries[i][j] = unitary[(i & mask) >> target][m]
+    return DefaultMatrix(entries)
+
+
+@pytest.mark.parametrize("size,control,target,unitary", [
+    (2, 1, 0, U2), (2, 0, 1, U2), (3, 0, 1, U4), (3, 2, 0, U4),
+    (4, 1, 2, U4), (4, 3, 0, U2), (3, 1, 0, DefaultMatrix([[2]]))
+])
+def test_matches_reference(size, control, target, unitary):
+    v = [i + 1j * (i % 3) for i in range(2 ** size)]
+    for control_value in [0, 1]:
+        C = ControlledOperator(size, control, target, unitary, control_value)
+        expected = reference(size, control, target, unitary, control_value)
+        h.compare_matrices(C, expected)
+
+        product = expected * DefaultMatrix(column(v))
+        assert C.apply(v) == \
+            pytest.approx([row[0] for row in product.get_state()])
+
+        w = list(v)
+        apply_controlled(w, control, target, unitary.get_state(),
+                         control_value)
+        assert w == C.apply(v)
+
+        for backend in [SparseMatrix, NumpyMatrix]:
+            h.compare_matrices(C * backend(column(v)), product, abs_e=1E-9)
+
+
+def test_matches_control_u():
+    # The legacy gate puts the unitary on the highest qubits
+    for control in [0, 1, 2]:
+        C = ControlledOperator(5, 2 - control, 3, U4)
+        h.compare_matrices(C, gts.control_u(5, control, U4))
+
+
+def test_transpose_conjugate():
+    C = ControlledOperator(3, 2, 0, U4, 0)
+    expected = reference(3, 2, 0, U4, 0)
+    assert isinstance(C.transpose(), ControlledOperator)
+    h.compare_matrices(C.transpose(), expected.transpose())
+    h.compare_matrices(C.conjugate(), expected.conjugate())
+    h.compare_matrices(C * 2, expected * 2)
+
+
+def test_invalid():
+    with pytest.raises(AssertionError) as ae0:
+        ControlledOperator(3, 0, 1, DefaultMatrix([[1, 0, 0]] * 2))
+    assert ae0.match("unitary matrix must be square")
+
+    with pytest.raises(AssertionError) as ae1:
+        ControlledOperator(3, 0, 1, DefaultMatrix([[1, 0, 0],
+                                                   [0, 1, 0],
+                                                   [0, 0, 1]]))
+    assert ae1.match("unitary matrix must act on a whole number of qubits")
+
+    with pytest.raises(AssertionError) as ae2:
+        ControlledOperator(3, 3, 0, U2)
+    assert ae2.match("control bit out of range")
+
+    with pytest.raises(AssertionError) as ae3:
+        ControlledOperator(3, 0, 2, U4)
+    assert ae3.match("target bits out of range")
+
+    with pytest.raises(AssertionError) as ae4:
+        ControlledOperator(3, 1, 0, U4)
+    assert ae4.match("control bit cannot be a target bit")
+
+    with pytest.raises(AssertionError) as ae5:
+        ControlledOperator(3, 0, 1, U2, 2)
+    assert ae5.match("control values must be 0 or 1")
@@ -0,0 +1,202 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.gates as gts
+import qcp.tensor_product as tp
+from qcp.matrices import CSRMatrix, SparseMatrix
+
+TEST_2x2 = CSRMatrix([[1, 0],
+                      [0, 2]])
+TEST_4x4 = CSRMatrix([[1, 0, 0, 0],
+                      [0, 2, 0, 0],
+                      [0, 0, 3, 0],
+                      [0, 0, 0, 4]])
+
+
+def test_csr_m_identity():
+    with pytest.raises(AssertionError) as ae1:
+        _ = CSRMatrix.identity(2+2j)
+    assert ae1.match("matrix dimension must be an integer")
+
+    with pytest.raises(AssertionError) as ae2:
+        _ = CSRMatrix.identity(-1)
+    assert ae2.match("Matrix dimension must be positive")
+
+    i3x3 = CSRMatrix.identity(3)
+    assert i3x3.get_state() == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    assert i3x3.nnz == 3
+
+
+def test_csr_m_zeros():
+    A = CSRMatrix.zeros(2, 3)
+    assert A.num_rows == 2
+    assert A.num_columns == 3
+    assert A.nnz == 0
+    assert A.get_state() == [[0, 0, 0], [0, 0, 0]]
+
+
+def test_csr_m_init():
+    # From the SparseMatrix dictionary format
+    A = CSRMatrix.from_sparse({0: {1: 2}, 2: {2: 3, 0: 1}}, w=3, h=3)
+    assert list(A.indptr) == [0, 1, 1, 3]
+    assert list(A.indices) == [1, 0, 2]
+    assert A.data == [2, 1, 3]
+    assert A.get_state() == [[0, 2, 0], [0, 0, 0], [1, 0, 3]]
+
+    # From nested lists, zeros aren't stored
+    B = CSRMatrix([[1, 0], [0, 1j]])
+    assert B.nnz == 2
+    assert B.get_state() == [[1, 0], [0, 1j]]
+
+    # The given dimensions pad or truncate the rows, as for SparseMatrix
+    for w, h in [(3, 3), (1, 2), (2, 1), (-1, 3)]:
+        state = [[1, 0, 2], [0, 1E-12, 3j]]
+        D = CSRMatrix(state, w=w, h=h)
+        assert D.get_state() == SparseMatrix(state, w=w, h=h).get_state()
+    assert list(CSRMatrix([[1, 0, 2], [0, 0, 3j]]).indices) == [0, 2, 2]
+
+    # From coordinate triplets, duplicates are summed, in any order, and
+    # entries that sum to zero aren't stored
+    C = CSRMatrix.from_coo([1, 0, 1, 0, 1], [1, 0, 0, 0, 0], [5, 1, 2, 2, -2],
+                           w=2, h=2)
+    assert C.get_state() == [[3, 0], [0, 5]]
+    assert list(C.indptr) == [0, 1, 2]
+
+    with pytest.raises(AssertionError) as ae:
+        CSRMatrix.from_coo([0], [3], [1], w=2, h=2)
+    assert ae.match("index out of range")
+
+
+def test_csr_m_iter_rows():
+    A = CSRMatrix([[0, 2, 0], [0, 0, 0], [1, 0, 3]])
+    assert list(A.iter_row(2)) == [(0, 1), (2, 3)]
+    assert list(A.iter_row(1)) == []
+    assert list(A.iter_rows()) == [(0, 1, 2), (2, 0, 1), (2, 2, 3)]
+
+
+def test_csr_m_get_set_item():
+    assert TEST_4x4[3][3] == 4
+    assert TEST_4x4[3][0] == 0
+
+    with pytest.raises(AssertionError) as ae:
+        _ = TEST_2x2[3]
+    assert ae.match("index out of range")
+
+    A = CSRMatrix([[1, 0], [0, 2]])
+    A[1] = [5, 6]
+    assert A.get_state() == [[1, 0], [5, 6]]
+
+    # Setting elements of a row writes through to the matrix
+    A[0][1] = 7
+    A[0][0] = -1
+    assert A.get_state() == [[-1, 7], [5, 6]]
+
+    # Zeros are never stored, whether written to a row or an element
+    A[0][1] = 0
+    A[1][0] = 0
+    assert A.get_state() == [[-1, 0], [0, 6]]
+    assert list(A.indptr) == [0, 1, 2]
+    assert list(A.indices) == [0, 1]
+
+    B = CSRMatrix([[1, 0, 2], [0, 3, 0], [4, 0, 5]])
+    B[1] = [6, 0, 7]
+    B[0] = {1: 8, 2: 0}
+    assert B.get_state() == [[0, 8, 0], [6, 0, 7], [4, 0, 5]]
+    assert list(B.indptr) == [0, 1, 3, 5]
+    assert list(B.indices) == [1, 0, 2, 0, 2]
+
+
+def test_csr_m_transpose_conjugate():
+    A = CSRMatrix([[1j, 2j, 0], [0, 0, 3j]])
+    assert A.transpose().get_state() == [[1j, 0], [2j, 0], [0, 3j]]
+    assert A.conjugate().get_state() == [[-1j, -2j, 0], [0, 0, -3j]]
+    assert A.adjoint().get_state() == [[-1j, 0], [-2j, 0], [0, -3j]]
+
+    assert TEST_4x4.trace() == 10
+
+
+def test_csr_m_unitary():
+    assert CSRMatrix.identity(4).unitary
+    assert not TEST_2x2.unitary
+    assert (2 ** -0.5 * CSRMatrix([[1, 1], [1, -1]])).unitary
+
+
+def test_csr_m_add_sub():
+    with pytest.raises(AssertionError) as ae:
+        _ = TEST_2x2 + TEST_4x4
+    assert ae.match("Matrix dimensions must be equal for addition")
+
+    A = CSRMatrix([[0, 1, 0], [2, 0, 0], [0, 0, 3]])
+    B = SparseMatrix([[4, 0, 0], [0, 5, 0], [0, 0, -3]])
+    assert (A + B).get_state() == [[4, 1, 0], [2, 5, 0], [0, 0, 0]]
+    assert (A + B).nnz == 4
+    assert (A - B).get_state() == [[-4, 1, 0], [2, -5, 0], [0, 0, 6]]
+
+
+def test_csr_m_mul():
+    A = CSRMatrix([[1, 2], [3, 4]])
+    assert (A * 2).get_state() == [[2, 4], [6, 8]]
+    assert (1j * A).get_state() == [[1j, 2j], [3j, 4j]]
+    # Scaling doesn't modify the original
+    assert A.get_state() == [[1, 2], [3, 4]]
+
+    B = CSRMatrix([[1, 0], [2, 1]])
+    assert (A * B).get_state() == [[5, 2], [11, 4]]
+    assert (A * SparseMatrix([[1], [0]])).get_state() == [[1], [3]]
+
+    C = CSRMatrix([[1j, 2], [0, 1 - 1j]])
+    D = CSRMatrix([[1 + 1j, 0], [1j, 1j]])
+    expected = SparseMatrix(C.get_state()) * SparseMatrix(D.get_state())
+    assert (C * D).get_state() == expected.get_state()
+    # Entries which cancel exactly aren't stored
+    E = CSRMatrix([[1, 1]]) * CSRMatrix([[1], [-1]])
+    assert E.get_state() == [[0]]
+    assert list(E.indices) == []
+
+    v = CSRMatrix([[1], [2], [3], [4]])
+    assert (v.transpose() * v).get_state() == [[30]]
+    assert (v * v.transpose()).get_state() == [
+        [1, 2, 3, 4], [2, 4, 6, 8], [3, 6, 9, 12], [4, 8, 12, 16]]
+
+    with pytest.raises(AssertionError) as ae:
+        _ = TEST_2x2 * TEST_4x4
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+
+def test_csr_m_gates_drop_in():
+    # Same results as with the SparseMatrix gates
+    cx = CSRMatrix.from_matrix(gts.control_x(3, [1], 0))
+    h = CSRMatrix.from_matrix(gts.multi_gate(2, [0], gts.Gate.H))
+
+    C = tp.tensor_product(h, cx)
+    expected = tp.tensor_product(gts.multi_gate(2, [0], gts.Gate.H),
+                                 gts.control_x(3, [1], 0))
+    assert isinstance(C, CSRMatrix)
+    assert C.get_state() == expected.get_state()
+
+    D = tp.tensor_product(SparseMatrix([[1, 2, 3], [4, 5, 6]]),
+                          CSRMatrix([[1, 2], [3, 4], [5, 6]]))
+    assert D.get_state() == [
+        [1, 2, 2, 4, 3, 6],
+        [3, 4, 6, 8, 9, 12],
+        [5, 6, 10, 12, 15, 18],
+        [4, 8, 5, 10, 6, 12],
+        [12, 16, 15, 20, 18, 24],
+        [20, 24, 25, 30, 30, 36]
+    ]
+
+
+def test_csr_m_str():
+    assert str(TEST_2x2) == "[  1,  0]\n[  0,  2]"
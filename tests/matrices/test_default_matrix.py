@@ -0,0 +1,54 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+import pytest
+
+from qcp.state_vector import StateVector
+from qcp.matrices.default_matrix import ENVIRONMENT_VARIABLE
+from qcp.matrices import DefaultMatrix, NumpyMatrix, SparseMatrix, \
+    get_default_matrix, set_default_matrix
+
+
+@pytest.fixture
+def restore_default():
+    default = get_default_matrix()
+    yield
+    set_default_matrix(default)
+
+
+@pytest.mark.skipif(ENVIRONMENT_VARIABLE in os.environ,
+                    reason="default backend overridden by the environment")
+def test_default_is_sparse():
+    assert get_default_matrix() is SparseMatrix
+    assert isinstance(DefaultMatrix([[1]]), SparseMatrix)
+    assert isinstance(SparseMatrix([[1]]), DefaultMatrix)
+
+
+def test_set_default_matrix(restore_default):
+    with pytest.raises(AssertionError) as ae:
+        set_default_matrix("unknown")
+    assert ae.match("unknown matrix backend")
+
+    set_default_matrix("numpy")
+    assert get_default_matrix() is NumpyMatrix
+    assert isinstance(DefaultMatrix.identity(2), NumpyMatrix)
+    assert isinstance(DefaultMatrix({0: {0: 1}}, w=2, h=2), NumpyMatrix)
+    assert isinstance(NumpyMatrix([[1]]), DefaultMatrix)
+
+    # Modules that imported DefaultMatrix use the new backend
+    assert isinstance(StateVector([1, 0]).to_matrix(), NumpyMatrix)
+
+    set_default_matrix(SparseMatrix)
+    assert isinstance(DefaultMatrix.zeros(2), SparseMatrix)
@@ -0,0 +1,154 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+
+import numpy as np
+import pytest
+
+import qcp.gates as gts
+import qcp.tensor_product as tp
+from qcp.matrices import CSRMatrix, DenseMatrix, DiagonalMatrix, \
+    NumpyMatrix, PermutationMatrix, SparseMatrix, StructuredMatrix
+
+TEST_3x3 = DiagonalMatrix([1, 2j, -1])
+
+
+def test_diag_m_init():
+    with pytest.raises(AssertionError) as ae:
+        DiagonalMatrix([])
+    assert ae.match("attempting to initialise matrix with no dimensions")
+
+    assert TEST_3x3.get_state() == [[1, 0, 0], [0, 2j, 0], [0, 0, -1]]
+    assert TEST_3x3.num_rows == 3
+    assert TEST_3x3.num_columns == 3
+    assert TEST_3x3[1][1] == 2j and TEST_3x3[1][0] == 0
+    assert TEST_3x3.trace() == 2j
+    assert not TEST_3x3.unitary
+    assert DiagonalMatrix([1, 1j, -1]).unitary
+
+    assert DiagonalMatrix.identity(2).get_state() == [[1, 0], [0, 1]]
+
+    # The diagonal is stored as a flat array of complex values, and isn't
+    # shared with the sequence it was created from
+    values = [1, 2, 3]
+    D = DiagonalMatrix(values)
+    assert D.array.dtype == np.complex128 and D.array.shape == (3,)
+    values[0] = 5
+    assert D.diagonal == [1, 2, 3]
+    assert all(type(d) is complex for d in D.diagonal)
+    assert DiagonalMatrix(np.array([1, -1j])).diagonal == [1, -1j]
+
+
+def test_diag_m_transpose_conjugate():
+    assert isinstance(TEST_3x3.transpose(), DiagonalMatrix)
+    assert TEST_3x3.transpose().get_state() == TEST_3x3.get_state()
+
+    adj = TEST_3x3.adjoint()
+    assert isinstance(adj, DiagonalMatrix)
+    assert adj.diagonal == [1, -2j, -1]
+
+
+def test_diag_m_arithmetic():
+    A = DiagonalMatrix([1, 2])
+    B = DiagonalMatrix([3, -2])
+
+    assert isinstance(A + B, DiagonalMatrix)
+    assert (A + B).diagonal == [4, 0]
+    assert (A - B).diagonal == [-2, 4]
+    assert (2 * A).diagonal == [2, 4]
+
+    AB = A * B
+    assert isinstance(AB, DiagonalMatrix)
+    assert AB.diagonal == [3, -4]
+
+    S = A + SparseMatrix([[0, 1], [1, 0]])
+    assert S.get_state() == [[1, 1], [1, 2]]
+
+    with pytest.raises(AssertionError) as ae:
+        _ = A * TEST_3x3
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+    # Unsupported operands aren't multiplied
+    with pytest.raises(TypeError):
+        _ = A * "2"  # type: ignore[operator]
+
+    # A structured matrix needs both to_sparse() and apply()
+    class Incomplete(StructuredMatrix):
+        def to_sparse(self):
+            return SparseMatrix([[1]])
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
+
+
+def test_diag_m_apply():
+    assert TEST_3x3.apply([1, 1, 2]) == [1, 2j, -2]
+
+    Dv = TEST_3x3 * SparseMatrix([[1], [0], [2]])
+    assert isinstance(Dv, SparseMatrix)
+    assert Dv.get_state() == [[1], [0], [-2]]
+
+
+@pytest.mark.parametrize("backend", [SparseMatrix, CSRMatrix, NumpyMatrix,
+                                     DenseMatrix])
+def test_diag_m_mixed_products(backend):
+    A = backend([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    A_sp = SparseMatrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    D_sp = TEST_3x3.to_sparse()
+
+    # Scales the rows
+    DA = TEST_3x3 * A
+    assert DA.get_state() == (D_sp * A_sp).get_state()
+    # Scales the columns
+    AD = A * TEST_3x3
+    assert AD.get_state() == (A_sp * D_sp).get_state()
+
+    if backend is not DenseMatrix:
+        assert isinstance(DA, backend)
+        assert isinstance(AD, backend)
+
+
+def test_diag_m_permutation_products():
+    P = PermutationMatrix([2, 0, 1])
+    P_sp = P.to_sparse()
+    D_sp = TEST_3x3.to_sparse()
+
+    assert (TEST_3x3 * P).get_state() == (D_sp * P_sp).get_state()
+    assert (P * TEST_3x3).get_state() == (P_sp * D_sp).get_state()
+
+
+def test_diag_m_tensor_product():
+    A = DiagonalMatrix([1, -1])
+    C = tp.tensor_product(A, TEST_3x3)
+    assert isinstance(C, DiagonalMatrix)
+    assert C.diagonal == [1, 2j, -1, -1, -2j, 1]
+
+    D = tp.tensor_product(A, SparseMatrix([[0, 1], [1, 0]]))
+    assert D.get_state() == [
+        [0, 1, 0, 0],
+        [1, 0, 0, 0],
+        [0, 0, 0, -1],
+        [0, 0, -1, 0]
+    ]
+
+
+def test_diag_m_gates():
+    assert isinstance(gts.control_z(3, [1], 0), DiagonalMatrix)
+    assert isinstance(gts.control_phase(3, [1], 0, math.pi), DiagonalMatrix)
+    assert isinstance(gts.phase_shift(math.pi), DiagonalMatrix)
+
+    # The rotation ladders stay diagonal
+    ladder = gts.control_phase(3, [0], 2, math.pi / 2) * \
+        gts.control_phase(3, [1], 2, math.pi / 4)
+    assert isinstance(ladder, DiagonalMatrix)
@@ -0,0 +1,65 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.constants as c
+import qcp.gates as gts
+import qcp.tensor_product as tp
+from qcp.matrices import HadamardLayer, IdentityMatrix, KroneckerOperator, \
+    SparseMatrix
+from qcp.matrices.hadamard_layer import walsh_hadamard
+import tests.test_helpers as h
+
+
+def test_walsh_hadamard():
+    v = [1, 2, 3, 4]
+    with pytest.raises(AssertionError) as ae:
+        walsh_hadamard(v, [2])
+    assert ae.match("target bit out of range")
+
+    walsh_hadamard(v, [0, 1])
+    assert v == pytest.approx([5, -1, -2, 0])
+
+    # Only the target qubits are transformed
+    for targets in [[0], [1], [0, 2], [2, 1, 0]]:
+        v = [1, 2j, 3, 4, 0, -1, 2, 1]
+        expected = KroneckerOperator([
+            c.TWO_HADAMARD if i in targets else IdentityMatrix(2)
+            for i in range(2, -1, -1)
+        ]).to_sparse() * SparseMatrix([[x] for x in v])
+
+        walsh_hadamard(v, targets)
+        assert v == pytest.approx([row[0] for row in expected.get_state()])
+
+
+def test_hadamard_layer():
+    with pytest.raises(AssertionError) as ae:
+        HadamardLayer(2, [2])
+    assert ae.match("target bit out of range")
+
+    H = HadamardLayer(3, [0, 2])
+    assert isinstance(gts.multi_gate(3, [0, 2], gts.Gate.H), HadamardLayer)
+    assert H.transpose() is H and H.adjoint() is H
+    h.compare_matrices(H, tp.tensor_product(
+        c.TWO_HADAMARD,
+        tp.tensor_product(SparseMatrix.identity(2), c.TWO_HADAMARD)))
+
+    v = [1, 0, 0, 2, 0, 1j, 0, 0]
+    expected = H.to_sparse() * SparseMatrix([[x] for x in v])
+    assert H.apply(v) == \
+        pytest.approx([row[0] for row in expected.get_state()])
+    # The vector isn't modified
+    assert v == [1, 0, 0, 2, 0, 1j, 0, 0]
+
+    h.compare_matrices(H * SparseMatrix([[x] for x in v]), expected)
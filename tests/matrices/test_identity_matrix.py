@@ -0,0 +1,94 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.gates as gts
+import qcp.tensor_product as tp
+from qcp.matrices import CSRMatrix, DenseMatrix, DiagonalMatrix, \
+    IdentityMatrix, NumpyMatrix, PermutationMatrix, SparseMatrix
+
+
+def test_id_m_init():
+    with pytest.raises(AssertionError) as ae1:
+        IdentityMatrix(2+2j)
+    assert ae1.match("matrix dimension must be an integer")
+
+    with pytest.raises(AssertionError) as ae2:
+        IdentityMatrix(-1)
+    assert ae2.match("Matrix dimension must be positive")
+
+    i3x3 = IdentityMatrix(3)
+    assert i3x3.get_state() == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+    assert i3x3.num_rows == 3 and i3x3.num_columns == 3
+    assert i3x3[1][1] == 1 and i3x3[1][0] == 0
+    assert i3x3.trace() == 3
+    assert i3x3.unitary
+    assert i3x3.adjoint() is i3x3
+    assert i3x3.apply([1, 2, 3]) == [1, 2, 3]
+
+
+def test_id_m_products():
+    A = SparseMatrix([[1, 2], [3, 4]])
+    I = IdentityMatrix(2)  # noqa: E741
+
+    # The product is a copy, so modifying it doesn't change the operand
+    for M in [A, NumpyMatrix([[1, 2], [3, 4]]),
+              CSRMatrix([[1, 2], [3, 4]]), DenseMatrix([[1, 2], [3, 4]])]:
+        for product in [I * M, M * I]:
+            assert product is not M
+            assert product.get_state() == M.get_state()
+
+            product += SparseMatrix([[10, 0], [0, 10]])
+            product[0] = [5, 6]
+            assert M.get_state() == [[1, 2], [3, 4]]
+
+    P = PermutationMatrix([1, 0])
+    assert I * P is P
+    assert P * I is P
+
+    with pytest.raises(AssertionError) as ae:
+        _ = IdentityMatrix(3) * A
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+    assert (2 * I).get_state() == [[2, 0], [0, 2]]
+    assert (I + A).get_state() == [[2, 2], [3, 5]]
+
+
+def test_id_m_tensor_product():
+    II = tp.tensor_product(IdentityMatrix(2), IdentityMatrix(4))
+    assert isinstance(II, IdentityMatrix)
+    assert II.num_rows == 8
+
+    P = PermutationMatrix([1, 0])
+    IP = tp.tensor_product(IdentityMatrix(2), P)
+    assert isinstance(IP, PermutationMatrix)
+    assert IP.get_state() == [
+        [0, 1, 0, 0],
+        [1, 0, 0, 0],
+        [0, 0, 0, 1],
+        [0, 0, 1, 0]
+    ]
+
+    D = DiagonalMatrix([1, -1])
+    DI = tp.tensor_product(D, IdentityMatrix(2))
+    assert isinstance(DI, DiagonalMatrix)
+    assert DI.diagonal == [1, 1, -1, -1]
+
+    A = SparseMatrix([[1, 2], [3, 4]])
+    assert tp.tensor_product(IdentityMatrix(1), A).get_state() == \
+        A.get_state()
+
+
+def test_id_m_gates():
+    assert isinstance(gts.multi_gate(3, [], gts.Gate.I), IdentityMatrix)
@@ -0,0 +1,134 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.constants as c
+import qcp.gates as gts
+import qcp.tensor_product as tp
+from qcp.matrices import DiagonalMatrix, IdentityMatrix, KroneckerOperator, \
+    NumpyMatrix, PermutationMatrix, SparseMatrix
+import tests.test_helpers as h
+
+A = SparseMatrix([[1, 2], [3, 4]])
+B = SparseMatrix([[0, 1j, 0], [1, 0, 2]])
+# The elements of A x B, computed with the sparse tensor product
+AB = tp.tensor_product(A, B)
+
+
+def test_kron_init():
+    with pytest.raises(AssertionError) as ae:
+        KroneckerOperator([])
+    assert ae.match("need at least one factor")
+
+    K = KroneckerOperator([A, B])
+    assert K.num_rows == 4
+    assert K.num_columns == 6
+    assert K.get_state() == AB.get_state()
+    assert K[3][5] == 8
+
+    # Nested operators are flattened
+    nested = KroneckerOperator([K, IdentityMatrix(2)])
+    assert len(nested.factors) == 3
+    assert nested.get_state() == \
+        tp.tensor_product(AB, SparseMatrix.identity(2)).get_state()
+
+
+def test_kron_materialise():
+    M = KroneckerOperator([A, B]).materialise()
+    assert not isinstance(M, KroneckerOperator)
+    assert M.get_state() == AB.get_state()
+
+
+def test_kron_apply():
+    K = KroneckerOperator([A, B])
+    v = [1, 2, 3, 4, 5, 6]
+    expected = [row[0] for row in (AB * SparseMatrix([[x] for x in v]))
+                .get_state()]
+    assert K.apply(v) == expected
+
+    with pytest.raises(AssertionError) as ae:
+        K.apply([1, 2])
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+    # Identity factors are skipped
+    K2 = KroneckerOperator([IdentityMatrix(2), c.PAULI_X])
+    assert K2.apply([1, 2, 3, 4]) == [2, 1, 4, 3]
+
+
+@pytest.mark.parametrize("backend", [SparseMatrix, NumpyMatrix])
+def test_kron_products(backend):
+    K = KroneckerOperator([A, B])
+    M = backend([[1, 0], [2, 1j], [0, 0], [1, 1], [3, 0], [0, 2]])
+    M_sp = SparseMatrix([[1, 0], [2, 1j], [0, 0], [1, 1], [3, 0], [0, 2]])
+
+    KM = K * M
+    assert isinstance(KM, backend)
+    h.compare_matrices(KM, AB * M_sp)
+
+    N = backend([[1, 2, 0, 1], [0, 1j, 1, 0]])
+    N_sp = SparseMatrix([[1, 2, 0, 1], [0, 1j, 1, 0]])
+    NK = N * K
+    assert isinstance(NK, backend)
+    h.compare_matrices(NK, N_sp * AB)
+
+    with pytest.raises(AssertionError) as ae:
+        _ = K * backend([[1], [2]])
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+
+def test_kron_factorwise_product():
+    K1 = KroneckerOperator([A, c.PAULI_X])
+    K2 = KroneckerOperator([c.PAULI_Z, DiagonalMatrix([1, 2])])
+
+    K = K1 * K2
+    assert isinstance(K, KroneckerOperator)
+    expected = K1.to_sparse() * K2.to_sparse()
+    assert K.get_state() == expected.get_state()
+
+
+def test_kron_scalar_transpose():
+    K = KroneckerOperator([A, B])
+
+    assert (2 * K).get_state() == \
+        [[2 * x for x in row] for row in AB.get_state()]
+    # The factors are unchanged by scaling
+    assert A.get_state() == [[1, 2], [3, 4]]
+
+    assert K.transpose().get_state() == AB.transpose().get_state()
+    assert K.adjoint().get_state() == AB.adjoint().get_state()
+
+    assert KroneckerOperator([A, c.PAULI_Z]).trace() == 0
+    assert KroneckerOperator([A, IdentityMatrix(2)]).trace() == 10
+
+
+def test_kron_tensor_product():
+    K = tp.tensor_product(A, B, lazy=True)
+    assert isinstance(K, KroneckerOperator)
+    assert K.get_state() == AB.get_state()
+
+    # Tensor products with an operator stay lazy
+    K2 = tp.tensor_product(K, PermutationMatrix([1, 0]))
+    assert isinstance(K2, KroneckerOperator)
+    assert len(K2.factors) == 3
+
+
+def test_kron_multi_gate():
+    H = gts.multi_gate(3, [0, 2], gts.Gate.H)
+    assert isinstance(H, KroneckerOperator)
+    assert len(H.factors) == 3
+
+    expected = tp.tensor_product(
+        c.TWO_HADAMARD,
+        tp.tensor_product(SparseMatrix.identity(2), c.TWO_HADAMARD))
+    h.compare_matrices(H, expected)
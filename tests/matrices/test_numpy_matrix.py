@@ -0,0 +1,149 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import qcp.tensor_product as tp
+from qcp.matrices import NumpyMatrix, SparseMatrix
+
+TEST_1x1 = NumpyMatrix([[1]])
+TEST_2x2 = NumpyMatrix([[1, 0],
+                        [0, 2]])
+TEST_4x4 = NumpyMatrix([[1, 0, 0, 0],
+                        [0, 2, 0, 0],
+                        [0, 0, 3, 0],
+                        [0, 0, 0, 4]])
+
+
+def test_np_m_identity():
+    with pytest.raises(AssertionError) as ae1:
+        _ = NumpyMatrix.identity(2+2j)
+    assert ae1.match("matrix dimension must be an integer")
+
+    with pytest.raises(AssertionError) as ae2:
+        _ = NumpyMatrix.identity(-1)
+    assert ae2.match("Matrix dimension must be positive")
+
+    assert NumpyMatrix.identity(3).get_state() == \
+        [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+
+def test_np_m_init():
+    # Initialise with a dict of dicts, in the SparseMatrix format
+    np1 = NumpyMatrix({0: {0: 1, 1: 1}, 1: {0: 1, 1: 1}})
+    assert np1.num_rows == 2
+    assert np1.num_columns == 2
+    assert np1.get_state() == [[1, 1], [1, 1]]
+
+    # Explicit dimensions:
+    np2 = NumpyMatrix({1: {0: 5}}, w=1, h=4)
+    assert np2.get_state() == [[0], [5], [0], [0]]
+
+    # Nested lists and arrays
+    np3 = NumpyMatrix([[1, 2], [3, 4]])
+    assert np3.get_state() == [[1, 2], [3, 4]]
+    np4 = NumpyMatrix(np.array([[1, 2], [3, 4]]))
+    assert np4.array.dtype == np.complex128
+    assert np4.get_state() == [[1, 2], [3, 4]]
+
+
+def test_np_m_zeros():
+    assert NumpyMatrix.zeros(2, 3).get_state() == [[0, 0, 0], [0, 0, 0]]
+    assert NumpyMatrix.zeros(2).get_state() == [[0], [0]]
+
+
+def test_np_m_get_set_item():
+    assert TEST_4x4[3][3] == 4
+
+    with pytest.raises(AssertionError) as ae1:
+        _ = TEST_2x2[3]
+    assert ae1.match("index out of range")
+
+    A = NumpyMatrix([[1, 0], [0, 2]])
+    with pytest.raises(AssertionError) as ae2:
+        A[0] = [1, 2, 3]
+    assert ae2.match("row dimension does not match")
+
+    A[1] = [5, 6]
+    assert A.get_state() == [[1, 0], [5, 6]]
+    # Rows are views of the matrix
+    A[0][1] = 7
+    assert A.get_state() == [[1, 7], [5, 6]]
+
+
+def test_np_m_transpose_conjugate_trace():
+    A = NumpyMatrix([[1j, 2j], [3j, 4j]])
+    assert A.transpose().get_state() == [[1j, 3j], [2j, 4j]]
+    assert A.conjugate().get_state() == [[-1j, -2j], [-3j, -4j]]
+    assert A.adjoint().get_state() == [[-1j, -3j], [-2j, -4j]]
+    assert A.trace() == 5j
+
+    v = NumpyMatrix([[1], [2], [3], [4]])
+    assert (v.transpose() * v).get_state() == [[30]]
+
+
+def test_np_m_unitary():
+    assert TEST_1x1.unitary
+    assert not TEST_2x2.unitary
+    factor = 1 / np.sqrt(2)
+    assert (factor * NumpyMatrix([[1, 1], [1, -1]])).unitary
+
+
+def test_np_m_add_sub():
+    with pytest.raises(AssertionError) as ae:
+        _ = TEST_1x1 + TEST_2x2
+    assert ae.match("Matrix dimensions must be equal for addition")
+
+    A = NumpyMatrix([[1, 2], [3, 4]])
+    B = SparseMatrix([[5, 6], [7, 8]])
+    assert (A + B).get_state() == [[6, 8], [10, 12]]
+    assert (A - B).get_state() == [[-4, -4], [-4, -4]]
+    # The operands are unchanged
+    assert A.get_state() == [[1, 2], [3, 4]]
+
+
+def test_np_m_mul():
+    A = NumpyMatrix([[1, 2], [3, 4]])
+    assert (A * 2).get_state() == [[2, 4], [6, 8]]
+    assert (0.5 * A).get_state() == [[0.5, 1], [1.5, 2]]
+    assert A.get_state() == [[1, 2], [3, 4]]
+
+    assert (TEST_4x4 * TEST_4x4).get_state() == \
+        [[1, 0, 0, 0], [0, 4, 0, 0], [0, 0, 9, 0], [0, 0, 0, 16]]
+
+    # Mixed with other Matrix implementations
+    B = SparseMatrix([[1], [0]])
+    assert (A * B).get_state() == [[1], [3]]
+
+    with pytest.raises(AssertionError) as ae:
+        _ = TEST_1x1 * A
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+
+def test_np_m_tensor_product():
+    A = NumpyMatrix([[1, 2], [3, 4]])
+    ID = SparseMatrix.identity(2)
+
+    C = tp.tensor_product(ID, A)
+    assert isinstance(C, NumpyMatrix)
+    assert C.get_state() == [
+        [1, 2, 0, 0],
+        [3, 4, 0, 0],
+        [0, 0, 1, 2],
+        [0, 0, 3, 4]
+    ]
+
+
+def test_np_m_str():
+    assert str(TEST_2x2) == "[  1,  0]\n[  0,  2]"
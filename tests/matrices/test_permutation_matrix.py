@@ -0,0 +1,144 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.gates as gts
+import qcp.tensor_product as tp
+from qcp.matrices import CSRMatrix, DenseMatrix, NumpyMatrix, \
+    PermutationMatrix, SparseMatrix
+
+# Cyclic shift of three basis states
+TEST_3x3 = PermutationMatrix([1, 2, 0])
+
+
+def test_perm_m_init():
+    with pytest.raises(AssertionError) as ae1:
+        PermutationMatrix([])
+    assert ae1.match("attempting to initialise matrix with no dimensions")
+
+    with pytest.raises(AssertionError) as ae2:
+        PermutationMatrix([0, 0])
+    assert ae2.match("permutation must contain each index exactly once")
+
+    with pytest.raises(AssertionError) as ae3:
+        PermutationMatrix([0, 2])
+    assert ae3.match("permutation must contain each index exactly once")
+
+    assert TEST_3x3.get_state() == [[0, 1, 0], [0, 0, 1], [1, 0, 0]]
+    assert TEST_3x3.num_rows == 3
+    assert TEST_3x3.num_columns == 3
+    assert TEST_3x3[0][1] == 1 and TEST_3x3[0][0] == 0
+    assert TEST_3x3.unitary
+
+    with pytest.raises(AssertionError) as ae4:
+        TEST_3x3[0] = [1, 0, 0]
+    assert ae4.match("cannot modify the elements of a structured matrix")
+
+
+def test_perm_m_identity():
+    i3x3 = PermutationMatrix.identity(3)
+    assert i3x3.get_state() == SparseMatrix.identity(3).get_state()
+    assert i3x3.trace() == 3
+    assert TEST_3x3.trace() == 0
+
+
+def test_perm_m_transpose():
+    T = TEST_3x3.transpose()
+    assert isinstance(T, PermutationMatrix)
+    assert T.get_state() == TEST_3x3.to_sparse().transpose().get_state()
+    assert isinstance(TEST_3x3.adjoint(), PermutationMatrix)
+    assert (TEST_3x3 * T).get_state() == [[1, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+
+def test_perm_m_compose():
+    P = PermutationMatrix([1, 0, 2])
+
+    PQ = P * TEST_3x3
+    assert isinstance(PQ, PermutationMatrix)
+    expected = P.to_sparse() * TEST_3x3.to_sparse()
+    assert PQ.get_state() == expected.get_state()
+
+    with pytest.raises(AssertionError) as ae:
+        _ = P * PermutationMatrix([1, 0])
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+
+def test_perm_m_apply():
+    assert TEST_3x3.apply([1, 2, 3]) == [2, 3, 1]
+
+    v = SparseMatrix([[1], [2], [3]])
+    Pv = TEST_3x3 * v
+    assert isinstance(Pv, SparseMatrix)
+    assert Pv.get_state() == [[2], [3], [1]]
+
+
+@pytest.mark.parametrize("backend", [SparseMatrix, CSRMatrix, NumpyMatrix,
+                                     DenseMatrix])
+def test_perm_m_mixed_products(backend):
+    A = backend([[1, 2, 3], [4, 5, 6], [7, 8, 9j]])
+    A_sp = SparseMatrix([[1, 2, 3], [4, 5, 6], [7, 8, 9j]])
+    P_sp = TEST_3x3.to_sparse()
+
+    # Permutes the rows
+    PA = TEST_3x3 * A
+    assert PA.get_state() == (P_sp * A_sp).get_state()
+    # Permutes the columns
+    AP = A * TEST_3x3
+    assert AP.get_state() == (A_sp * P_sp).get_state()
+
+    if backend is not DenseMatrix:
+        assert isinstance(PA, backend)
+        assert isinstance(AP, backend)
+
+    with pytest.raises(AssertionError) as ae:
+        _ = TEST_3x3 * backend([[1, 2], [3, 4]])
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+
+def test_perm_m_add_scalar():
+    S = TEST_3x3 + PermutationMatrix.identity(3)
+    assert S.get_state() == [[1, 1, 0], [0, 1, 1], [1, 0, 1]]
+
+    assert (2 * TEST_3x3).get_state() == [[0, 2, 0], [0, 0, 2], [2, 0, 0]]
+    # The permutation is unchanged
+    assert TEST_3x3.get_state() == [[0, 1, 0], [0, 0, 1], [1, 0, 0]]
+
+
+def test_perm_m_tensor_product():
+    P = PermutationMatrix([1, 0])
+    C = tp.tensor_product(P, TEST_3x3)
+    assert isinstance(C, PermutationMatrix)
+
+    expected = tp.tensor_product(P.to_sparse(), TEST_3x3.to_sparse())
+    assert C.get_state() == expected.get_state()
+
+    D = tp.tensor_product(SparseMatrix([[1, 2], [3, 4]]), P)
+    assert D.get_state() == [
+        [0, 1, 0, 2],
+        [1, 0, 2, 0],
+        [0, 3, 0, 4],
+        [3, 0, 4, 0]
+    ]
+
+
+def test_perm_m_gates():
+    assert isinstance(gts.control_x(3, [1], 0), PermutationMatrix)
+    assert isinstance(gts.swap(3, 0, 2), PermutationMatrix)
+
+    # Products of permutation gates stay permutations
+    cond = gts.control_x(3, [1], 0) * gts.control_x(3, [2], 0)
+    assert isinstance(cond, PermutationMatrix)
+    expected = gts.control_x(3, [1], 0).to_sparse() * \
+        gts.control_x(3, [2], 0).to_sparse()
+    assert cond.get_state() == expected.get_state()
@@ -0,0 +1,116 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.constants as c
+import qcp.gates as gts
+import qcp.matrices.product_expression as pe
+from qcp.matrices import DiagonalMatrix, IdentityMatrix, KroneckerOperator, \
+    NumpyMatrix, PermutationMatrix, ProductExpression, SparseMatrix
+import tests.test_helpers as h
+
+A = SparseMatrix([[1, 2, 0, 0], [0, 1, 0, 3], [1j, 0, 0, 0], [0, 0, 2, 1]])
+H = KroneckerOperator([c.TWO_HADAMARD, c.TWO_HADAMARD])
+P = PermutationMatrix([3, 0, 1, 2])
+D = DiagonalMatrix([1, -1, 1j, 2])
+
+
+def test_product_init():
+    with pytest.raises(AssertionError) as ae:
+        ProductExpression([])
+    assert ae.match("need at least one factor")
+
+    with pytest.raises(AssertionError) as ae:
+        ProductExpression([A, SparseMatrix([[1, 2], [3, 4]])])
+    assert ae.match("matrices don't match on their row/column dimensions")
+
+    # Nested products are flattened
+    nested = ProductExpression([ProductExpression([A, H]), P])
+    assert len(nested.factors) == 3
+
+    assert ProductExpression.of([IdentityMatrix(4), A]) is A
+    assert isinstance(ProductExpression.of([IdentityMatrix(4)]),
+                      IdentityMatrix)
+
+
+def test_product_lazy():
+    HA = H * A
+    assert isinstance(HA, ProductExpression)
+    assert HA.factors == [H, A]
+    h.compare_matrices(HA, H.to_sparse() * A)
+
+    AH = A * H
+    assert isinstance(AH, ProductExpression)
+    h.compare_matrices(AH, A * H.to_sparse())
+
+    chain = P * (H * D)
+    assert isinstance(chain, ProductExpression)
+    assert len(chain.factors) == 3
+    h.compare_matrices(chain, P.to_sparse() * H.to_sparse() * D.to_sparse())
+
+    # Factor by factor products of tensor products stay as tensor products
+    assert isinstance(H * H, KroneckerOperator)
+
+
+@pytest.mark.parametrize("backend", [SparseMatrix, NumpyMatrix])
+def test_product_vector(backend):
+    chain = H * backend(A.get_state()) * P * H * D
+    v = backend([[1], [2j], [0], [1]])
+
+    result = chain * v
+    assert isinstance(result, backend)
+    expected = H.to_sparse() * A * P.to_sparse() * H.to_sparse() * \
+        D.to_sparse() * SparseMatrix([[1], [2j], [0], [1]])
+    h.compare_matrices(result, expected)
+
+    assert chain.apply([1, 2j, 0, 1]) == \
+        pytest.approx([row[0] for row in expected.get_state()])
+
+
+def test_product_scalar_transpose():
+    chain = H * A * D
+
+    h.compare_matrices(2 * chain, 2 * chain.to_sparse())
+    h.compare_matrices(chain.transpose(), chain.to_sparse().transpose())
+    h.compare_matrices(chain.adjoint(), chain.to_sparse().adjoint())
+    assert chain.trace() == pytest.approx(chain.to_sparse().trace())
+
+
+def test_evaluate_chain():
+    assert pe.estimate_nnz(A) == 7
+    assert pe.estimate_nnz(H) == 16
+    assert pe.estimate_nnz(P) == 4
+    assert pe.estimate_nnz(NumpyMatrix([[1, 0], [0, 0]])) == 1
+
+    v = SparseMatrix([[1], [0], [2], [0]])
+    h.compare_matrices(pe.evaluate_chain([A, H, A, v]), A * (H * (A * v)))
+
+    # Long chains are multiplied from right to left
+    long_chain = [P] * (pe.MAX_OPTIMISED_CHAIN + 1) + [v]
+    expected = v
+    for _ in range(pe.MAX_OPTIMISED_CHAIN + 1):
+        expected = P * expected
+    h.compare_matrices(pe.evaluate_chain(long_chain), expected)
+
+
+def test_product_grovers_gates():
+    n = 3
+    h_gate = gts.multi_gate(n, [i for i in range(n)], gts.Gate.H)
+    z = gts.control_z(n, [0, 1], 2)
+    circuit = h_gate * z * h_gate * z
+
+    assert isinstance(circuit, ProductExpression)
+    expected = h_gate.to_sparse() * z.to_sparse() * h_gate.to_sparse() * \
+        z.to_sparse()
+    h.compare_matrices(circuit, expected)
@@ -0,0 +1,79 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+import qcp.algorithms.phase_estimation as pe
+import qcp.tensor_product as tp
+from qcp.matrices import IdentityMatrix, NumpyMatrix, QFTOperator, \
+    SparseMatrix
+from qcp.matrices.qft_operator import fourier_transform
+from qcp.state_vector import StateVector
+import tests.test_helpers as h
+
+
+def column(v):
+    return [[x] for x in v]
+
+
+def test_fourier_transform():
+    with pytest.raises(AssertionError) as ae:
+        fourier_transform([1, 2, 3], 1)
+    assert ae.match("vector length must be a multiple of the transform length")
+
+    v = [1, 0, 0, 0]
+    fourier_transform(v, 2)
+    assert v == pytest.approx([0.5, 0.5, 0.5, 0.5])
+
+    fourier_transform(v, 2, inverse=True)
+    assert v == pytest.approx([1, 0, 0, 0])
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4])
+def test_qft_matches_gates(size):
+    for inverse, gate in [(False, pe.qft_gate), (True, pe.inverse_qft_gate)]:
+        Q = QFTOperator(size, inverse)
+        reference = gate(size)
+        h.compare_matrices(Q, reference, abs_e=1E-9)
+
+        v = [i + 1j * (i % 3) for i in range(2 ** size)]
+        expected = reference * SparseMatrix(column(v))
+        assert Q.apply(v) == \
+            pytest.approx([row[0] for row in expected.get_state()])
+
+        for backend in [SparseMatrix, NumpyMatrix]:
+            h.compare_matrices(Q * backend(column(v)), expected, abs_e=1E-9)
+
+
+def test_qft_sub_register():
+    # The QFT of the lowest qubits of a larger register
+    Q = tp.tensor_product(IdentityMatrix(4), QFTOperator(2, inverse=True))
+    assert isinstance(Q, QFTOperator)
+    assert Q.num_rows == 16
+
+    reference = tp.tensor_product(SparseMatrix.identity(4),
+                                  pe.inverse_qft_gate(2))
+    h.compare_matrices(Q, reference, abs_e=1E-9)
+
+    v = [i % 5 for i in range(16)]
+    sv = StateVector(list(v))
+    sv.qft(2, inverse=True)
+    expected = reference * SparseMatrix(column(v))
+    h.compare_matrices(sv.to_matrix(), expected, abs_e=1E-9)
+
+
+def test_qft_adjoint():
+    Q = QFTOperator(3)
+    assert Q.transpose() is Q
+    assert Q.adjoint().inverse
+    h.compare_matrices(Q.adjoint(), pe.inverse_qft_gate(3), abs_e=1E-9)
@@ -250,6 +250,39 @@ def test_sp_m_sub():
     assert (A1x4 - B1x4).get_state() == C1x4.get_state()
 
 
+def test_sp_m_add_sub_non_mutating():
+    A = SparseMatrix([[1, 2], [3, 4]])
+    B = SparseMatrix([[5, 6], [7, 8]])
+
+    A + B
+    A - B
+    assert A.get_state() == [[1, 2], [3, 4]]
+    assert B.get_state() == [[5, 6], [7, 8]]
+
+    # cancelled entries are no longer tracked
+    C = SparseMatrix([[1, 0], [0, 2]])
+    assert (C - C)._entries == {0: {}, 1: {}}
+
+
+def test_sp_m_axpy():
+    with pytest.raises(AssertionError) as ae:
+        SparseMatrix([[1]]).axpy(SparseMatrix([[1, 2], [3, 4]]), 2)
+    assert ae.match("Matrix dimensions must be equal for addition")
+
+    A = SparseMatrix([[1, 0], [0, 1]])
+    B = SparseMatrix([[0, 1], [1, 0]])
+
+    C = A.axpy(B, 2j)
+    assert C is A
+    assert A.get_state() == [[1, 2j], [2j, 1]]
+    assert B.get_state() == [[0, 1], [1, 0]]
+
+    A += B
+    assert A.get_state() == [[1, 1 + 2j], [1 + 2j, 1]]
+    A -= B
+    assert A.get_state() == [[1, 2j], [2j, 1]]
+
+
 def test_sp_m_mul_scalar():
     # Testing with ints:
     A1x1_1 = SparseMatrix([[1]])
@@ -356,6 +389,20 @@ def test_sp_m_mul_dot_product_sparse():
     C4x4 = SparseMatrix({0: {0: 1}, 1: {1: 4}, 2: {2: 9}, 3: {3: 16}})
     assert (TEST_4x4 * TEST_4x4).get_state() == C4x4.get_state()
 
+    # Non-square matrices
+    A2x3 = SparseMatrix([[1, 0, 2], [0, 3, 0]])
+    B3x4 = SparseMatrix([[0, 1, 0, 0], [0, 0, 0, 2], [3, 0, 0, 0]])
+    C2x4 = SparseMatrix([[6, 1, 0, 0], [0, 0, 0, 6]])
+
+    assert (A2x3 * B3x4).get_state() == C2x4.get_state()
+
+    # Entries that cancel out aren't stored
+    A2x2 = SparseMatrix([[1, 1], [1, -1]])
+    B2x2 = SparseMatrix([[1, 0], [1, 0]])
+    C2x2 = A2x2 * B2x2
+    assert C2x2.get_state() == [[2, 0], [0, 0]]
+    assert C2x2._entries == {0: {0: 2}, 1: {}}
+
 
 def test_sp_m_column_mul():
 
@@ -0,0 +1,160 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+
+import pytest
+
+import qcp.gates as gts
+import qcp.tensor_product as tp
+import tests.test_helpers as h
+from qcp.algorithms.phase_estimation import inverse_qft_gate
+from qcp.circuit import Circuit, Instruction
+from qcp.matrices import DefaultMatrix, DiagonalMatrix, IdentityMatrix
+from qcp.state_vector import StateVector
+
+
+def example_circuit() -> Circuit:
+    circuit = Circuit(3)
+    circuit.multi_gate([0, 2], gts.Gate.H)
+    circuit.control_x([0], 1)
+    circuit.multi_gate([1], gts.Gate.P, math.pi / 3)
+    circuit.control_z([0, 1], 2, [0, 1])
+    circuit.control_phase([2], 0, math.pi / 5, [0])
+    circuit.swap(0, 2)
+    circuit.control_u(0, DefaultMatrix([[0, 1], [1, 0]]), 0)
+    circuit.qft(2)
+    circuit.phase_flip([3, 6])
+    circuit.invert_about_mean()
+    circuit.unitary(DiagonalMatrix([1, 1j, -1, 1, 1, -1j, 1, 1]))
+    circuit.qft(3, inverse=True)
+    circuit.single_qubit_gate([0, 1], DefaultMatrix([[0, 1j], [1j, 0]]))
+    circuit.diagonal(DiagonalMatrix([1, -1, 1, 1j, 1, 1, -1j, 1]))
+    circuit.controlled_unitary(2, 0, DefaultMatrix([[1, 1j, 0, 0],
+                                                    [1j, 1, 0, 0],
+                                                    [0, 0, 1, -1j],
+                                                    [0, 0, -1j, 1]]), 0)
+    return circuit
+
+
+def test_instructions():
+    circuit = example_circuit()
+    assert len(circuit) == 15
+
+    instructions = list(circuit)
+    assert instructions[0] == Instruction("h", [0, 2])
+    assert instructions[1] == Instruction("cx", [1], [0])
+    assert instructions[2] == Instruction("p", [1], params=[math.pi / 3])
+    # The swap stores the little endian qubits it acts on
+    assert instructions[5] == Instruction("swap", [2, 0])
+    assert instructions[6].name == "cu"
+    assert instructions[6].targets == [2]
+    # control_u indexes the control down from the qubit below the unitary
+    assert instructions[6].controls == [1]
+    assert instructions[3].control_values == [0, 1]
+    assert instructions[6].control_values == [0]
+
+    with pytest.raises(AssertionError) as ae0:
+        Instruction("cz", [2], [0, 1], control_values=[1])
+    assert ae0.match("need a control value for each control bit")
+    assert instructions[8] == Instruction("phase_flip", [0, 1, 2],
+                                          params=[3, 6])
+    assert instructions[11] == Instruction("iqft", [0, 1, 2])
+    assert instructions[12].name == "u"
+    assert instructions[13].name == "diagonal"
+    assert instructions[14].targets == [0, 1]
+    assert instructions[14].controls == [2]
+
+    with pytest.raises(AssertionError) as ae1:
+        Instruction("y", [0])
+    assert ae1.match("unknown gate name")
+
+    with pytest.raises(AssertionError) as ae2:
+        circuit.control_x([3], 0)
+    assert ae2.match("qubit out of range")
+
+    with pytest.raises(AssertionError) as ae3:
+        circuit.extend(Circuit(2))
+    assert ae3.match("circuits must act on the same number of qubits")
+
+    with pytest.raises(AssertionError) as ae4:
+        circuit.unitary(DiagonalMatrix([1, -1]))
+    assert ae4.match("gate must act on the whole register")
+
+
+def test_cost():
+    circuit = Circuit(3)
+    circuit.multi_gate([0, 1], gts.Gate.H)
+    circuit.multi_gate([2], gts.Gate.I)
+    circuit.control_x([0], 2)
+    circuit.phase_flip([1, 5])
+    circuit.qft(2)
+    circuit.control_u(0, DefaultMatrix([[0, 1], [1, 0]]))
+    assert [ins.cost(3) for ins in circuit] == [16, 0, 8, 2, 24, 8]
+    assert circuit.cost() == 58
+
+
+def test_matrix_cache():
+    circuit = Circuit(3)
+    circuit.phase_flip([1, 6])
+    circuit.invert_about_mean()
+    phase_flip, invert = list(circuit)
+
+    # The matrices are only constructed once for each register size
+    assert phase_flip.to_matrix(3) is phase_flip.to_matrix(3)
+    assert invert.to_matrix(3) is invert.to_matrix(3)
+    assert invert.to_matrix(2).num_rows == 4
+
+    state = DefaultMatrix([[1], [0], [0], [0], [0], [0], [0], [0]])
+    h.compare_matrices(circuit.run(circuit.run(state)),
+                       circuit.to_matrix() * (circuit.to_matrix() * state),
+                       abs_e=1E-9)
+
+
+def test_to_matrix():
+    circuit = Circuit(2)
+    circuit.multi_gate([0], gts.Gate.H)
+    circuit.control_x([0], 1)
+    circuit.swap(0, 1)
+
+    expected = gts.swap(2, 0, 1) * gts.control_x(2, [0], 1) * \
+        gts.multi_gate(2, [0], gts.Gate.H)
+    h.compare_matrices(circuit.to_matrix(), expected)
+
+    # The empty circuit is the identity
+    h.compare_matrices(Circuit(2).to_matrix(),
+                       gts.multi_gate(2, [], gts.Gate.I))
+
+    # The QFT instruction acts on the lowest qubits
+    qft = Circuit(3)
+    qft.qft(2, inverse=True)
+    expected = tp.tensor_product(IdentityMatrix(2), inverse_qft_gate(2))
+    h.compare_matrices(qft.to_matrix(), expected, abs_e=1E-9)
+
+
+@pytest.mark.parametrize("state_vector", [False, True])
+def test_run(state_vector):
+    circuit = example_circuit()
+    amplitudes = [1, 2j, 0, -1, 0.5, 0, 3, 1]
+    norm = math.sqrt(sum(abs(a) ** 2 for a in amplitudes))
+    state = DefaultMatrix([[a / norm] for a in amplitudes])
+
+    expected = circuit.to_matrix() * state
+    if state_vector:
+        sv = StateVector.from_matrix(state)
+        circuit.apply(sv)
+        result = sv.to_matrix()
+    else:
+        result = circuit.run(state)
+
+    h.compare_matrices(result, expected, abs_e=1E-9)
@@ -71,6 +71,19 @@ def test_multi_gate():
     h.compare_matrices(applied_state, expected_qbit_state)
 
 
+def test_single_qubit_gate():
+    gate = DefaultMatrix([[0, 1j], [1, 0]])
+    h.compare_matrices(gts.single_qubit_gate(1, [0], gate), gate)
+
+    # Equivalent to the multi_gate of the named gates
+    h.compare_matrices(gts.single_qubit_gate(3, [0, 2], const.PAULI_X),
+                       gts.multi_gate(3, [0, 2], gts.Gate.X))
+
+    with pytest.raises(AssertionError) as ae:
+        gts.single_qubit_gate(2, [0], DefaultMatrix.identity(4))
+    assert ae.match("can only apply single qubit gates")
+
+
 def test_control_x():
     # Gate needs a minimum of two qubits to make sense
     with pytest.raises(AssertionError) as ae1:
@@ -388,6 +401,51 @@ def test_swap():
 
     assert transform_3qbits.get_state() == expected_3qbits.get_state()
 
+    # Each state is mapped to the state with the two target digits of its
+    # binary representation exchanged
+    size = 4
+    for t0 in range(size):
+        for t1 in range(size):
+            if t0 == t1:
+                continue
+            gate = gts.swap(size, t0, t1)
+            for i in range(2 ** size):
+                digits = list(bin(i)[2:].zfill(size))
+                digits[t0], digits[t1] = digits[t1], digits[t0]
+                j = int("".join(digits), 2)
+                assert gate[j][i] == 1
+
+
+def test_control_values():
+    assert gts.control_mask([0, 2, 4]) == (0b10101, 0b10101)
+    assert gts.control_mask([0, 2, 4], [1, 0, 1]) == (0b10101, 0b10001)
+
+    with pytest.raises(AssertionError) as ae1:
+        gts.control_mask([0, 2], [1])
+    assert ae1.match("need a control value for each control bit")
+
+    with pytest.raises(AssertionError) as ae2:
+        gts.control_mask([0], [2])
+    assert ae2.match("control values must be 0 or 1")
+
+    # Controlling on 0 is the same as flipping the control bit either side
+    # of the gate
+    x0 = gts.multi_gate(3, [0], gts.Gate.X)
+    h.compare_matrices(gts.control_x(3, [0, 1], 2, [0, 1]),
+                       x0 * gts.control_x(3, [0, 1], 2) * x0)
+    h.compare_matrices(gts.control_z(3, [0], 1, [0]),
+                       x0 * gts.control_z(3, [0], 1) * x0)
+    h.compare_matrices(gts.control_phase(3, [0, 2], 1, math.pi / 3, [0, 1]),
+                       x0 * gts.control_phase(3, [0, 2], 1, math.pi / 3) * x0,
+                       abs_e=1E-9)
+
+    U = DefaultMatrix([[0, 1j], [1j, 0]])
+    # control_u indexes the control from the most significant qubit below
+    # the unitary
+    x1 = gts.multi_gate(3, [1], gts.Gate.X)
+    h.compare_matrices(gts.control_u(3, 0, U, 0),
+                       x1 * gts.control_u(3, 0, U) * x1)
+
 
 def test_control_u():
     # Gate needs a minimum of two qubits to make sense
@@ -442,3 +500,24 @@ def test_control_u():
     ])
 
     assert cu_8x8.get_state() == expected_8x8.get_state()
+
+
+def test_controlled_unitary():
+    U = DefaultMatrix([[2, 3], [4, 5]])
+    with pytest.raises(AssertionError) as ae:
+        gts.controlled_unitary(1, 0, 0, U)
+    assert ae.match("need minimum of two qubits")
+
+    # The unitary on qubit 0, controlled by qubit 2 being 0
+    cu = gts.controlled_unitary(3, 2, 0, U, 0)
+    expected = DefaultMatrix([
+        [2, 3, 0, 0, 0, 0, 0, 0],
+        [4, 5, 0, 0, 0, 0, 0, 0],
+        [0, 0, 2, 3, 0, 0, 0, 0],
+        [0, 0, 4, 5, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0, 1, 0],
+        [0, 0, 0, 0, 0, 0, 0, 1]
+    ])
+    assert cu.get_state() == expected.get_state()
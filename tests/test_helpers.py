@@ -15,11 +15,11 @@ from qcp.matrices import Matrix
 import cmath
 
 
-def compare_matrices(A: Matrix, B: Matrix, e=1E-9):
+def compare_matrices(A: Matrix, B: Matrix, e=1E-9, abs_e=0.0):
     assert A.num_rows == B.num_rows
     assert A.num_columns == B.num_columns
 
     for i in range(A.num_rows):
         for j in range(A.num_columns):
 
-            assert cmath.isclose(A[i][j], B[i][j], rel_tol=e)
+            assert cmath.isclose(A[i][j], B[i][j], rel_tol=e, abs_tol=abs_e)
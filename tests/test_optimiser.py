@@ -0,0 +1,154 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+
+import pytest
+
+import qcp.gates as gts
+import qcp.optimiser as op
+import tests.test_helpers as h
+from qcp.algorithms import Grovers, PhaseEstimation, Sudoku
+from qcp.circuit import Circuit
+from qcp.matrices import DefaultMatrix
+
+
+def test_cancel_inverses():
+    circuit = Circuit(3)
+    circuit.multi_gate([0], gts.Gate.X)
+    circuit.multi_gate([1], gts.Gate.H)
+    circuit.control_x([1], 2)
+    # Doesn't share a qubit with the gates before it
+    circuit.multi_gate([0], gts.Gate.I)
+    circuit.control_x([1], 2)
+    circuit.multi_gate([1], gts.Gate.H)
+    circuit.multi_gate([0], gts.Gate.X)
+    assert len(op.cancel_inverses(circuit)) == 0
+
+    # Gates in between on the same qubits stop the cancellation
+    circuit = Circuit(2)
+    circuit.multi_gate([0], gts.Gate.H)
+    circuit.control_z([0], 1)
+    circuit.multi_gate([0], gts.Gate.H)
+    circuit.multi_gate([1], gts.Gate.P, math.pi)
+    circuit.multi_gate([1], gts.Gate.P, math.pi)
+    optimised = op.cancel_inverses(circuit)
+    assert [ins.name for ins in optimised] == ["h", "cz", "h", "p", "p"]
+
+    # swap() indexes from the most significant qubit, so swap(0, 1) acts on
+    # qubits 1 and 2, and the X gates on either side of it don't cancel
+    circuit = Circuit(3)
+    circuit.multi_gate([2], gts.Gate.X)
+    circuit.swap(0, 1)
+    circuit.multi_gate([2], gts.Gate.X)
+    optimised, _ = op.optimise(circuit)
+    assert len(optimised) == 3
+    h.compare_matrices(optimised.to_matrix(), circuit.to_matrix())
+
+    circuit = Circuit(3)
+    circuit.multi_gate([2], gts.Gate.Z)
+    circuit.swap(0, 1)
+    circuit.multi_gate([2], gts.Gate.H)
+    optimised, _ = op.optimise(circuit)
+    h.compare_matrices(optimised.to_matrix(), circuit.to_matrix(),
+                       abs_e=1E-9)
+
+    # Gates with different control values don't cancel
+    circuit = Circuit(2)
+    circuit.control_x([0], 1, [0])
+    circuit.control_x([0], 1)
+    assert len(op.cancel_inverses(circuit)) == 2
+
+
+def test_fuse_single_qubit_gates():
+    circuit = Circuit(2)
+    circuit.multi_gate([0, 1], gts.Gate.H)
+    circuit.multi_gate([1, 0], gts.Gate.X)
+    circuit.multi_gate([0], gts.Gate.Z)
+    circuit.multi_gate([1], gts.Gate.P, math.pi / 4)
+    circuit.multi_gate([1], gts.Gate.P, -math.pi / 4)
+
+    optimised = op.fuse_single_qubit_gates(circuit)
+    assert [ins.name for ins in optimised] == ["u", "z"]
+    h.compare_matrices(optimised.to_matrix(), circuit.to_matrix(),
+                       abs_e=1E-9)
+
+
+def test_merge_diagonal_gates():
+    circuit = Circuit(3)
+    circuit.multi_gate([0], gts.Gate.Z)
+    circuit.control_phase([0], 1, math.pi / 3)
+    circuit.control_z([1], 2, [0])
+    circuit.multi_gate([2], gts.Gate.H)
+    # A single phase flip is cheaper than a full diagonal
+    circuit.phase_flip([1])
+    circuit.phase_flip([2])
+
+    optimised = op.merge_diagonal_gates(circuit)
+    assert [ins.name for ins in optimised] == \
+        ["diagonal", "h", "phase_flip", "phase_flip"]
+    h.compare_matrices(optimised.to_matrix(), circuit.to_matrix(),
+                       abs_e=1E-9)
+
+
+def test_optimise():
+    sudoku = Sudoku()
+    optimised, report = op.optimise(sudoku.circuit)
+
+    assert report.gates_before == len(sudoku.circuit)
+    assert report.gates_after == len(optimised)
+    # The H and Z on the output qubit of each oracle are fused
+    assert report.gates_saved == 2
+    assert report.cost_after == optimised.cost()
+    assert 0 < report.cost_saved < 1
+    assert str(report).startswith("gates: 49 -> 47 (2 saved)")
+
+    state = sudoku.initial_state()
+    h.compare_matrices(optimised.run(state), sudoku.circuit.run(state),
+                       abs_e=1E-9)
+
+    unitary = DefaultMatrix([[1, 0], [0, 1j]])
+    est = PhaseEstimation(4, unitary, DefaultMatrix([[0], [1]]),
+                          approximation_degree=2)
+    optimised, report = op.optimise(est.circuit)
+    assert report.gates_saved > 0
+    h.compare_matrices(optimised.to_matrix(), est.circuit.to_matrix(),
+                       abs_e=1E-9)
+
+    # Nothing to optimise
+    _, report = op.optimise(Circuit(2))
+    assert report.gates_saved == 0 and report.cost_saved == 0
+
+
+@pytest.mark.parametrize("degree,saved", [(1, 0), (2, 2), (3, 3)])
+def test_optimise_approximate_qft(degree, saved):
+    # The controlled phases of the approximate inverse QFT on the same
+    # qubits are merged into diagonal gates
+    unitary = DefaultMatrix([[1, 0], [0, 1j]])
+    est = PhaseEstimation(4, unitary, DefaultMatrix([[0], [1]]),
+                          approximation_degree=degree)
+    optimised, report = op.optimise(est.circuit)
+
+    assert report.gates_saved == saved
+    assert (report.cost_saved > 0) == (saved > 0)
+    assert any(ins.name == "diagonal" for ins in optimised) == (saved > 0)
+    h.compare_matrices(optimised.to_matrix(), est.circuit.to_matrix(),
+                       abs_e=1E-9)
+
+
+def test_optimise_grovers():
+    # The Grovers circuit is already a single gate per oracle and diffusion
+    grov = Grovers(4, [3, 12])
+    optimised, report = op.optimise(grov.circuit)
+    assert report.gates_saved == 0 and report.cost_saved == 0
+    assert optimised.instructions == grov.circuit.instructions
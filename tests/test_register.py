@@ -15,6 +15,7 @@ import pytest
 from qcp.matrices import DefaultMatrix
 import qcp.register as reg
 import math
+import random
 
 
 def test_measure():
@@ -42,3 +43,68 @@ def test_measure():
     C = DefaultMatrix([[1], [1]])
     prob2 = reg.measure(C)
     assert math.isclose(prob2[0], 0.5)
+
+
+def test_marginal_probabilities():
+    # |q2 q1 q0> amplitudes, with probabilities 0..7 / 28
+    B = DefaultMatrix([[math.sqrt(i / 28)] for i in range(8)])
+
+    with pytest.raises(AssertionError) as ae1:
+        _ = reg.marginal_probabilities(B, [0, 3])
+    assert ae1.match("qubit out of range")
+
+    with pytest.raises(AssertionError) as ae2:
+        _ = reg.marginal_probabilities(B, [1, 1])
+    assert ae2.match("qubits must be distinct")
+
+    # The lowest qubit
+    prob = reg.marginal_probabilities(B, [0])
+    assert prob == pytest.approx([12 / 28, 16 / 28])
+
+    # The lowest two qubits
+    prob = reg.marginal_probabilities(B, [0, 1])
+    assert prob == pytest.approx([4 / 28, 6 / 28, 8 / 28, 10 / 28])
+
+    # A subset out of order, where bit 0 of the index is qubit 2
+    prob = reg.marginal_probabilities(B, [2, 0])
+    assert prob == pytest.approx([2 / 28, 10 / 28, 4 / 28, 12 / 28])
+
+    # All the qubits in order are the full probabilities
+    assert reg.marginal_probabilities(B, [0, 1, 2]) == \
+        pytest.approx(reg.measure(B))
+
+
+def test_alias_table():
+    # The sampler only defines the interface
+    with pytest.raises(TypeError):
+        reg.Sampler()  # type: ignore[abstract]
+
+    with pytest.raises(AssertionError) as ae:
+        reg.AliasTable([0, 0])
+    assert ae.match("total probability must be positive")
+
+    # Probabilities are normalised
+    table = reg.AliasTable([1, 0, 3, 0])
+    assert len(table) == 4
+    assert table[2] == 0.75
+
+    # The probabilities read like a list
+    assert table[-2] == 0.75
+    assert table[1:3] == [0, 0.75]
+    assert list(table) == [0.25, 0, 0.75, 0]
+    with pytest.raises(IndexError):
+        _ = table[4]
+
+    rng = random.Random(1234)
+    counts = table.sample_counts(20000, rng)
+    assert set(counts.keys()) == {0, 2}
+    assert counts[0] + counts[2] == 20000
+    assert abs(counts[2] / 20000 - 0.75) < 0.02
+
+    # The same seed gives the same samples
+    assert table.sample_counts(100, random.Random(1)) == \
+        table.sample_counts(100, random.Random(1))
+
+    with pytest.raises(AssertionError) as ae2:
+        table.sample_counts(0)
+    assert ae2.match("number of shots must be positive")
@@ -0,0 +1,219 @@
+# Copyright 2022 Tiernan8r
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+
+import pytest
+
+import qcp.constants as const
+import qcp.gates as gts
+import tests.test_helpers as h
+from qcp.matrices import DefaultMatrix
+from qcp.state_vector import StateVector
+
+
+def three_qbits() -> DefaultMatrix:
+    return DefaultMatrix([
+        [1],  # |000>
+        [2],  # |001>
+        [3],  # |010>
+        [4],  # |011>
+        [5],  # |100>
+        [6],  # |101>
+        [7],  # |110>
+        [8]  # |111>
+    ])
+
+
+def test_init():
+    with pytest.raises(AssertionError) as ae:
+        _ = StateVector([1, 0, 0])
+    assert ae.match("number of amplitudes must be a power of two")
+
+    sv = StateVector([1, 0, 0, 0])
+    assert sv.size == 2
+    assert len(sv) == 4
+
+
+def test_to_from_matrix():
+    with pytest.raises(AssertionError) as ae:
+        _ = StateVector.from_matrix(DefaultMatrix([[1, 2], [3, 4]]))
+    assert ae.match("can only create a state vector from column matrices")
+
+    vec = three_qbits()
+    sv = StateVector.from_matrix(vec)
+    assert sv.amplitudes == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert sv.to_matrix().get_state() == vec.get_state()
+
+
+def test_multi_gate():
+    for gate in [gts.Gate.H, gts.Gate.X, gts.Gate.Z, gts.Gate.P]:
+        for targets in [[0], [1, 2], [0, 1, 2]]:
+            sv = StateVector.from_matrix(three_qbits())
+            sv.multi_gate(targets, gate, math.pi / 3)
+
+            expected = gts.multi_gate(3, targets, gate, math.pi / 3) * \
+                three_qbits()
+            h.compare_matrices(sv.to_matrix(), expected, abs_e=1E-9)
+
+
+def test_apply_gate():
+    sv = StateVector.from_matrix(three_qbits())
+    sv.apply_gate(1, const.PAULI_X)
+    assert sv.amplitudes == [3, 4, 1, 2, 7, 8, 5, 6]
+
+    with pytest.raises(AssertionError) as ae:
+        sv.apply_gate(0, DefaultMatrix.identity(4))
+    assert ae.match("can only apply single qubit gates")
+
+
+def test_control_x():
+    sv = StateVector([1, 0])
+    with pytest.raises(AssertionError) as ae1:
+        sv.control_x([], 0)
+    assert ae1.match("need minimum of two qubits")
+
+    sv = StateVector.from_matrix(three_qbits())
+    with pytest.raises(AssertionError) as ae2:
+        sv.control_x([0], 0)
+    assert ae2.match("control bits and target bit cannot be the same")
+
+    sv.control_x([1, 2], 0)
+    assert sv.amplitudes == [1, 2, 3, 4, 5, 6, 8, 7]
+
+    for controls, target in [([0], 1), ([2], 1), ([0, 1], 2)]:
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_x(controls, target)
+        expected = gts.control_x(3, controls, target) * three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+
+def test_control_z_phase():
+    for controls, target in [([0], 1), ([2], 0), ([0, 1], 2)]:
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_z(controls, target)
+        expected = gts.control_z(3, controls, target) * three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_phase(controls, target, math.pi / 4)
+        expected = gts.control_phase(3, controls, target, math.pi / 4) * \
+            three_qbits()
+        h.compare_matrices(sv.to_matrix(), expected, abs_e=1E-9)
+
+
+def test_control_values():
+    for controls, values, target in [([0], [0], 1), ([2, 0], [1, 0], 1),
+                                     ([0, 1], [0, 0], 2)]:
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_x(controls, target, values)
+        expected = gts.control_x(3, controls, target, values) * \
+            three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_z(controls, target, values)
+        expected = gts.control_z(3, controls, target, values) * \
+            three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_phase(controls, target, math.pi / 4, values)
+        expected = gts.control_phase(3, controls, target, math.pi / 4,
+                                     values) * three_qbits()
+        h.compare_matrices(sv.to_matrix(), expected, abs_e=1E-9)
+
+    U = DefaultMatrix([[2, 3], [4, 5]])
+    for control in [0, 1]:
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_u(control, U, 0)
+        expected = gts.control_u(3, control, U, 0) * three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+
+def test_swap():
+    sv = StateVector.from_matrix(three_qbits())
+    with pytest.raises(AssertionError) as ae:
+        sv.swap(1, 1)
+    assert ae.match("swap targets must be different")
+
+    for t0, t1 in [(0, 1), (1, 0), (0, 2), (1, 2)]:
+        sv = StateVector.from_matrix(three_qbits())
+        sv.swap(t0, t1)
+        expected = gts.swap(3, t0, t1) * three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+
+def test_control_u():
+    U = DefaultMatrix([
+        [2, 3],
+        [4, 5]
+    ])
+    sv = StateVector([1, 0, 0, 0])
+    with pytest.raises(AssertionError) as ae:
+        sv.control_u(0, U)
+    assert ae.match("unitary matrix too big")
+
+    for control in [0, 1]:
+        sv = StateVector.from_matrix(three_qbits())
+        sv.control_u(control, U)
+        expected = gts.control_u(3, control, U) * three_qbits()
+        assert sv.to_matrix().get_state() == expected.get_state()
+
+
+def test_controlled_unitary():
+    U = DefaultMatrix([[2, 3], [4, 5]])
+    for control, target in [(0, 1), (0, 2), (2, 0), (1, 2)]:
+        for value in [0, 1]:
+            sv = StateVector.from_matrix(three_qbits())
+            sv.controlled_unitary(control, target, U, value)
+            expected = gts.controlled_unitary(3, control, target, U, value) \
+                * three_qbits()
+            assert sv.to_matrix().get_state() == expected.get_state()
+
+
+def test_grovers_kernels():
+    sv = StateVector.from_matrix(three_qbits())
+    with pytest.raises(AssertionError) as ae:
+        sv.phase_flip(8)
+    assert ae.match("index out of range")
+
+    sv.phase_flip(2)
+    assert sv.amplitudes == [1, 2, -3, 4, 5, 6, 7, 8]
+
+    # Inversion about the mean is the same as the Grover's diffusion gate
+    h_gate = gts.multi_gate(3, [0, 1, 2], gts.Gate.H)
+    x_gate = gts.multi_gate(3, [0, 1, 2], gts.Gate.X)
+    cz = gts.control_z(3, [0, 1], 2)
+    diffusion = h_gate * x_gate * cz * x_gate * h_gate
+
+    sv = StateVector.from_matrix(three_qbits())
+    sv.invert_about_mean()
+    h.compare_matrices(sv.to_matrix(), diffusion * three_qbits(),
+                       abs_e=1E-9)
+
+
+def test_apply_diagonal():
+    sv = StateVector.from_matrix(three_qbits())
+    sv.apply_diagonal([1, -1, 1j, 1, 0, 2, 1, 1])
+    assert sv.amplitudes == [1, -2, 3j, 4, 0, 12, 7, 8]
+
+    with pytest.raises(AssertionError) as ae:
+        sv.apply_diagonal([1, -1])
+    assert ae.match("diagonal must have an entry for each amplitude")
+
+
+def test_marginal_probabilities():
+    sv = StateVector.from_matrix(three_qbits())
+    assert sv.marginal_probabilities([1, 2]) == \
+        pytest.approx([1 + 4, 9 + 16, 25 + 36, 49 + 64])